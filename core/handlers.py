@@ -6,6 +6,9 @@ from bpy.app.handlers import persistent
 from sverchok import old_nodes
 from sverchok import data_structure
 from sverchok.core import upgrade_nodes, upgrade_group
+from sverchok.core.socket_data import clear_socket_cache, forget_freed_trees
+from sverchok.utils.sv_spatial_index import clear_index_cache
+from sverchok.utils.sv_viewer_utils import clear_viewer_data
 
 from sverchok.ui import (
     viewer_draw,
@@ -70,6 +73,7 @@ def sv_main_handler(scene):
     """
     Main Sverchok handler for updating node tree upon editor changes
     """
+    forget_freed_trees(bpy.data.node_groups)
     for ng in sverchok_trees():
         # print("Scene handler looking at tree {}".format(ng.name))
         if ng.has_changed:
@@ -92,6 +96,22 @@ def sv_clean(scene):
 
     data_structure.sv_Vars = {}
     data_structure.temp_handle = {}
+    clear_socket_cache()
+    clear_index_cache()
+    clear_viewer_data()
+
+
+@persistent
+def sv_post_undo(scene):
+    """
+    Undo reallocates all data, so socket ids change and cached
+    socket data can't be found anymore, update all trees. Viewer objects
+    may be reverted, so viewers write them again.
+    """
+    clear_socket_cache()
+    clear_viewer_data()
+    for ng in sverchok_trees():
+        ng.has_changed = True
 
 
 @persistent
@@ -177,6 +197,8 @@ def set_frame_change(mode):
 def register():
     bpy.app.handlers.load_pre.append(sv_clean)
     bpy.app.handlers.load_post.append(sv_post_load)
+    bpy.app.handlers.undo_post.append(sv_post_undo)
+    bpy.app.handlers.redo_post.append(sv_post_undo)
     bpy.app.handlers.scene_update_pre.append(sv_main_handler)
     data_structure.setup_init()
     addon_name = data_structure.SVERCHOK_NAME
@@ -190,5 +212,7 @@ def register():
 def unregister():
     bpy.app.handlers.load_pre.remove(sv_clean)
     bpy.app.handlers.load_post.remove(sv_post_load)
+    bpy.app.handlers.undo_post.remove(sv_post_undo)
+    bpy.app.handlers.redo_post.remove(sv_post_undo)
     bpy.app.handlers.scene_update_pre.remove(sv_main_handler)
     set_frame_change(None)
@@ -0,0 +1,205 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Timing and memory records of node updates.
+
+The update system records every node processed by an update of a node
+tree: wall time, thread and, while tracing is on, estimated size of the
+data it has put into its output sockets. Runs of monad trees are not
+separate updates, their time is that of the monad node. Records
+of the last HISTORY_LENGTH updates are kept, they can be queried with
+get_node_stats / get_slowest_nodes or exported in Chrome trace format
+(chrome://tracing, https://ui.perfetto.dev) with export_chrome_trace.
+Functions decorated with @profile add their spans to the trace while
+profiling is enabled.
+"""
+
+import collections
+import json
+import threading
+import time
+
+from sverchok.core.socket_data import data_size
+from sverchok.utils.logging import info
+
+NodeRecord = collections.namedtuple("NodeRecord",
+    ["name", "bl_idname", "start", "duration", "output_bytes", "thread"])
+
+SpanRecord = collections.namedtuple("SpanRecord",
+    ["name", "section", "start", "duration", "thread"])
+
+# number of updates kept in history
+HISTORY_LENGTH = 10
+
+# output sizes need a look at every output socket, they are recorded
+# only while tracing is on (profiling is started)
+tracing = False
+
+_updates = collections.deque(maxlen=HISTORY_LENGTH)
+_spans = collections.deque(maxlen=10000)
+_lock = threading.Lock()
+
+
+class UpdateRecord:
+    """Records of one run of the update system over a list of nodes"""
+
+    def __init__(self, tree_name):
+        self.tree_name = tree_name
+        self.start = time.perf_counter()
+        self.nodes = []
+
+    @property
+    def duration(self):
+        return sum(record.duration for record in self.nodes)
+
+
+def set_history_length(length):
+    """Change how many updates are kept, older records are dropped"""
+    global _updates, HISTORY_LENGTH
+    HISTORY_LENGTH = max(1, length)
+    with _lock:
+        _updates = collections.deque(_updates, maxlen=HISTORY_LENGTH)
+
+
+def new_update(tree_name):
+    """Start records of a new update of the tree, returns UpdateRecord"""
+    update = UpdateRecord(tree_name)
+    with _lock:
+        _updates.append(update)
+    return update
+
+
+def start_update(ng):
+    """
+    Start records of a new update of node tree ng, returns UpdateRecord,
+    or None for monad trees, they are run by monad nodes of the update
+    """
+    if ng.bl_idname == 'SverchGroupTreeType':
+        return None
+    return new_update(ng.name)
+
+
+def set_tracing(enabled):
+    global tracing
+    tracing = enabled
+
+
+def output_size(node):
+    """Estimated size in bytes of data in output sockets of the node"""
+    return sum(data_size(socket.socket_id) for socket in node.outputs)
+
+
+def record_node(update, node, start, duration, thread=None):
+    """
+    Add record of processed node to the update, call it from the main thread,
+    thread is the one that computed the node, the current one by default
+    """
+    if update is None:
+        return
+    record = NodeRecord(node.name, node.bl_idname, start, duration,
+                        output_size(node) if tracing else None, thread or threading.get_ident())
+    # list.append is atomic, no lock needed
+    update.nodes.append(record)
+
+
+def record_span(name, section, start, duration):
+    """Add span of a profiled function, used by @profile decorator"""
+    _spans.append(SpanRecord(name, section, start, duration, threading.get_ident()))
+
+
+def get_updates(tree_name=None):
+    """Recorded updates, oldest first, only of the tree if tree_name is given"""
+    with _lock:
+        updates = list(_updates)
+    if tree_name is None:
+        return updates
+    return [update for update in updates if update.tree_name == tree_name]
+
+
+def get_node_stats(tree_name=None):
+    """
+    Statistics per node over recorded updates:
+    {(tree name, node name): {"bl_idname", "calls", "total_time",
+     "mean_time", "max_time", "output_bytes"}}
+    output_bytes is from the last call of the node, None if it was not traced.
+    """
+    stats = {}
+    for update in get_updates(tree_name):
+        for record in update.nodes:
+            key = (update.tree_name, record.name)
+            item = stats.get(key)
+            if item is None:
+                item = stats[key] = {"bl_idname": record.bl_idname, "calls": 0,
+                                     "total_time": 0.0, "max_time": 0.0}
+            item["calls"] += 1
+            item["total_time"] += record.duration
+            item["max_time"] = max(item["max_time"], record.duration)
+            item["output_bytes"] = record.output_bytes
+    for item in stats.values():
+        item["mean_time"] = item["total_time"] / item["calls"]
+    return stats
+
+
+def get_slowest_nodes(count=10, tree_name=None):
+    """List of ((tree name, node name), stats) with highest total time"""
+    stats = get_node_stats(tree_name)
+    return sorted(stats.items(), key=lambda item: item[1]["total_time"], reverse=True)[:count]
+
+
+def get_chrome_trace():
+    """Recorded updates and spans as Chrome trace event dict"""
+    events = []
+    pids = {}
+
+    def us(seconds):
+        return round(seconds * 1e6, 3)
+
+    for update in get_updates():
+        pid = pids.setdefault(update.tree_name, len(pids) + 1)
+        for record in update.nodes:
+            event = {"name": record.name, "cat": record.bl_idname, "ph": "X",
+                     "ts": us(record.start), "dur": us(record.duration),
+                     "pid": pid, "tid": record.thread}
+            if record.output_bytes is not None:
+                event["args"] = {"output_bytes": record.output_bytes}
+            events.append(event)
+    for span in list(_spans):
+        events.append({"name": span.name, "cat": span.section, "ph": "X",
+                       "ts": us(span.start), "dur": us(span.duration),
+                       "pid": 0, "tid": span.thread})
+    for tree_name, pid in pids.items():
+        events.append({"name": "process_name", "ph": "M", "pid": pid,
+                       "args": {"name": tree_name}})
+    events.append({"name": "process_name", "ph": "M", "pid": 0,
+                   "args": {"name": "profiled functions"}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path):
+    """Save recorded updates to json file in Chrome trace format"""
+    with open(path, "w") as trace_file:
+        json.dump(get_chrome_trace(), trace_file)
+    info("Update trace saved to %s", path)
+
+
+def reset():
+    """Forget all records"""
+    with _lock:
+        _updates.clear()
+    _spans.clear()
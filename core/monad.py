@@ -25,13 +25,16 @@ from bpy.types import Node, NodeTree
 from bpy.props import StringProperty, FloatProperty, IntProperty, BoolProperty, CollectionProperty
 
 import sverchok
-from sverchok.utils import get_node_class_reference, sv_IO_monad_helpers
+from sverchok.utils import get_node_class_reference, sv_IO_monad_helpers, sv_monad_pool
 from sverchok.utils.sv_IO_panel_tools import create_dict_of_tree, import_tree
-from sverchok.utils.logging import info, error
+from sverchok.utils.logging import info, error, debug
 from sverchok.node_tree import SverchCustomTreeNode, SvNodeTreeCommon
 from sverchok.data_structure import get_other_socket, updateNode, match_long_repeat
-from sverchok.core.update_system import make_tree_from_nodes, do_update
+from sverchok.core.update_system import (
+    get_tree_from_nodes, tag_tree_changed, do_update, is_animation_dependent, keyframed_node_names,
+    get_graph_cache)
 from sverchok.core.monad_properties import SvIntPropertySettingsGroup, SvFloatPropertySettingsGroup
+from sverchok.core.socket_data import forget_freed_sockets
 
 
 MONAD_COLOR = (0.830819, 0.911391, 0.754562)
@@ -292,6 +295,8 @@ class SverchGroupTree(NodeTree, SvNodeTreeCommon):
 
 
     def update(self):
+        tag_tree_changed(self)
+        forget_freed_sockets(self)
         affected_trees = {instance.id_data for instance in self.instances}
         for tree in affected_trees:
             tree.update()
@@ -418,6 +423,107 @@ def split_list(data, size=1):
 def unwrap(data):
     return list(chain.from_iterable(data))
 
+def find_batch_blocker(monad, update_list):
+    """
+    Name of the first node in update list of vectorized monad that can't
+    take all items in one pass, None if all nodes are list transparent
+    """
+    for name in update_list:
+        node = monad.nodes[name]
+        if node.bl_idname == 'NodeReroute':
+            continue
+        if not getattr(node, 'is_list_transparent', False):
+            return name
+    return None
+
+def find_scene_dependency(monad):
+    """
+    Name of the first node of monad that reads or writes Blender data or
+    depends on frame, None if there is none. Monad workers start with an
+    empty file, so such monads are vectorized in this Blender only.
+    """
+    keyframed = keyframed_node_names(monad)
+    for name, node in monad.nodes.items():
+        if getattr(node, 'is_scene_dependent', False) or is_animation_dependent(node) or name in keyframed:
+            return name
+        inner = getattr(node, 'monad', None)
+        if inner and find_scene_dependency(inner):
+            return name
+    return None
+
+def find_count_mismatch(monad, update_list, count):
+    """Name of the first node which has set other number of objects than count"""
+    for name in update_list:
+        node = monad.nodes[name]
+        for socket in node.outputs:
+            if socket.is_linked:
+                data = socket.sv_get(deepcopy=False, default=[])
+                if len(data) not in (1, count):
+                    return name
+    return monad.output_node.name
+
+def process_batched(monad, data_in, ul):
+    """
+    Pass all items through the monad at once, all its nodes must be
+    list transparent. Returns output data, or None if some output
+    has not got exactly one object per item.
+    """
+    in_node = monad.input_node
+    out_node = monad.output_node
+    count = len(data_in[0])
+
+    for idx, data in enumerate(data_in):
+        socket = in_node.outputs[idx]
+        if socket.is_linked:
+            socket.sv_set(data)
+    monad["current_index"] = 0
+    do_update(ul, monad.nodes)
+
+    data_out = []
+    for s in out_node.inputs[:-1]:
+        data = s.sv_get(deepcopy=False)
+        if len(data) != count:
+            return None
+        data_out.append(data)
+    return data_out
+
+def vectorize_monad(monad, data_in, first_index=0, total=None):
+    """
+    Run monad for every item of matched input lists, returns list of
+    output data, one per output. If only a part of items is given,
+    first_index and total tell Monad Info which part it is.
+    """
+    in_node = monad.input_node
+    out_node = monad.output_node
+    ul = get_tree_from_nodes([out_node.name], monad, down=False)
+    monad["current_total"] = len(data_in[0]) if total is None else total
+
+    # a node which gave other number of objects is remembered until the monad is edited
+    graph_cache = get_graph_cache(monad)
+    blocker = find_batch_blocker(monad, ul) or graph_cache.get("count_mismatch")
+    if blocker is None:
+        batched_out = process_batched(monad, data_in, ul)
+        if batched_out is not None:
+            monad["batch_blocker"] = ""
+            return batched_out
+        blocker = graph_cache["count_mismatch"] = find_count_mismatch(monad, ul, len(data_in[0]))
+
+    if monad.get("batch_blocker") != blocker:
+        debug("Monad %s runs per item because of node %s", monad.name, blocker)
+    monad["batch_blocker"] = blocker
+
+    data_out = [[] for s in out_node.inputs[:-1]]
+    for master_idx, data in enumerate(zip(*data_in), first_index):
+        for idx, d in enumerate(data):
+            socket = in_node.outputs[idx]
+            if socket.is_linked:
+                socket.sv_set([d])
+        monad["current_index"] = master_idx
+        do_update(ul, monad.nodes)
+        for idx, s in enumerate(out_node.inputs[:-1]):
+            data_out[idx].extend(s.sv_get(deepcopy=False))
+    return data_out
+
 def uget(self, origin):
     return self[origin]
 
@@ -448,6 +554,16 @@ class SvGroupNodeExp:
         name="Split", description="Split inputs into lenght 1",
         default=False, update=updateNode)
 
+    workers = IntProperty(
+        name="Workers", default=0, min=0, max=64,
+        description="Spread vectorized items over this many background Blender processes, 0 to run them here",
+        update=updateNode)
+
+    chunk_size = IntProperty(
+        name="Chunk Size", default=0, min=0,
+        description="Items sent to a worker at once, 0 to divide them evenly between workers",
+        update=updateNode)
+
     loop_me = BoolProperty(default=False, update=updateNode)
     loops_max = IntProperty(default=5, description='maximum')
     loops = IntProperty(
@@ -460,6 +576,15 @@ class SvGroupNodeExp:
     def draw_label(self):
         return self.monad.name
 
+    @property
+    def is_list_transparent(self):
+        """Vectorized monad gives one object per item if it runs in one pass"""
+        monad = self.monad
+        if not (monad and self.vectorize):
+            return False
+        ul = get_tree_from_nodes([monad.output_node.name], monad, down=False)
+        return find_batch_blocker(monad, ul) is None and not get_graph_cache(monad).get("count_mismatch")
+
     @property
     def monad(self):
         for tree in bpy.data.node_groups:
@@ -488,6 +613,12 @@ class SvGroupNodeExp:
     def draw_buttons_ext(self, context, layout):
         self.draw_buttons(context, layout)
         layout.prop(self, 'loops_max')
+        col = layout.column(align=True)
+        col.active = self.vectorize
+        col.prop(self, 'workers')
+        col.prop(self, 'chunk_size')
+        if self.vectorize and self.workers and self.monad and self.monad.get("worker_blocker"):
+            layout.label("Not in workers, because of: " + self.monad["worker_blocker"], icon='INFO')
 
     def draw_buttons(self, context, layout):
 
@@ -498,6 +629,9 @@ class SvGroupNodeExp:
         cA.prop(self, "vectorize", toggle=True)
         cB.active = self.vectorize
         cB.prop(self, "split", toggle=True)
+
+        if self.vectorize and self.monad and self.monad.get("batch_blocker"):
+            layout.label("Per item, because of: " + self.monad["batch_blocker"], icon='INFO')
         
         c2 = layout.column()
         row = c2.row(align=True)
@@ -535,9 +669,7 @@ class SvGroupNodeExp:
             data = socket.sv_get(deepcopy=False)
             in_node.outputs[index].sv_set(data)
 
-        #  get update list
-        #  could be cached
-        ul = make_tree_from_nodes([out_node.name], monad, down=False)
+        ul = get_tree_from_nodes([out_node.name], monad, down=False)
         do_update(ul, monad.nodes)
         # set output sockets correctly
         for index, socket in enumerate(self.outputs):
@@ -547,11 +679,6 @@ class SvGroupNodeExp:
 
     def process_vectorize(self):
         monad = self.monad
-        in_node = monad.input_node
-        out_node = monad.output_node
-        ul = make_tree_from_nodes([out_node.name], monad, down=False)
-
-        data_out = [[] for s in self.outputs]
 
         data_in = match_long_repeat([s.sv_get(deepcopy=False) for s in self.inputs])
         if self.split:
@@ -560,24 +687,21 @@ class SvGroupNodeExp:
                 data_in[idx] = new_data
             data_in = match_long_repeat(data_in)
 
-        monad["current_total"] = len(data_in[0])
-
-
-        for master_idx, data in enumerate(zip(*data_in)):
-            for idx, d in enumerate(data):
-                socket = in_node.outputs[idx]
-                if socket.is_linked:
-                    socket.sv_set([d])
-            monad["current_index"] = master_idx
-            do_update(ul, monad.nodes)
-            for idx, s in enumerate(out_node.inputs[:-1]):
-                data_out[idx].extend(s.sv_get(deepcopy=False))
+        data_out = None
+        if self.workers and len(data_in[0]) > 1:
+            blocker = find_scene_dependency(monad)
+            if blocker is None:
+                data_out = sv_monad_pool.vectorize_in_workers(monad, data_in, self.workers, self.chunk_size)
+                if data_out is None:
+                    blocker = "input data can't be sent to workers"
+            monad["worker_blocker"] = blocker or ""
+        if data_out is None:
+            data_out = vectorize_monad(monad, data_in)
 
         for idx, socket in enumerate(self.outputs):
             if socket.is_linked:
                 socket.sv_set(data_out[idx])
 
-
     # ----------- loop (iterate 2)
 
     def do_process(self, sockets_data_in):
@@ -590,7 +714,7 @@ class SvGroupNodeExp:
             in_node.outputs[index].sv_set(data)        
 
 
-        ul = make_tree_from_nodes([out_node.name], monad, down=False)
+        ul = get_tree_from_nodes([out_node.name], monad, down=False)
         do_update(ul, monad.nodes)
 
         # set output sockets correctly
@@ -636,4 +760,5 @@ def register():
     bpy.utils.register_class(SverchGroupTree)
 
 def unregister():
+    sv_monad_pool.shutdown()
     bpy.utils.unregister_class(SverchGroupTree)
@@ -16,8 +16,14 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+import collections
+import itertools
+import sys
+
+import numpy as np
+
 from sverchok import data_structure
-from sverchok.utils.logging import warning, info
+from sverchok.utils.logging import warning, info, debug
 
 #####################################
 # socket data cache                 #
@@ -25,9 +31,44 @@ from sverchok.utils.logging import warning, info
 
 sentinel = object()
 
-# socket cache
+# socket cache, keyed by socket_id of output sockets
 socket_data_cache = {}
 
+# socket ids written per tree, keyed by tree_id, for reset_socket_cache
+tree_socket_ids = {}
+
+# list or array versions of socket data, converted once per data
+# for nodes that ask for the other kind, see SvGetSocket
+socket_data_views = {}
+
+# revision of socket data, used by the incremental update
+# a new revision is only given if the data actually changed
+socket_data_revision = {}
+_revision_counter = itertools.count(1)
+
+
+# estimated size of cached data in bytes, in least recently used order,
+# used to keep the cache in budget, see enforce_cache_budget; data is
+# measured only while some budget is set
+socket_data_sizes = collections.OrderedDict()
+socket_data_tree = {}
+tree_data_size = collections.Counter()
+total_data_size = 0
+
+# sockets whose data was evicted, it's computed again when asked for
+evicted_sockets = set()
+_recomputing = set()
+
+cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "recomputes": 0}
+
+# number of items measured per list by estimate_data_size
+SIZE_SAMPLES = 8
+
+
+def tree_id(ng):
+    """Id of node tree used by data_cache, doesn't change on rename"""
+    return ng.as_pointer()
+
 # faster than builtin deep copy for us.
 # useful for our limited case
 # we should be able to specify vectors here to get them create
@@ -43,12 +84,158 @@ def sv_deep_copy(lst):
     return lst
 
 
+def sv_cow_copy(lst):
+    """
+    return copy-on-write data of list/tuple structure,
+    same result as sv_deep_copy but nested lists are only copied
+    when they are taken out of the container, see SvCowList
+    """
+    if isinstance(lst, (list, tuple)):
+        if lst and not isinstance(lst[0], (list, tuple)):
+            return lst[:]
+        return SvCowList(lst)
+    return lst
+
+
+class SvCowList(list):
+    """
+    Copy-on-write list used for socket data.
+
+    Only the top level is copied on creation. Nested lists stay shared
+    with the socket cache until a node takes them out of the list, by
+    indexing, iteration, pop etc., then they are replaced by a private
+    copy (made lazily the same way). Shared nested data is never given
+    out, so a node can change the data as it likes. Numpy reads the data
+    without copying nested lists, see __array__, while other C code that
+    iterates the list, like mathutils, gets copies.
+    """
+
+    def __init__(self, iterable=()):
+        if isinstance(iterable, SvCowList):
+            # take items as they are, they are not owned by the new list anyway
+            iterable = list.__iter__(iterable)
+        super().__init__(iterable)
+        # ids of nested lists that belong to this list and need no copy
+        self._owned = set()
+        self._all_owned = False
+
+    def _detach(self, index):
+        item = list.__getitem__(self, index)
+        if self._all_owned:
+            return item
+        if isinstance(item, (list, tuple)) and id(item) not in self._owned:
+            if isinstance(item, tuple) and not (item and isinstance(item[0], (list, tuple))):
+                return item
+            item = sv_cow_copy(item)
+            list.__setitem__(self, index, item)
+            self._owned.add(id(item))
+        return item
+
+    def _own(self, items):
+        self._owned.update(id(item) for item in items if isinstance(item, list))
+
+    def _wrap(self, items):
+        """new SvCowList that shares ownership with this one"""
+        result = SvCowList(items)
+        result._owned = self._owned
+        result._all_owned = self._all_owned
+        return result
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._wrap(list.__getitem__(self, index))
+        item = list.__getitem__(self, index)
+        # scalars and items that need no copy are returned right away
+        if self._all_owned or not isinstance(item, (list, tuple)) or id(item) in self._owned:
+            return item
+        return self._detach(index)
+
+    def _detach_all(self):
+        if self._all_owned:
+            return
+        owned = self._owned
+        items = []
+        append = items.append
+        for item in list.__iter__(self):
+            if isinstance(item, (list, tuple)) and id(item) not in owned:
+                if item and isinstance(item[0], (list, tuple)):
+                    item = SvCowList(item)
+                elif isinstance(item, list):
+                    item = item[:]
+            append(item)
+        list.__setitem__(self, slice(None), items)
+        # from now on all items belong to this list
+        self._all_owned = True
+
+    def __array__(self, dtype=None, copy=None):
+        # numpy copies the values, the shared lists stay as they are
+        array = np.array(list(list.__iter__(self)), dtype=dtype)
+        if array.dtype == object:
+            # nested lists of different length end up in the array
+            array = np.array(list(self), dtype=dtype)
+        return array
+
+    def __iter__(self):
+        # iteration takes out all items, so copy them in one go
+        self._detach_all()
+        return list.__iter__(self)
+
+    def __reversed__(self):
+        self._detach_all()
+        return list.__reversed__(self)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            self._own(value)
+        elif isinstance(value, list):
+            self._owned.add(id(value))
+        list.__setitem__(self, index, value)
+
+    def __add__(self, other):
+        result = self._wrap(list.__add__(self, other))
+        result._all_owned = False
+        return result
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __mul__(self, n):
+        return self._wrap(list.__mul__(self, n))
+
+    __rmul__ = __mul__
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+    def append(self, item):
+        if isinstance(item, list):
+            self._owned.add(id(item))
+        list.append(self, item)
+
+    def extend(self, items):
+        items = list(items)
+        self._own(items)
+        list.extend(self, items)
+
+    def insert(self, index, item):
+        if isinstance(item, list):
+            self._owned.add(id(item))
+        list.insert(self, index, item)
+
+    def pop(self, index=-1):
+        item = self._detach(index)
+        list.pop(self, index)
+        return item
+
+    def copy(self):
+        return self[:]
+
+
 # Build string for showing in socket label
 def SvGetSocketInfo(socket):
     """returns string to show in socket label"""
-    global socket_data_cache
-    ng = socket.id_data.name
-
     if socket.is_output:
         s_id = socket.socket_id
     elif socket.is_linked:
@@ -59,11 +246,9 @@ def SvGetSocketInfo(socket):
             return ''
     else:
         return ''
-    if ng in socket_data_cache:
-        if s_id in socket_data_cache[ng]:
-            data = socket_data_cache[ng][s_id]
-            if data:
-                return str(len(data))
+    data = socket_data_cache.get(s_id)
+    if data is not None and len(data):
+        return str(len(data))
     return ''
 
 
@@ -76,30 +261,300 @@ def SvSetSocket(socket, out):
         if not socket.is_linked:
             warning("{} setting unconncted socket: {}".format(socket.node.name, socket.name))
     s_id = socket.socket_id
-    s_ng = socket.id_data.name
-    if s_ng not in socket_data_cache:
-        socket_data_cache[s_ng] = {}
-    socket_data_cache[s_ng][s_id] = out
+    if not (data_structure.INCREMENTAL_UPDATE and s_id in socket_data_revision
+            and is_same_data(socket_data_cache.get(s_id, sentinel), out)):
+        socket_data_revision[s_id] = next(_revision_counter)
+    t_id = socket_data_tree.get(s_id)
+    if t_id is None:
+        t_id = socket_data_tree[s_id] = tree_id(socket.id_data)
+    if s_id not in socket_data_cache:
+        tree_socket_ids.setdefault(t_id, set()).add(s_id)
+    socket_data_cache[s_id] = out
+    drop_data_views(s_id)
+    evicted_sockets.discard(s_id)
+    if data_structure.CACHE_TREE_BUDGET or data_structure.CACHE_TOTAL_BUDGET:
+        account_data_size(s_id, t_id, out)
+
+
+def account_data_size(s_id, t_id, data):
+    """Measure data of socket for the cache budget, it's the most recently used now"""
+    global total_data_size
+    size = estimate_data_size(data)
+    change = size - socket_data_sizes.pop(s_id, 0)
+    tree_data_size[t_id] += change
+    total_data_size += change
+    socket_data_sizes[s_id] = size
+
+
+def estimate_data_size(data):
+    """
+    Estimate memory used by socket data in bytes, for long lists
+    only a few items are measured and the rest is extrapolated.
+    """
+    if isinstance(data, np.ndarray):
+        return data.nbytes
+    if isinstance(data, (list, tuple)):
+        size = sys.getsizeof(data)
+        count = len(data)
+        if count:
+            step = max(1, count // SIZE_SAMPLES)
+            # list.__getitem__ to not detach items of SvCowList
+            if isinstance(data, list):
+                sample = list.__getitem__(data, slice(None, None, step))
+            else:
+                sample = data[::step]
+            size += sum(estimate_data_size(item) for item in sample) * count / len(sample)
+        return int(size)
+    return sys.getsizeof(data)
+
+
+def evict_socket_data(s_id):
+    """Drop data of socket from cache, it's computed again when needed"""
+    global total_data_size
+    socket_data_cache.pop(s_id, None)
+    drop_data_views(s_id)
+    size = socket_data_sizes.pop(s_id, 0)
+    tree_data_size[socket_data_tree[s_id]] -= size
+    total_data_size -= size
+    evicted_sockets.add(s_id)
+    cache_stats["evictions"] += 1
+
+
+def set_cache_budget(tree_budget, total_budget):
+    """
+    Set budgets in bytes, 0 for no limit. Cached data is measured when
+    a budget is set first, and forgotten when there is no budget anymore.
+    """
+    global total_data_size
+    was_set = data_structure.CACHE_TREE_BUDGET or data_structure.CACHE_TOTAL_BUDGET
+    data_structure.CACHE_TREE_BUDGET = tree_budget
+    data_structure.CACHE_TOTAL_BUDGET = total_budget
+    if not (tree_budget or total_budget):
+        socket_data_sizes.clear()
+        tree_data_size.clear()
+        total_data_size = 0
+    elif not was_set:
+        for s_id, data in socket_data_cache.items():
+            account_data_size(s_id, socket_data_tree[s_id], data)
+    enforce_cache_budget()
+
+
+def enforce_cache_budget():
+    """
+    Evict least recently used socket data until every tree fits in
+    CACHE_TREE_BUDGET and all trees together fit in CACHE_TOTAL_BUDGET,
+    a budget of 0 means no limit. The update system calls it after an
+    update, nodes may still need data during one.
+    """
+    tree_budget = data_structure.CACHE_TREE_BUDGET
+    total_budget = data_structure.CACHE_TOTAL_BUDGET
+    if not (tree_budget or total_budget):
+        return
+    over_trees = set(t_id for t_id, size in tree_data_size.items() if tree_budget and size > tree_budget)
+
+    for s_id in list(socket_data_sizes):
+        over_total = total_budget and total_data_size > total_budget
+        if not over_total and not over_trees:
+            break
+        t_id = socket_data_tree[s_id]
+        if not (over_total or t_id in over_trees):
+            continue
+        evict_socket_data(s_id)
+        if t_id in over_trees and tree_data_size[t_id] <= tree_budget:
+            over_trees.discard(t_id)
+
+
+def data_size(s_id):
+    """Estimated size of cached data of socket, measured now if no budget is set"""
+    size = socket_data_sizes.get(s_id)
+    if size is None:
+        data = socket_data_cache.get(s_id, sentinel)
+        size = 0 if data is sentinel else estimate_data_size(data)
+    return size
+
+
+def recompute_socket_data(socket):
+    """Compute evicted data of output socket again by updating nodes it depends on"""
+    # update system depends on this module
+    from sverchok.core.update_system import update_upstream
+
+    s_id = socket.socket_id
+    if s_id in _recomputing:
+        return sentinel
+    _recomputing.add(s_id)
+    try:
+        cache_stats["recomputes"] += 1
+        update_upstream(socket.node)
+    finally:
+        _recomputing.discard(s_id)
+    return socket_data_cache.get(s_id, sentinel)
+
+
+def get_cache_stats(ng=None):
+    """
+    Statistics of socket data cache for monitoring, resident bytes
+    are for all trees or only for tree ng if it's given.
+    """
+    stats = dict(cache_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    if data_structure.CACHE_TREE_BUDGET or data_structure.CACHE_TOTAL_BUDGET:
+        stats["resident_bytes"] = total_data_size if ng is None else tree_data_size.get(tree_id(ng), 0)
+    else:
+        s_ids = socket_data_cache if ng is None else tree_socket_ids.get(tree_id(ng), ())
+        stats["resident_bytes"] = sum(data_size(s_id) for s_id in s_ids)
+    return stats
+
+
+def is_same_data(old, new):
+    """
+    Check if socket data is equal to the previous data, arrays are
+    compared by value. The same object set again counts as changed,
+    the node may have changed it in place.
+    """
+    if old is sentinel or old is new:
+        return False
+    if is_array_data(old) or is_array_data(new):
+        if not (is_array_data(old) and is_array_data(new)) or len(old) != len(new):
+            return False
+        return all(np.array_equal(a, b) for a, b in zip(old, new))
+    try:
+        return bool(old == new)
+    except (ValueError, TypeError):
+        return False
+
+
+def is_array_data(data):
+    """
+    Check if socket data is numpy based, that is an array,
+    or a list of objects where any object is an array.
+    """
+    if isinstance(data, np.ndarray):
+        return True
+    return isinstance(data, (list, tuple)) and any(isinstance(obj, np.ndarray) for obj in data)
+
+
+def data_to_list(data):
+    """Convert numpy based socket data into nested lists"""
+    if isinstance(data, np.ndarray):
+        return data.tolist()
+    return [obj.tolist() if isinstance(obj, np.ndarray) else obj for obj in data]
+
+
+def data_to_arrays(data):
+    """
+    Convert socket data into a list of arrays, one per object.
+    Objects that are not rectangular, like polygons with different
+    number of sides, are left as lists.
+    """
+    if isinstance(data, np.ndarray):
+        return list(data) if data.ndim > 1 else [data]
+    result = []
+    for obj in data:
+        if isinstance(obj, np.ndarray):
+            result.append(obj)
+            continue
+        try:
+            array = np.array(obj)
+        except ValueError:
+            array = obj
+        if isinstance(array, np.ndarray) and array.dtype == object:
+            array = obj
+        result.append(array)
+    return result
+
+
+def get_data_view(s_id, kind, data):
+    """
+    Get list or array version of socket data, converting it only once,
+    or its DataShape for kind 'shape'
+    """
+    views = socket_data_views.setdefault(s_id, {})
+    if kind == 'shape':
+        # checked on every use, nodes may change shared data
+        views[kind] = data_structure.cache_data_shape(data)
+    elif kind not in views:
+        if kind == 'list':
+            views[kind] = data_to_list(data)
+        else:
+            views[kind] = data_to_arrays(data)
+    return views[kind]
+
+
+def drop_data_views(s_id):
+    views = socket_data_views.pop(s_id, None)
+    if views and 'shape' in views:
+        data_structure.forget_data_shape(views['shape'])
+
+
+def SvGetSocketShape(socket):
+    """
+    DataShape of the data that socket passes on, computed once per data.
+    Returns None if there is no data.
+    """
+    if not socket.is_output:
+        socket = socket.other
+        if socket is None:
+            return None
+    s_id = socket.socket_id
+    data = socket_data_cache.get(s_id, sentinel)
+    if data is sentinel:
+        return None
+    if is_array_data(data):
+        data = get_data_view(s_id, 'list', data)
+    return get_data_view(s_id, 'shape', data)
+
+
+def SvGetSocketRevision(socket):
+    """
+    Get revision of the data that socket passes on,
+    for input sockets the revision of the linked output socket.
+    Returns None if there is no data.
+    """
+    if not socket.is_output:
+        socket = socket.other
+        if socket is None:
+            return None
+    return socket_data_revision.get(socket.socket_id)
 
 
-def SvGetSocket(socket, deepcopy=True):
+def SvGetSocket(socket, deepcopy=True, as_array=False):
     """gets socket data from socket,
-    if deep copy is True a deep copy is make_dep_dict,
+    if deep copy is True a copy-on-write copy is made, nested lists
+    are copied only when the node takes them out of the data,
     to increase performance if the node doesn't mutate input
     set to False and increase performance substanstilly
+
+    Data can be set as nested lists or as numpy arrays, the reading node
+    gets lists unless as_array is True, then it gets a list of arrays,
+    one per object. Conversion between them is done once per data.
     """
     global socket_data_cache
     if socket.is_linked:
         other = socket.other
         s_id = other.socket_id
-        s_ng = other.id_data.name
-        if s_ng not in socket_data_cache:
-            raise LookupError
-        if s_id in socket_data_cache[s_ng]:
-            out = socket_data_cache[s_ng][s_id]
+        out = socket_data_cache.get(s_id, sentinel)
+        if out is sentinel:
+            cache_stats["misses"] += 1
+            if s_id in evicted_sockets:
+                out = recompute_socket_data(other)
+        else:
+            cache_stats["hits"] += 1
+            if s_id in socket_data_sizes:
+                socket_data_sizes.move_to_end(s_id)
+        if out is not sentinel:
+            if as_array:
+                out = get_data_view(s_id, 'array', out)
+                if deepcopy:
+                    return [obj.copy() if isinstance(obj, np.ndarray) else sv_cow_copy(obj) for obj in out]
+                return out
+            if is_array_data(out):
+                out = get_data_view(s_id, 'list', out)
             if deepcopy:
-                return sv_deep_copy(out)
+                return sv_cow_copy(out)
             else:
+                # level helpers can use its shape while the node doesn't change it
+                get_data_view(s_id, 'shape', out)
                 return out
         else:
             if data_structure.DEBUG_MODE:
@@ -145,19 +600,74 @@ def get_output_socket_data(node, output_socket_name):
 
     global socket_data_cache
 
-    tree_name = node.id_data.name
     socket = node.outputs[output_socket_name]
     socket_id = socket.socket_id
-    if tree_name not in socket_data_cache:
-        raise SvNoDataError()
-    if socket_id in socket_data_cache[tree_name]:
-        return socket_data_cache[tree_name][socket_id]
+    if socket_id in socket_data_cache:
+        return socket_data_cache[socket_id]
     else:
         raise SvNoDataError(socket)
 
+def forget_socket(s_id):
+    """Drop everything kept for socket"""
+    global total_data_size
+    socket_data_cache.pop(s_id, None)
+    drop_data_views(s_id)
+    socket_data_revision.pop(s_id, None)
+    size = socket_data_sizes.pop(s_id, 0)
+    t_id = socket_data_tree.pop(s_id, None)
+    if size:
+        tree_data_size[t_id] -= size
+        total_data_size -= size
+    evicted_sockets.discard(s_id)
+
+
+def forget_tree(t_id):
+    for s_id in tree_socket_ids.pop(t_id, ()):
+        forget_socket(s_id)
+    tree_data_size.pop(t_id, None)
+
+
 def reset_socket_cache(ng):
     """
     Reset socket cache either for node group.
     """
-    global socket_data_cache
-    socket_data_cache[ng.name] = {}
+    forget_tree(tree_id(ng))
+
+
+def forget_freed_sockets(ng):
+    """
+    Drop data of sockets which are not in the tree anymore, Blender gives
+    their memory, and so their ids, to new sockets
+    """
+    s_ids = tree_socket_ids.get(tree_id(ng))
+    if not s_ids:
+        return
+    alive = {socket.socket_id for node in ng.nodes for socket in node.outputs}
+    for s_id in s_ids - alive:
+        forget_socket(s_id)
+    s_ids &= alive
+
+
+def forget_freed_trees(trees):
+    """Drop data of trees which are not in trees anymore, like forget_freed_sockets"""
+    alive = {tree_id(ng) for ng in trees}
+    for t_id in set(tree_socket_ids) - alive:
+        forget_tree(t_id)
+
+
+def clear_socket_cache():
+    """
+    Drop data of all trees. Needed when Blender reallocates the data,
+    after undo for example, as socket ids are only valid until then.
+    """
+    global total_data_size
+    socket_data_cache.clear()
+    tree_socket_ids.clear()
+    socket_data_views.clear()
+    data_structure.data_shapes.clear()
+    socket_data_revision.clear()
+    socket_data_sizes.clear()
+    socket_data_tree.clear()
+    tree_data_size.clear()
+    total_data_size = 0
+    evicted_sockets.clear()
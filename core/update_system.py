@@ -17,13 +17,21 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import collections
+import itertools
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 import bpy
 from mathutils import Vector
 
 from sverchok import data_structure
-from sverchok.core.socket_data import SvNoDataError, reset_socket_cache
+from sverchok.core import instrumentation
+from sverchok.core.socket_data import (
+    SvNoDataError, reset_socket_cache, SvGetSocketRevision, get_output_socket_data,
+    enforce_cache_budget)
 from sverchok.utils.logging import debug, info, warning, error, exception
 from sverchok.utils.profile import profile
 import sverchok
@@ -31,7 +39,6 @@ import sverchok
 import traceback
 import ast
 
-graphs = []
 
 no_data_color = (1, 0.3, 0)
 exception_color = (0.8, 0.0, 0)
@@ -46,6 +53,19 @@ def update_error_colors(self, context):
 update_cache = {}
 # cache for partial update lists
 partial_update_cache = {}
+# fingerprints of nodes from their last successful run, for incremental update
+node_fingerprints = {}
+# thread pool used by the parallel update
+_thread_pool = None
+
+# revision of the structure of each tree, changed on every edit of nodes or links
+tree_revisions = {}
+_tree_revision_counter = itertools.count(1)
+# dependency dicts and update lists per tree, valid while the revision is the same
+dep_graph_cache = {}
+
+# nesting of do_update calls, monads update their trees inside of an update
+_update_depth = 0
 
 
 def make_dep_dict(node_tree, down=False):
@@ -94,6 +114,65 @@ def make_dep_dict(node_tree, down=False):
     return deps
 
 
+def get_tree_revision(ng):
+    """Revision of the structure of the tree"""
+    revision = tree_revisions.get(ng.name)
+    if revision is None:
+        revision = tree_revisions[ng.name] = next(_tree_revision_counter)
+    return revision
+
+
+def tag_tree_changed(ng):
+    """
+    Give the tree a new revision, this drops the cached dependency graph.
+    Called whenever nodes or links of the tree are changed.
+    """
+    tree_revisions[ng.name] = next(_tree_revision_counter)
+    dep_graph_cache.pop(ng.name, None)
+
+
+def get_graph_cache(ng):
+    """
+    Cached dependency data of the tree for the current revision,
+    other data that is valid until the tree is edited can be kept in it
+    """
+    # node and link count guard against edits which did not call tag_tree_changed
+    revision = (get_tree_revision(ng), len(ng.nodes), len(ng.links))
+    cache = dep_graph_cache.get(ng.name)
+    if cache is None or cache["revision"] != revision:
+        cache = {"revision": revision, "deps": {}, "update_lists": {}}
+        dep_graph_cache[ng.name] = cache
+    return cache
+
+
+def get_dep_dict(node_tree, down=False):
+    """
+    Same as make_dep_dict, but the result is cached until the structure of
+    the tree changes. The result is shared, it must not be modified.
+    """
+    cache = get_graph_cache(node_tree)["deps"]
+    deps = cache.get(down)
+    if deps is None:
+        deps = make_dep_dict(node_tree, down)
+        # an empty result for a tree with links means links are being edited
+        if deps or not node_tree.links:
+            cache[down] = deps
+    return deps
+
+
+def get_tree_from_nodes(node_names, tree, down=True):
+    """
+    Same as make_tree_from_nodes, but the update list is cached until
+    the structure of the tree changes.
+    """
+    cache = get_graph_cache(tree)["update_lists"]
+    key = (frozenset(node_names), down)
+    update_list = cache.get(key)
+    if update_list is None:
+        update_list = cache[key] = make_tree_from_nodes(node_names, tree, down)
+    return update_list
+
+
 def make_update_list(node_tree, node_set=None, dependencies=None):
     """
     Makes a update list from a node_group
@@ -113,7 +192,7 @@ def make_update_list(node_tree, node_set=None, dependencies=None):
     else:
         return []
     if not dependencies:
-        deps = make_dep_dict(ng)
+        deps = get_dep_dict(ng)
     else:
         deps = dependencies
 
@@ -159,10 +238,10 @@ def separate_nodes(ng, links=None):
     nodes = set(ng.nodes.keys())
     if not nodes:
         return []
-    node_links = make_dep_dict(ng)
-    down = make_dep_dict(ng, down=True)
-    for name, links in down.items():
-        node_links[name].update(links)
+    node_links = collections.defaultdict(set)
+    for deps in (get_dep_dict(ng), get_dep_dict(ng, down=True)):
+        for name, links in deps.items():
+            node_links[name].update(links)
     n = nodes.pop()
     node_set_list = [set([n])]
     node_stack = collections.deque()
@@ -207,10 +286,9 @@ def make_tree_from_nodes(node_names, tree, down=True):
     out_stack = collections.deque(node_names)
     current_node = out_stack.pop()
 
-    # build downwards links, this should be cached perhaps
-    node_links = make_dep_dict(ng, down)
+    node_links = get_dep_dict(ng, down)
     while current_node:
-        for node in node_links[current_node]:
+        for node in node_links.get(current_node, ()):
             if node not in out_set:
                 out_set.add(node)
                 out_stack.append(node)
@@ -225,26 +303,70 @@ def make_tree_from_nodes(node_names, tree, down=True):
         return make_update_list(ng, out_set)
 
 
-# to make update tree based on node types and node names bases
-# no used yet
-# should add a check do find animated or driven nodes.
-# needs some updates
+# node name in data path of fcurves and drivers, like nodes["Box"].Divx
+_node_data_path = re.compile(r'nodes\["((?:[^"\\]|\\.)*)"\]')
+
+
+def keyframed_node_names(ng):
+    """Names of nodes that have keyframed or driven properties"""
+    anim = ng.animation_data
+    if not anim:
+        return set()
+    fcurves = list(anim.drivers)
+    if anim.action:
+        fcurves.extend(anim.action.fcurves)
+    names = set()
+    for fcurve in fcurves:
+        match = _node_data_path.match(fcurve.data_path)
+        if match:
+            names.add(match.group(1).replace('\\"', '"'))
+    return names
+
+
+def is_animation_dependent(node):
+    """Check if node output can change from frame to frame by itself"""
+    if getattr(node, "is_animation_dependent", False):
+        return True
+    monad = getattr(node, "monad", None)
+    if monad:
+        return (any(is_animation_dependent(n) for n in monad.nodes)
+                or bool(keyframed_node_names(monad)))
+    return False
+
+
+def is_scene_dependent(node):
+    """Check if node reads or writes Blender data, by itself or in its monad"""
+    if getattr(node, "is_scene_dependent", False):
+        return True
+    monad = getattr(node, "monad", None)
+    return bool(monad) and any(is_scene_dependent(n) for n in monad.nodes)
+
 
-def make_animation_tree(node_types, node_list, tree_name):
+def animated_node_names(ng):
     """
-    Create update list for specific purposes depending on which nodes are dynamic
-    node_types
+    Names of time dependent source nodes: nodes that read frame or scene,
+    monads containing them, and nodes with keyframed or driven properties.
     """
-    global update_cache
-    ng = bpy.data.node_groups[tree_name]
-    node_set = set(node_list)
-    for n_t in node_types:
-        node_set = node_set | {name for name, node in ng.nodes.items() if node.bl_idname == n_t}
-    a_tree = make_tree_from_nodes(list(node_set), tree_name)
-    return a_tree
+    cache = get_graph_cache(ng)
+    dependent = cache.get("animated")
+    if dependent is None:
+        dependent = frozenset(name for name, node in ng.nodes.items() if is_animation_dependent(node))
+        cache["animated"] = dependent
+    return dependent | keyframed_node_names(ng)
 
 
-def do_update_heat_map(node_list, nodes):
+def make_animation_update_list(ng):
+    """
+    Update list of nodes that have to be processed on frame change,
+    time dependent sources and everything downstream of them.
+    """
+    sources = animated_node_names(ng)
+    if not sources:
+        return []
+    return get_tree_from_nodes(sources, ng)
+
+
+def do_update_heat_map(node_list, nodes, forced_nodes=None):
     """
     Create a heat map for the node tree,
     Needs development.
@@ -253,7 +375,7 @@ def do_update_heat_map(node_list, nodes):
         color_data = {node.name: (node.color[:], node.use_custom_color) for node in nodes}
         nodes.id_data.sv_user_colors = str(color_data)
 
-    times = do_update_general(node_list, nodes)
+    times = do_update_general(node_list, nodes, forced_nodes=forced_nodes)
     if not times:
         return
     t_max = max(times)
@@ -304,16 +426,80 @@ def reset_error_nodes(ng):
         del ng["error nodes"]
 
 
+def property_value(value):
+    """Convert ID property values into something that can be compared"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    return value
+
+
+def node_fingerprint(node):
+    """
+    Fingerprint of everything a node run depends on:
+    revisions of the data of linked inputs, settings of unlinked inputs
+    and the properties of the node.
+    Returns None for nodes that must always be processed, that is
+    nodes without linked inputs, these are sources of data, and nodes
+    that read or write the scene or depend on frame.
+    """
+    inputs = []
+    has_links = False
+    for socket in node.inputs:
+        if socket.is_linked:
+            has_links = True
+            inputs.append(SvGetSocketRevision(socket))
+        else:
+            inputs.append(tuple((k, property_value(v)) for k, v in socket.items()))
+    if not has_links or is_scene_dependent(node) or is_animation_dependent(node):
+        return None
+    props = tuple((k, property_value(v)) for k, v in node.items())
+    return tuple(inputs), props
+
+
+def has_output_data(node):
+    """Check that data of all linked outputs is still in the socket cache"""
+    for socket in node.outputs:
+        if socket.is_linked:
+            try:
+                get_output_socket_data(node, socket.name)
+            except SvNoDataError:
+                return False
+    return True
+
+
+def is_unchanged(node, fingerprint, fingerprints, forced_nodes=None):
+    """Check if node can be skipped by the incremental update"""
+    return (fingerprint is not None
+            and not (forced_nodes and node.name in forced_nodes)
+            and fingerprints.get(node.name) == fingerprint
+            and has_output_data(node))
+
+
+def reset_node_fingerprints(ng=None):
+    """Forget fingerprints, next update will process all nodes again"""
+    global node_fingerprints
+    if ng is None:
+        node_fingerprints = {}
+    else:
+        node_fingerprints[ng.name] = {}
+
+
 @profile(section="UPDATE")
-def do_update_general(node_list, nodes, procesed_nodes=set()):
+def do_update_general(node_list, nodes, procesed_nodes=set(), forced_nodes=None):
     """
     General update function for node set
+    With incremental update enabled nodes which fingerprint didn't change
+    since last run are skipped, unless they are in forced_nodes.
     """
-    global graphs
     timings = []
-    graph = []
+    update = instrumentation.start_update(nodes.id_data)
     total_time = 0
     done_nodes = set(procesed_nodes)
+    incremental = data_structure.INCREMENTAL_UPDATE
+    if incremental:
+        fingerprints = node_fingerprints.setdefault(nodes.id_data.name, {})
 
     for node_name in node_list:
         if node_name in done_nodes:
@@ -322,16 +508,23 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
             node = nodes[node_name]
             start = time.perf_counter()
             if hasattr(node, "process"):
-                node.process()
+                if incremental:
+                    fingerprint = node_fingerprint(node)
+                    if is_unchanged(node, fingerprint, fingerprints, forced_nodes):
+                        timings.append(0)
+                        continue
+                    fingerprints.pop(node_name, None)
+                    node.process()
+                    if fingerprint is not None:
+                        fingerprints[node_name] = fingerprint
+                else:
+                    node.process()
             delta = time.perf_counter() - start
             total_time += delta
             if data_structure.DEBUG_MODE:
                 debug("Processed  %s in: %.4f", node_name, delta)
             timings.append(delta)
-            graph.append({"name" : node_name,
-                           "bl_idname": node.bl_idname,
-                           "start": start,
-                           "duration": delta})
+            instrumentation.record_node(update, node, start, delta)
 
         except Exception as err:
             ng = nodes.id_data
@@ -339,17 +532,152 @@ def do_update_general(node_list, nodes, procesed_nodes=set()):
             #traceback.print_tb(err.__traceback__)
             exception("Node %s had exception: %s", node_name, err)
             return None
-    graphs.append(graph)
     if data_structure.DEBUG_MODE:
         debug("Node set updated in: %.4f seconds", total_time)
     return timings
 
 
-def do_update(node_list, nodes):
-    if data_structure.HEAT_MAP:
-        do_update_heat_map(node_list, nodes)
-    else:
-        do_update_general(node_list, nodes)
+def make_update_waves(node_list, deps):
+    """
+    Split a sorted update list into waves, nodes in the same wave
+    do not depend on each other and can be processed at the same time.
+    """
+    node_set = set(node_list)
+    levels = {}
+    waves = []
+    for name in node_list:
+        level = 1 + max((levels[dep] for dep in deps[name] if dep in node_set and dep in levels), default=-1)
+        levels[name] = level
+        if level == len(waves):
+            waves.append([])
+        waves[level].append(name)
+    return waves
+
+
+def get_thread_pool():
+    """Thread pool for parallel update, created on first use"""
+    global _thread_pool
+    if _thread_pool is None:
+        workers = 0
+        addon = bpy.context.user_preferences.addons.get(data_structure.SVERCHOK_NAME)
+        if addon:
+            workers = addon.preferences.parallel_workers
+        _thread_pool = ThreadPoolExecutor(max_workers=workers or None)
+    return _thread_pool
+
+
+def shutdown_thread_pool():
+    global _thread_pool
+    if _thread_pool is not None:
+        _thread_pool.shutdown()
+        _thread_pool = None
+
+
+def timed_call(function, data):
+    """function(data) with its duration and thread, for the thread pool"""
+    start = time.perf_counter()
+    result = function(data)
+    return result, start, time.perf_counter() - start, threading.get_ident()
+
+
+@profile(section="UPDATE")
+def do_update_parallel(node_list, nodes, forced_nodes=None):
+    """
+    Update function that processes independent nodes at the same time.
+    bpy is not thread safe, so only the sv_compute part of nodes that
+    have one is run in the thread pool, their inputs are read by sv_fetch
+    and outputs written by sv_store in the main thread. Other nodes of the
+    same wave are processed in the main thread meanwhile.
+    Errors are reported after the wave is done.
+    """
+    ng = nodes.id_data
+    deps = get_dep_dict(ng)
+    incremental = data_structure.INCREMENTAL_UPDATE
+    fingerprints = node_fingerprints.setdefault(ng.name, {})
+    pool = get_thread_pool()
+    timings = {}
+    update = instrumentation.start_update(ng)
+
+    def skip(node):
+        fingerprint = node_fingerprint(node) if incremental else None
+        if incremental and is_unchanged(node, fingerprint, fingerprints, forced_nodes):
+            timings[node.name] = 0
+            return True, None
+        fingerprints.pop(node.name, None)
+        return False, fingerprint
+
+    def done(node, fingerprint, start, delta, thread=None):
+        if fingerprint is not None:
+            fingerprints[node.name] = fingerprint
+        instrumentation.record_node(update, node, start, delta, thread)
+        timings[node.name] = delta
+
+    for wave in make_update_waves(node_list, deps):
+        wave_nodes = [nodes[name] for name in wave if hasattr(nodes[name], "process")]
+        errors = []
+        jobs = []
+        for node in wave_nodes:
+            if node.sv_compute is None:
+                continue
+            try:
+                skipped, fingerprint = skip(node)
+                if skipped:
+                    continue
+                start = time.perf_counter()
+                data = node.sv_fetch()
+                fetched = time.perf_counter() - start
+                if data is None:
+                    done(node, fingerprint, start, fetched)
+                    continue
+                future = pool.submit(timed_call, type(node).sv_compute, data)
+                jobs.append((node, fingerprint, fetched, future))
+            except Exception as err:
+                errors.append((node.name, err))
+        for node in wave_nodes:
+            if node.sv_compute is not None:
+                continue
+            try:
+                skipped, fingerprint = skip(node)
+                if skipped:
+                    continue
+                start = time.perf_counter()
+                node.process()
+                done(node, fingerprint, start, time.perf_counter() - start)
+            except Exception as err:
+                errors.append((node.name, err))
+        for node, fingerprint, fetched, future in jobs:
+            try:
+                result, start, delta, thread = future.result()
+                store_start = time.perf_counter()
+                node.sv_store(result)
+                stored = time.perf_counter() - store_start
+                done(node, fingerprint, start, fetched + delta + stored, thread)
+            except Exception as err:
+                errors.append((node.name, err))
+        if errors:
+            for name, err in errors:
+                update_error_nodes(ng, name, err)
+                exception("Node %s had exception: %s", name, err)
+            return None
+
+    return [timings.get(name, 0) for name in node_list]
+
+
+def do_update(node_list, nodes, forced_nodes=None):
+    global _update_depth
+    _update_depth += 1
+    try:
+        if data_structure.HEAT_MAP:
+            do_update_heat_map(node_list, nodes, forced_nodes)
+        elif data_structure.PARALLEL_UPDATE:
+            do_update_parallel(node_list, nodes, forced_nodes)
+        else:
+            do_update_general(node_list, nodes, forced_nodes=forced_nodes)
+    finally:
+        _update_depth -= 1
+    # nodes of the update may read each other's data until it's done
+    if not _update_depth:
+        enforce_cache_budget()
 
 def build_update_list(ng=None):
     """
@@ -359,26 +687,24 @@ def build_update_list(ng=None):
     """
     global update_cache
     global partial_update_cache
-    global graphs
-    graphs = []
     if not ng:
         for ng in sverchok_trees():
             build_update_list(ng)
     else:
+        tag_tree_changed(ng)
         node_sets = separate_nodes(ng)
-        deps = make_dep_dict(ng)
+        deps = get_dep_dict(ng)
         out = [make_update_list(ng, s, deps) for s in node_sets]
         update_cache[ng.name] = out
         partial_update_cache[ng.name] = {}
         reset_socket_cache(ng)
+        reset_node_fingerprints(ng)
 
 
 def process_to_node(node):
     """
     Process nodes upstream until node
     """
-    global graphs
-    graphs = []
 
     ng = node.id_data
     reset_error_nodes(ng)
@@ -387,15 +713,25 @@ def process_to_node(node):
         reload_sverchok()
         return
 
-    update_list = make_tree_from_nodes([node.name], ng, down=False)
+    update_list = get_tree_from_nodes([node.name], ng, down=False)
     do_update(update_list, ng.nodes)
 
 
+def update_upstream(node):
+    """
+    Process node and the nodes it depends on, used by socket data
+    cache to compute evicted data again. Errors of the tree are kept.
+    """
+    ng = node.id_data
+    update_list = get_tree_from_nodes([node.name], ng, down=False)
+    do_update_general(update_list, ng.nodes)
+
+
 def process_from_nodes(nodes):
     node_names = [node.name for node in nodes]
     ng = nodes[0].id_data
-    update_list = make_tree_from_nodes(node_names, ng)
-    do_update(update_list, ng.nodes)
+    update_list = get_tree_from_nodes(node_names, ng)
+    do_update(update_list, ng.nodes, forced_nodes=set(node_names))
 
 
 def process_from_node(node):
@@ -404,8 +740,6 @@ def process_from_node(node):
     """
     global update_cache
     global partial_update_cache
-    global graphs
-    graphs = []
     ng = node.id_data
     reset_error_nodes(ng)
 
@@ -418,15 +752,30 @@ def process_from_node(node):
         if p_u_c:
             update_list = p_u_c.get(node.name)
         if not update_list:
-            update_list = make_tree_from_nodes([node.name], ng)
+            update_list = get_tree_from_nodes([node.name], ng)
             partial_update_cache[ng.name][node.name] = update_list
         nodes = ng.nodes
         if not ng.sv_process:
             return
-        do_update(update_list, nodes)
+        do_update(update_list, nodes, forced_nodes={node.name})
     else:
         process_tree(ng)
 
+def process_animation(ng):
+    """
+    Process the tree on frame change, only nodes which depend on time
+    are processed, other nodes keep data from the last update.
+    """
+    if data_structure.RELOAD_EVENT or not update_cache.get(ng.name):
+        process_tree(ng)
+        return
+    if not ng.sv_process:
+        return
+    update_list = make_animation_update_list(ng)
+    if update_list:
+        reset_error_nodes(ng)
+        do_update(update_list, ng.nodes, forced_nodes=animated_node_names(ng))
+
 def sverchok_trees():
     for ng in bpy.data.node_groups:
         if ng.bl_idname == "SverchCustomTreeType":
@@ -435,8 +784,6 @@ def sverchok_trees():
 def process_tree(ng=None):
     global update_cache
     global partial_update_cache
-    global graphs
-    graphs = []
 
     if data_structure.RELOAD_EVENT:
         reload_sverchok()
@@ -450,8 +797,12 @@ def process_tree(ng=None):
         if not update_list:
             build_update_list(ng)
             update_list = update_cache.get(ng.name)
-        for l in update_list:
-            do_update(l, ng.nodes)
+        if data_structure.PARALLEL_UPDATE:
+            # separate parts of the tree are independent, process them together
+            do_update(list(chain.from_iterable(update_list)), ng.nodes)
+        else:
+            for l in update_list:
+                do_update(l, ng.nodes)
     else:
         pass
 
@@ -477,3 +828,6 @@ def register():
     addon = bpy.context.user_preferences.addons.get(addon_name)
     if addon:
         update_error_colors(addon.preferences, [])
+
+def unregister():
+    shutdown_thread_pool()
@@ -26,9 +26,17 @@ from mathutils import Vector, Matrix
 import numpy as np
 
 from sverchok.utils.logging import info
+from sverchok.utils.sv_matching import (
+    match_arrays, match_long_repeat_views, match_long_cycle_views,
+    match_short_views, match_cross_views)
 
 DEBUG_MODE = False
 HEAT_MAP = False
+INCREMENTAL_UPDATE = False
+PARALLEL_UPDATE = False
+# socket data cache budgets in bytes, 0 means no limit
+CACHE_TREE_BUDGET = 0
+CACHE_TOTAL_BUDGET = 0
 RELOAD_EVENT = False
 
 # this is set correctly later.
@@ -88,36 +96,42 @@ def repeat_last(lst):
             yield lst[-1]
 
 
+def _all_arrays(lsts):
+    return bool(lsts) and all(isinstance(l, np.ndarray) and l.ndim > 0 for l in lsts)
+
+
 def match_long_repeat(lsts):
     """return matched list, using the last value to fill lists as needed
     longest list matching [[1,2,3,4,5], [10,11]] -> [[1,2,3,4,5], [10,11,11,11,11]]
+    if all lists are numpy arrays, numpy arrays are returned,
+    see utils.sv_matching for them and for lazy views
     """
-    max_l = 0
-    tmp = []
-    for l in lsts:
-        max_l = max(max_l, len(l))
-    for l in lsts:
-        if len(l) == max_l:
-            tmp.append(l)
-        else:
-            tmp.append(repeat_last(l))
-    return list(map(list, zip(*zip(*tmp))))
+    if _all_arrays(lsts):
+        return match_arrays(lsts, 'REPEAT')
+    lengths = [len(l) for l in lsts]
+    if not lengths or not min(lengths):
+        return []
+    max_l = max(lengths)
+    return [list(l) if len(l) == max_l else list(l) + [l[-1]] * (max_l - len(l)) for l in lsts]
 
 
 def match_long_cycle(lsts):
     """return matched list, cycling the shorter lists
     longest list matching, cycle [[1,2,3,4,5] ,[10,11]] -> [[1,2,3,4,5] ,[10,11,10,11,10]]
+    if all lists are numpy arrays, numpy arrays are returned, see utils.sv_matching
     """
-    max_l = 0
-    tmp = []
-    for l in lsts:
-        max_l = max(max_l, len(l))
+    if _all_arrays(lsts):
+        return match_arrays(lsts, 'CYCLE')
+    lengths = [len(l) for l in lsts]
+    if not lengths or not min(lengths):
+        return []
+    max_l = max(lengths)
+    result = []
     for l in lsts:
-        if len(l) == max_l:
-            tmp.append(l)
-        else:
-            tmp.append(itertools.cycle(l))
-    return list(map(list, zip(*zip(*tmp))))
+        repeats, rest = divmod(max_l, len(l))
+        l = list(l)
+        result.append(l * repeats + l[:rest])
+    return result
 
 
 # when you intent to use lenght of first list to control WHILE loop duration
@@ -132,8 +146,11 @@ def second_as_first_cycle(F, S):
 def match_cross(lsts):
     """ return cross matched lists
     [[1,2], [5,6,7]] -> [[1,1,1,2,2,2], [5,6,7,5,6,7]]
+    if all lists are numpy arrays, numpy arrays are returned, see utils.sv_matching
     """
-    return list(map(list, zip(*itertools.product(*lsts))))
+    if _all_arrays(lsts):
+        return match_arrays(lsts, 'CROSS')
+    return [list(view) for view in match_cross_views(lsts)]
 
 
 def match_cross2(lsts):
@@ -147,8 +164,18 @@ def match_cross2(lsts):
 def match_short(lsts):
     """return lists of equal length using the Shortest list to decides length
     Shortest list decides output length [[1,2,3,4,5], [10,11]] -> [[1,2], [10, 11]]
+    if all lists are numpy arrays, numpy arrays are returned, see utils.sv_matching
     """
-    return list(map(list, zip(*zip(*lsts))))
+    if _all_arrays(lsts):
+        return match_arrays(lsts, 'SHORT')
+    if not all(hasattr(l, '__len__') for l in lsts):
+        # iterators are matched as they go
+        return list(map(list, zip(*zip(*lsts))))
+    lengths = [len(l) for l in lsts]
+    if not lengths or not min(lengths):
+        return []
+    min_l = min(lengths)
+    return [list(itertools.islice(l, min_l)) for l in lsts]
 
 
 def fullList(l, count):
@@ -191,6 +218,128 @@ def sv_zip(*iterables):
 # define data floor
 # NOTE, these function cannot possibly work in all scenarios, use with care
 
+class DataShape(object):
+    """
+    Shape of nested data, inspected along the first element of every
+    level the same way the level helpers below do it:
+
+    depth - number of list/tuple levels
+    lengths - length of the first list/tuple on every level
+    containers - type names of these lists/tuples
+    leaf_type - type of the first element that is not a list/tuple,
+        None if the data ends with an empty list
+
+    is_rectangular is computed on first use, by one walk over all data:
+    True if every list on a level has the same length and all leaves are
+    on the same level, so the data converts to a regular numpy array.
+    """
+
+    __slots__ = ('data', 'depth', 'lengths', 'containers', 'leaf_type', '_is_rectangular')
+
+    def __init__(self, data):
+        lengths = []
+        containers = []
+        leaf_type = None
+        item = data
+        while isinstance(item, (list, tuple)):
+            lengths.append(len(item))
+            containers.append(type(item).__name__)
+            if not item:
+                break
+            # list.__getitem__ not to detach items of copy-on-write lists
+            item = list.__getitem__(item, 0) if isinstance(item, list) else item[0]
+        else:
+            leaf_type = type(item)
+
+        self.data = data
+        self.leaf_type = leaf_type
+        self.depth = len(lengths)
+        self.lengths = tuple(lengths)
+        self.containers = tuple(containers)
+        self._is_rectangular = None
+
+    @property
+    def levels(self):
+        """Nesting as levelsOflist counts it, empty lists are not counted"""
+        if self.lengths and not self.lengths[-1]:
+            return self.depth - 1
+        return self.depth
+
+    @property
+    def is_rectangular(self):
+        if self._is_rectangular is None:
+            self._is_rectangular = self._check_rectangular()
+        return self._is_rectangular
+
+    def _check_rectangular(self):
+        level = [self.data]
+        for length in self.lengths:
+            next_level = []
+            for item in level:
+                if not isinstance(item, (list, tuple)) or len(item) != length:
+                    return False
+                next_level.extend(list.__iter__(item) if isinstance(item, list) else item)
+            level = next_level
+        leaf_shapes = set()
+        for item in level:
+            if isinstance(item, (list, tuple)):
+                return False
+            leaf_shapes.add(getattr(item, 'shape', None))
+        return len(leaf_shapes) <= 1
+
+    def matches(self, data):
+        """Check that data still has this shape along the first elements"""
+        item = data
+        for length, container in zip(self.lengths, self.containers):
+            if type(item).__name__ != container or len(item) != length:
+                return False
+            if length:
+                item = list.__getitem__(item, 0) if isinstance(item, list) else item[0]
+        return self.leaf_type is None or type(item) is self.leaf_type
+
+    def describe(self):
+        """Same string as describe_data_shape gives"""
+        parts = ["{} [{}]".format(name, length) for name, length in zip(self.containers, self.lengths)]
+        if self.leaf_type is not None:
+            parts.append(self.leaf_type.__name__)
+        return "Level {}: {}".format(self.depth, " of ".join(parts))
+
+
+# shapes of socket data that is shared by nodes, by id of the data,
+# kept by the socket cache for as long as it keeps the data
+data_shapes = {}
+
+def cache_data_shape(data):
+    """Shape of data, remembered so level helpers don't inspect data again"""
+    shape = _cached_shape(data)
+    if shape is None:
+        shape = data_shapes[id(data)] = DataShape(data)
+    return shape
+
+def forget_data_shape(shape):
+    if data_shapes.get(id(shape.data)) is shape:
+        del data_shapes[id(shape.data)]
+
+def get_data_shape(data):
+    """Shape of data, cached one if socket cache has it"""
+    return _cached_shape(data) or DataShape(data)
+
+def _cached_shape(data):
+    """
+    Remembered shape if data still has it, nodes may change shared data
+    in place. Only the first elements are checked, so is_rectangular
+    is computed again.
+    """
+    shape = data_shapes.get(id(data))
+    if shape is None or shape.data is not data:
+        return None
+    if not shape.matches(data):
+        del data_shapes[id(data)]
+        return None
+    shape._is_rectangular = None
+    return shape
+
+
 def dataCorrect(data, nominal_dept=2):
     """data from nasting to standart: TO container( objects( lists( floats, ), ), )
     """
@@ -243,6 +392,9 @@ def dataStandart(data, dept, nominal_dept):
 
 def levelsOflist(lst):
     """calc list nesting only in countainment level integer"""
+    shape = _cached_shape(lst)
+    if shape is not None:
+        return shape.levels
     level = 1
     for n in lst:
         if n and isinstance(n, (list, tuple)):
@@ -270,11 +422,15 @@ def get_data_nesting_level(data, data_types=(float, int, np.float64)):
     get_data_nesting_level([[(1,2,3)]]) == 3
     """
 
+    shape = _cached_shape(data)
+    if shape is not None and (shape.leaf_type is None or shape.leaf_type in data_types):
+        return shape.depth
+
     def helper(data, recursion_depth):
         """ Needed only for better error reporting. """
         if type(data) in data_types:
             return 0
-        elif type(data) in (list, tuple):
+        elif isinstance(data, (list, tuple)):
             if len(data) == 0:
                 return 1
             else:
@@ -333,22 +489,7 @@ def describe_data_shape(data):
     describe_data_shape([1]) == 'Level 1: list [1] of int'
     describe_data_shape([[(1,2,3)]]) == 'Level 3: list [1] of list [1] of tuple [3] of int'
     """
-    def helper(data):
-        if not isinstance(data, (list, tuple)):
-            return 0, type(data).__name__
-        else:
-            result = type(data).__name__
-            result += " [{}]".format(len(data))
-            if len(data) > 0:
-                child = data[0]
-                child_nesting, child_result = helper(child)
-                result += " of " + child_result
-            else:
-                child_nesting = 0
-            return (child_nesting + 1), result
-
-    nesting, result = helper(data)
-    return "Level {}: {}".format(nesting, result)
+    return get_data_shape(data).describe()
 
 #####################################################
 ################### matrix magic ####################
@@ -513,6 +654,10 @@ def setup_init():
     """
     global DEBUG_MODE
     global HEAT_MAP
+    global INCREMENTAL_UPDATE
+    global PARALLEL_UPDATE
+    global CACHE_TREE_BUDGET
+    global CACHE_TOTAL_BUDGET
     global SVERCHOK_NAME
     import sverchok
     SVERCHOK_NAME = sverchok.__name__
@@ -520,6 +665,10 @@ def setup_init():
     if addon:
         DEBUG_MODE = addon.preferences.show_debug
         HEAT_MAP = addon.preferences.heat_map
+        INCREMENTAL_UPDATE = addon.preferences.incremental_update
+        PARALLEL_UPDATE = addon.preferences.parallel_update
+        CACHE_TREE_BUDGET = addon.preferences.cache_tree_budget * 2**20
+        CACHE_TOTAL_BUDGET = addon.preferences.cache_total_budget * 2**20
     else:
         print("Setup of preferences failed")
 
@@ -800,6 +949,13 @@ def checking_links(process):
     real_process.__doc__ = process.__doc__
     return real_process
 
+_view_matchers = {
+    match_long_repeat: match_long_repeat_views,
+    match_long_cycle: match_long_cycle_views,
+    match_short: match_short_views,
+    match_cross: match_cross_views,
+}
+
 def iterate_process(method, matcher, *inputs, node=None):
     '''Shortcut function for usual iteration over set of input lists.
 
@@ -815,7 +971,8 @@ def iterate_process(method, matcher, *inputs, node=None):
         return res1, res2
     '''
 
-    data = matcher(inputs)
+    # matched lists are only zipped here, views avoid padded copies
+    data = _view_matchers.get(matcher, matcher)(inputs)
     if node is None:
         results = [list(method(*d)) for d in zip(*data)]
     else:
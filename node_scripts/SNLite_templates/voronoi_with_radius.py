@@ -435,10 +435,10 @@ def get_voronoi_with_radius(verts_in,radius,resolution):
     return verts_out, polys_out
 
 #Process
-if type(radius) != list:
+if not isinstance(radius, list):
     radius = [radius]
     
-if type(resolution) != list:
+if not isinstance(resolution, list):
     resolution = [resolution]
 
 data = verts_in, radius, resolution
@@ -38,13 +38,17 @@ from sverchok.core.socket_data import (
     SvGetSocketInfo,
     SvGetSocket,
     SvSetSocket,
+    SvGetSocketShape,
     SvNoDataError,
+    data_to_arrays,
+    forget_freed_sockets,
     sentinel)
 
 from sverchok.core.update_system import (
     build_update_list,
     process_from_node,
     process_tree,
+    process_animation,
     get_update_lists, update_error_nodes)
 
 from sverchok.core.socket_conversions import (
@@ -101,8 +105,11 @@ class SvSocketCommon:
 
     @property
     def socket_id(self):
-        """Id of socket used by data_cache"""
-        return str(hash(self.id_data.name + self.node.name + self.identifier))
+        """
+        Id of socket used by data_cache, unique and stable for the lifetime
+        of the socket, renaming the tree or the node doesn't change it
+        """
+        return self.as_pointer()
 
     @property
     def index(self):
@@ -127,9 +134,29 @@ class SvSocketCommon:
         self.hide = value
 
     def sv_set(self, data):
-        """Set output data"""
+        """Set output data, nested lists or numpy arrays"""
         SvSetSocket(self, data)
 
+    def sv_get_array(self, default=sentinel, deepcopy=True, implicit_conversions=None):
+        """
+        Get input data as a list of numpy arrays, one per object.
+        If the linked node has set numpy data it is passed as is,
+        otherwise lists are converted once and shared by all such readers.
+        """
+        if self.is_linked and not self.is_output and not self.needs_data_conversion():
+            return SvGetSocket(self, deepcopy, as_array=True)
+        data = self.sv_get(default, deepcopy=False, implicit_conversions=implicit_conversions)
+        if default is not sentinel and data is default:
+            return default
+        return data_to_arrays(data)
+
+    def sv_get_shape(self):
+        """
+        DataShape of the data passed by the link, computed once per data,
+        None if there is no data. See data_structure.DataShape.
+        """
+        return SvGetSocketShape(self)
+
     def replace_socket(self, new_type, new_name=None):
         """Replace a socket with a socket of new_type and keep links,
         return the new socket, the old reference might be invalid"""
@@ -564,13 +591,14 @@ class SverchCustomTree(NodeTree, SvNodeTreeCommon):
         For animation callback/handler
         """
         if self.sv_animate:
-            process_tree(self)
+            process_animation(self)
 
     def process(self):
         """
         process the Sverchok tree upon editor changes from handler
         """
         if self.has_changed:
+            forget_freed_sockets(self)
             self.build_update_list()
             self.has_changed = False
         if self.is_frozen():
@@ -588,6 +616,27 @@ class SverchCustomTreeNode:
 
     _implicit_conversion_policy = dict()
 
+    # Node can be computed outside of the main thread by the parallel update.
+    # Such node defines sv_fetch(), which reads inputs and properties and
+    # returns plain data (or None when there is nothing to do), staticmethod
+    # sv_compute(data), which doesn't touch bpy, and sv_store(result), which
+    # writes outputs. sv_fetch and sv_store are called in the main thread.
+    sv_compute = None
+
+    # Node output depends on current frame or scene state (objects, fcurves),
+    # on frame change only such nodes and nodes downstream are processed
+    is_animation_dependent = False
+
+    # Node reads or writes Blender data (objects, texts, curves, images) or
+    # draws in the viewport, so monad workers, which start with an empty
+    # file, can't process it
+    is_scene_dependent = False
+
+    # Node gives one output object per input object, computed from that object
+    # only (shorter inputs repeat their last object), and one object if no input
+    # is linked, so a vectorized monad can pass all its items through it at once
+    is_list_transparent = False
+
     @classmethod
     def poll(cls, ntree):
         return ntree.bl_idname in ['SverchCustomTreeType', 'SverchGroupTreeType']
@@ -20,7 +20,7 @@ import bpy
 from bpy.props import EnumProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, match_long_cycle as C)
-from mathutils.bvhtree import BVHTree
+from sverchok.utils.sv_spatial_index import get_bvhtree
 
 
 class SvBVHnearNewNode(bpy.types.Node, SverchCustomTreeNode):
@@ -45,35 +45,48 @@ class SvBVHnearNewNode(bpy.types.Node, SverchCustomTreeNode):
         si('VerticesSocket', 'Verts')
         si('StringsSocket', 'Faces')
         si('VerticesSocket', 'Points').use_prop = True
+        si('StringsSocket', 'BVHtree')
         so('VerticesSocket', 'Location')
         so('VerticesSocket', 'Normal')
         so('StringsSocket', 'Index')
         so('StringsSocket', 'Distance')
 
-    @staticmethod
-    def svmesh_to_bvh_lists(vsock, fsock):
-        for vertices, polygons in zip(*C([vsock.sv_get(), fsock.sv_get()])):
-            yield BVHTree.FromPolygons(vertices, polygons, all_triangles=False, epsilon=0.0)
+    def sv_fetch(self):
+        """Trees from BVH Tree node if it's linked, else Verts and Faces to build them"""
+        bvh_sock = self.inputs.get('BVHtree')
+        if bvh_sock and bvh_sock.is_linked:
+            trees, meshes = bvh_sock.sv_get(deepcopy=False), None
+        else:
+            trees, meshes = None, C([self.inputs['Verts'].sv_get(deepcopy=False),
+                                     self.inputs['Faces'].sv_get(deepcopy=False)])
+        linked = [socket.is_linked for socket in self.outputs]
+        return trees, meshes, self.inputs['Points'].sv_get(), self.mode, linked
 
-    def process(self):
-        vert_sock, face_sock, point_sock = self.inputs
-        L, N, I, D = self.outputs
+    @staticmethod
+    def sv_compute(data):
+        trees, meshes, PT, mode, linked = data
+        if trees is None:
+            trees = (get_bvhtree(vertices, polygons) for vertices, polygons in zip(*meshes))
         RL = []
-        PT = point_sock.sv_get()
-        if self.mode == 'find_nearest':
-            for bvh, pt in zip(self.svmesh_to_bvh_lists(vert_sock, face_sock), PT):
+        if mode == 'find_nearest':
+            for bvh, pt in zip(trees, PT):
                 RL.append([bvh.find_nearest(P) for P in pt])
         else:  # find_nearest_range
-            for bvh, pt in zip(self.svmesh_to_bvh_lists(vert_sock, face_sock), PT):
+            for bvh, pt in zip(trees, PT):
                 RL.extend([bvh.find_nearest_range(P) for P in pt])
-        if L.is_linked:
-            L.sv_set([[r[0][:] for r in L] for L in RL])
-        if N.is_linked:
-            N.sv_set([[r[1][:] for r in L] for L in RL])
-        if I.is_linked:
-            I.sv_set([[r[2] for r in L] for L in RL])
-        if D.is_linked:
-            D.sv_set([[r[3] for r in L] for L in RL])
+        L, N, I, D = linked
+        return [[[r[0][:] for r in res] for res in RL] if L else None,
+                [[r[1][:] for r in res] for res in RL] if N else None,
+                [[r[2] for r in res] for res in RL] if I else None,
+                [[r[3] for r in res] for res in RL] if D else None]
+
+    def sv_store(self, result):
+        for socket, data in zip(self.outputs, result):
+            if data is not None:
+                socket.sv_set(data)
+
+    def process(self):
+        self.sv_store(self.sv_compute(self.sv_fetch()))
 
 
 def register():
@@ -18,10 +18,10 @@
 
 import bpy
 import numpy as np
-from mathutils.bvhtree import BVHTree
 from bpy.props import FloatProperty, BoolProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode)
+from sverchok.utils.sv_spatial_index import get_bvhtree
 
 
 class SvBvhOverlapNodeNew(bpy.types.Node, SverchCustomTreeNode):
@@ -52,23 +52,34 @@ class SvBvhOverlapNodeNew(bpy.types.Node, SverchCustomTreeNode):
         self.outputs.new('StringsSocket', 'OverlapPoly(A)')
         self.outputs.new('StringsSocket', 'OverlapPoly(B)')
 
-    def process(self):
-        btr = BVHTree.FromPolygons
+    def sv_fetch(self):
         V1, P1, V2, P2 = [i.sv_get()[0] for i in self.inputs]
+        return V1, P1, V2, P2, self.triangles, self.epsilon
+
+    @staticmethod
+    def sv_compute(data):
+        btr = get_bvhtree
+        V1, P1, V2, P2, Tri, epsi = data
+        T1 = btr(V1, P1, all_triangles=Tri, epsilon=epsi)
+        T2 = btr(V2, P2, all_triangles=Tri, epsilon=epsi)
+        ind1 = np.unique([i[0] for i in T1.overlap(T2)]).astype(int)
+        ind2 = np.unique([i[0] for i in T2.overlap(T1)]).astype(int)
+        return ind1, ind2, P1, P2
+
+    def sv_store(self, result):
+        ind1, ind2, P1, P2 = result
         outIndA, outIndB, Pover1, Pover2 = self.outputs
-        Tri, epsi = self.triangles, self.epsilon
-        T1 = btr(V1, P1, all_triangles = Tri, epsilon = epsi)
-        T2 = btr(V2, P2, all_triangles = Tri, epsilon = epsi)
-        ind1 = np.unique([i[0] for i in T1.overlap(T2)]).tolist()
-        ind2 = np.unique([i[0] for i in T2.overlap(T1)]).tolist()
         if outIndA.is_linked:
             outIndA.sv_set([ind1])
         if outIndB.is_linked:
             outIndB.sv_set([ind2])
         if Pover1.is_linked:
-            Pover1.sv_set([[P1[i] for i in ind1]])
+            Pover1.sv_set([[P1[i] for i in ind1.tolist()]])
         if Pover2.is_linked:
-            Pover2.sv_set([[P2[i] for i in ind2]])
+            Pover2.sv_set([[P2[i] for i in ind2.tolist()]])
+
+    def process(self):
+        self.sv_store(self.sv_compute(self.sv_fetch()))
 
 
 def register():
@@ -29,6 +29,7 @@ class EvaluateImageNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'EvaluateImageNode'
     bl_label = 'Evaluate Image'
     bl_icon = 'FILE_IMAGE'
+    is_scene_dependent = True
 
     image_name = StringProperty(name='image_name', description='image name', default='', update=updateNode)
 
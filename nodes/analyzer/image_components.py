@@ -190,6 +190,7 @@ class SvImageComponentsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvImageComponentsNode'
     bl_label = 'Image Decompose'
     bl_icon = 'GROUP_VCOL'
+    is_scene_dependent = True
 
     # node storage, reference by the hash of self.
     node_dict = {}
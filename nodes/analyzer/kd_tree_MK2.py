@@ -17,10 +17,11 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-import mathutils
+import numpy as np
 from bpy.props import FloatProperty, EnumProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, match_long_repeat as mlr)
+from sverchok.utils.sv_spatial_index import find_n_batch, find_range_batch, split_results
 
 
 class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
@@ -65,26 +66,36 @@ class SvKDTreeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         self.outputs.new('StringsSocket', 'index')
         self.outputs.new('StringsSocket', 'distance')
 
-    def process(self):
+    def sv_fetch(self):
         V1, V2, N, R = [i.sv_get() for i in self.inputs]
-        out = []
-        Co, ind, dist = self.outputs
-        find_n = self.mode == "find_n"
-        for v, v2, k in zip(V1, V2, (N if find_n else R)):
-            kd = mathutils.kdtree.KDTree(len(v))
-            for idx, co in enumerate(v):
-                kd.insert(co, idx)
-            kd.balance()
+        linked = [socket.is_linked for socket in self.outputs]
+        return V1, V2, (N if self.mode == "find_n" else R), self.mode == "find_n", linked
+
+    @staticmethod
+    def sv_compute(data):
+        V1, V2, K, find_n, (co_linked, ind_linked, dist_linked) = data
+        co_out, ind_out, dist_out = [], [], []
+        for v, v2, k in zip(V1, V2, K):
+            queries, k = mlr([v2, k])
             if find_n:
-                out.extend([kd.find_n(vert, num) for vert, num in zip(*mlr([v2, k]))])
+                indices, distances, offsets = find_n_batch(v, queries, k)
             else:
-                out.extend([kd.find_range(vert, dist) for vert, dist in zip(*mlr([v2, k]))])
-        if Co.is_linked:
-            Co.sv_set([[i[0][:] for i in i2] for i2 in out])
-        if ind.is_linked:
-            ind.sv_set([[i[1] for i in i2] for i2 in out])
-        if dist.is_linked:
-            dist.sv_set([[i[2] for i in i2] for i2 in out])
+                indices, distances, offsets = find_range_batch(v, queries, k)
+            if co_linked:
+                co_out.extend(split_results(np.asarray(v, dtype=np.float64)[indices], offsets))
+            if ind_linked:
+                ind_out.extend(split_results(indices, offsets))
+            if dist_linked:
+                dist_out.extend(split_results(distances, offsets))
+        return co_out, ind_out, dist_out
+
+    def sv_store(self, result):
+        for socket, data in zip(self.outputs, result):
+            if socket.is_linked:
+                socket.sv_set(data)
+
+    def process(self):
+        self.sv_store(self.sv_compute(self.sv_fetch()))
 
 
 def register():
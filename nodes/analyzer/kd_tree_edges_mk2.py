@@ -18,10 +18,10 @@
 
 import bpy
 from bpy.props import IntProperty, FloatProperty
-import mathutils
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
+from sverchok.utils.sv_spatial_index import get_kdtree
 
 
 # documentation/blender_python_api_2_70_release/mathutils.kdtree.html
@@ -56,7 +56,7 @@ class SvKDTreeEdgesNodeMK2(bpy.types.Node, SverchCustomTreeNode):
 
         self.outputs.new('StringsSocket', 'Edges')
 
-    def process(self):
+    def sv_fetch(self):
         inputs = self.inputs
         outputs = self.outputs
 
@@ -80,19 +80,16 @@ class SvKDTreeEdgesNodeMK2(bpy.types.Node, SverchCustomTreeNode):
                 sock_input = s_default_value
             socket_inputs.append(sock_input)
 
-        self.run_kdtree(verts, socket_inputs)
+        return verts, socket_inputs
 
-    def run_kdtree(self, verts, socket_inputs):
+    @staticmethod
+    def sv_compute(data):
+        verts, socket_inputs = data
         mindist, maxdist, maxNum, skip = socket_inputs
 
-        # make kdtree
+        # make kdtree, or reuse one built for the same vertices
         # documentation/blender_python_api_2_78_release/mathutils.kdtree.html
-        size = len(verts)
-        kd = mathutils.kdtree.KDTree(size)
-
-        for i, xyz in enumerate(verts):
-            kd.insert(xyz, i)
-        kd.balance()
+        kd = get_kdtree(verts)
 
         # set minimum values
         maxNum = max(maxNum, 1)
@@ -123,8 +120,15 @@ class SvKDTreeEdgesNodeMK2(bpy.types.Node, SverchCustomTreeNode):
                 if num_edges == maxNum:
                     break
 
+        return [list(e)]
 
-        self.outputs['Edges'].sv_set([list(e)])
+    def sv_store(self, result):
+        self.outputs['Edges'].sv_set(result)
+
+    def process(self):
+        data = self.sv_fetch()
+        if data is not None:
+            self.sv_store(self.sv_compute(data))
 
 
 def register():
@@ -20,12 +20,12 @@ import bpy
 import mathutils
 import numpy as np
 from mathutils import Vector
-from mathutils.bvhtree import BVHTree
 
 from bpy.props import BoolProperty, IntProperty
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import (updateNode, match_long_repeat, match_cross)
+from sverchok.data_structure import (updateNode, match_long_repeat)
 from sverchok.utils.logging import debug, info, error
+from sverchok.utils.sv_spatial_index import get_bvhtree
 
 class FakeObj(object):
 
@@ -38,7 +38,7 @@ class FakeObj(object):
         vertices = [vert.co[:] for vert in data.vertices] 
         polygons = [poly.vertices[:] for poly in data.polygons]
 
-        self.BVH = BVHTree.FromPolygons(vertices, polygons)
+        self.BVH = get_bvhtree(vertices, polygons)
         bpy.data.meshes.remove(data)
 
 
@@ -90,19 +90,18 @@ class SvOBJInsolationNode(bpy.types.Node, SverchCustomTreeNode):
         N,H = self.outputs
         #S,H,P,N = self.outputs
         outfin,OutLoc_,obj,rec,sm1,sc = [],[],o.sv_get(),r.sv_get()[0],self.mode,self.sort_critical
-        #lenor = len(s.sv_get()[0])
-        lendir = len(e.sv_get()[0])
+        directions = np.array(e.sv_get_array(deepcopy=False)[0], dtype=float).reshape(-1, 3)
+        lendir = len(directions)
         leno = len(obj)
-        #st, en = match_cross([s.sv_get()[0], e.sv_get()[0]]) # 1,1,1,2,2,2 + 4,5,6,4,5,6
-        st = []
-        for i in rec.data.polygons:
-            st.append(i.center[:])
-            #(np.array(st_).sum(axis=1)/len(i.vertices)).tolist())
-            #(np.array([[rec.data.vertices[k].co[:] for k in i.vertices]/len(i.vertices) for i in rec.data.polygons]).sum(axis=1)).tolist()
+        polygons = rec.data.polygons
+        st = np.empty(len(polygons) * 3)
+        polygons.foreach_get('center', st)
+        st = st.reshape(-1, 3)
         if N.is_linked:
             N.sv_set([st])
         lenor = len(st)
-        st, en = match_cross([st, e.sv_get()[0]]) # 1,1,1,2,2,2 + 4,5,6,4,5,6
+        # same as match_cross([st, directions]): 1,1,1,2,2,2 + 4,5,6,4,5,6
+        st, en = np.repeat(st, lendir, axis=0), np.tile(directions, (lenor, 1))
 
         for OB in obj:
             if OB.type == 'FONT':
@@ -123,7 +122,7 @@ class SvOBJInsolationNode(bpy.types.Node, SverchCustomTreeNode):
         OutS_ = np.array([[i[0] for i in i2] for i2 in outfin]).reshape([leno,lenor,lendir])
         def colset(rec,OutS_):
             OutS_ = 1-OutS_.sum(axis=2)/lendir
-            OutS = np.array([[[i,i,i] for i in k] for k in OutS_.tolist()]).reshape([leno,lenor,3]).tolist()
+            OutS = np.repeat(OutS_[:, :, np.newaxis], 3, axis=2).tolist()
             if not 'SvInsol' in rec.data.vertex_colors:
                 rec.data.vertex_colors.new(name='SvInsol')
             colors = rec.data.vertex_colors['SvInsol'].data
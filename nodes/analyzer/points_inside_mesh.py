@@ -21,13 +21,11 @@ import random
 import bpy
 import bmesh
 from mathutils import Vector
-from mathutils.kdtree import KDTree
-from mathutils.bvhtree import BVHTree
 from mathutils.noise import seed_set, random_unit_vector
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
-from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
+from sverchok.utils.sv_spatial_index import get_bvhtree
 
 
 def generate_random_unitvectors():
@@ -42,7 +40,7 @@ directions = generate_random_unitvectors()
 def get_points_in_mesh(points, verts, faces, eps=0.0, num_samples=3):
     mask_inside = []
 
-    bvh = BVHTree.FromPolygons(verts, faces, all_triangles=False, epsilon=eps)
+    bvh = get_bvhtree(verts, faces, epsilon=eps)
 
     for direction in directions[:num_samples]:
         samples = []
@@ -82,10 +80,10 @@ def get_points_in_mesh(points, verts, faces, eps=0.0, num_samples=3):
         return mask_totals       
 
 
-def are_inside(points, bm):
+def are_inside(points, verts, faces):
     mask_inside = []
     mask = mask_inside.append
-    bvh = BVHTree.FromBMesh(bm, epsilon=0.0001)
+    bvh = get_bvhtree(verts, faces, epsilon=0.0001)
  
     # return points on polygons
     for point in points:
@@ -137,8 +135,7 @@ class SvPointInside(bpy.types.Node, SverchCustomTreeNode):
 
         for idx, (verts, faces, pts_in) in enumerate(zip(verts_in, faces_in, points)):
             if self.selected_algo == 'algo 1':
-                bm = bmesh_from_pydata(verts, [], faces, normal_update=True)
-                mask.append(are_inside(pts_in, bm))
+                mask.append(are_inside(pts_in, verts, faces))
             elif self.selected_algo == 'algo 2':
                 mask.append(
                     get_points_in_mesh(pts_in, verts, faces, self.epsilon_bvh, self.num_samples)
@@ -19,7 +19,7 @@
 import bpy
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, match_long_cycle as C)
-from mathutils.bvhtree import BVHTree
+from sverchok.utils.sv_spatial_index import get_bvhtree
 
 # zeffii 2017 8 okt
 # airlifted from Kosvor's Raycast nodes..
@@ -41,6 +41,7 @@ class SvRaycasterLiteNode(bpy.types.Node, SverchCustomTreeNode):
         si('StringsSocket', 'Faces')
         si('VerticesSocket', 'Start').prop_name = 'start'
         si('VerticesSocket', 'Direction').prop_name = 'direction'
+        si('StringsSocket', 'BVHtree')
         
         so('VerticesSocket', 'Location')
         so('VerticesSocket', 'Normal')
@@ -51,15 +52,20 @@ class SvRaycasterLiteNode(bpy.types.Node, SverchCustomTreeNode):
     @staticmethod
     def svmesh_to_bvh_lists(v, f):
         for vertices, polygons in zip(*C([v, f])):
-            yield BVHTree.FromPolygons(vertices, polygons, all_triangles=False, epsilon=0.0)
+            yield get_bvhtree(vertices, polygons)
 
     def process(self):
         L, N, I, D, S = self.outputs
         RL = []
 
-        vert_in, face_in, start_in, direction_in = C([sock.sv_get() for sock in self.inputs])
-        
-        for bvh, st, di in zip(*[self.svmesh_to_bvh_lists(vert_in, face_in), start_in, direction_in]):
+        bvh_sock = self.inputs.get('BVHtree')
+        if bvh_sock and bvh_sock.is_linked:
+            bvh_in, start_in, direction_in = C([sock.sv_get(deepcopy=False) for sock in (bvh_sock,) + tuple(self.inputs[2:4])])
+        else:
+            vert_in, face_in, start_in, direction_in = C([sock.sv_get(deepcopy=False) for sock in self.inputs[:4]])
+            bvh_in = self.svmesh_to_bvh_lists(vert_in, face_in)
+
+        for bvh, st, di in zip(*[bvh_in, start_in, direction_in]):
             st, di = C([st, di])
             RL.append([bvh.ray_cast(i, i2) for i, i2 in zip(st, di)])
 
@@ -20,16 +20,11 @@ import bpy
 import ast
 from bpy.props import IntProperty, FloatProperty, EnumProperty
 
+import numpy as np
+
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
-
-import bpy, math, cmath, mathutils
-from math import acos, acosh, asin, asinh, atan, atan2, \
-                            atanh,ceil,copysign,cos,cosh,degrees,e, \
-                            erf,erfc,exp,expm1,fabs,factorial,floor, \
-                            fmod,frexp,fsum,gamma,hypot,isfinite,isinf, \
-                            isnan,ldexp,lgamma,log,log10,log1p,log2,modf, \
-                            pi,pow,radians,sin,sinh,sqrt,tan,tanh,trunc
+from sverchok.utils.sv_expression import get_expression, as_values
 
 sv_no_ve = [[(3, -1, 0),  (1, -1, 0),  (1, 2, 0),  (4, 2, 0),  (-1, -1, 0),
   (0, -1, 0),  (1, 0, 0),  (0, 2, 0),  (-1, 2, 0),  (-1, 0, 0),  (0, 0, 0),
@@ -353,17 +348,29 @@ class SvFormulaShapeNode(bpy.types.Node, SverchCustomTreeNode):
     
     def makeverts(self, vert, f, XX, YY, ZZ, fx,fy,fz, X_X, Y_Y, Z_Z, i_over):
         ''' main function '''
-        out=[]
-        for n in range(vert):
-            i = eval(i_over)
-            XX = eval(X_X)
-            YY = eval(Y_Y)
-            ZZ = eval(Z_Z)
-            X = eval(fx)
-            Y = eval(fy)
-            Z = eval(fz)
-            out.append((X,Y,Z))
-        return [out]
+        stages = [(name, get_expression(formula))
+                  for name, formula in (('i', i_over), ('XX', X_X), ('YY', Y_Y), ('ZZ', Z_Z))]
+        coords = [get_expression(formula) for formula in (fx, fy, fz)]
+        values = {'n': np.arange(vert), 'f': f, 'XX': XX, 'YY': YY, 'ZZ': ZZ}
+
+        # XX, YY and ZZ keep their value from one vertex to the next, formulas
+        # reading them before they are set again have to go vertex by vertex
+        carried = {name for name, expression in stages[1:] if expression.text.strip() != name}
+        sequential = any(expression.names & carried.intersection(name for name, _ in stages[k:])
+                         for k, (_, expression) in enumerate(stages))
+        if sequential:
+            out = []
+            for n in range(vert):
+                values['n'] = n
+                for name, expression in stages:
+                    values[name] = expression.evaluate_items(values, 1)[0]
+                out.append(tuple(expression.evaluate_items(values, 1)[0] for expression in coords))
+            return [out]
+
+        # otherwise every formula is evaluated for all vertices at once
+        for name, expression in stages:
+            values[name] = as_values(expression.evaluate(values, vert))
+        return [list(zip(*[expression.evaluate(values, vert) for expression in coords]))]
 
     def sv_init(self, context):
         self.inputs.new('StringsSocket', "Count").prop_name = 'number'
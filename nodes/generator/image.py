@@ -28,6 +28,7 @@ class ImageNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ImageNode'
     bl_label = 'Image'
     bl_icon = 'FILE_IMAGE'
+    is_scene_dependent = True
 
 
     name_image = StringProperty(name='image_name', description='image name', default='', update=updateNode)
@@ -30,7 +30,7 @@ from sverchok.utils.snlite_importhelper import (
     UNPARSABLE, set_autocolor, parse_sockets, are_matched,
     get_rgb_curve, set_rgb_curve
 )
-from sverchok.utils.snlite_utils import vectorize, ddir
+from sverchok.utils.snlite_utils import vectorize, ddir, compile_script
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, pydata_from_bmesh
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
@@ -99,6 +99,7 @@ class SvScriptNodeLite(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScriptNodeLite'
     bl_label = 'Scripted Node Lite'
     bl_icon = 'SCRIPTPLUGINS'
+    is_animation_dependent = True
 
     def custom_enum_func(self, context):
         ND = self.node_dict.get(hash(self))
@@ -306,7 +307,10 @@ class SvScriptNodeLite(bpy.types.Node, SverchCustomTreeNode):
             sock_desc = socket_info['inputs'][idx]
             
             if s.is_linked:
-                val = s.sv_get(default=[[]])
+                if socket_info['vectorized']:
+                    val = s.sv_get_array(default=[[]])
+                else:
+                    val = s.sv_get(default=[[]])
                 if sock_desc[3]:
                     val = {0: val, 1: val[0], 2: val[0][0]}.get(sock_desc[3])
             else:
@@ -353,7 +357,7 @@ class SvScriptNodeLite(bpy.types.Node, SverchCustomTreeNode):
     def inject_state(self, local_variables):
         setup_result = self.get_setup_code()
         if setup_result:
-            exec(setup_result, local_variables, local_variables)
+            exec(compile_script(setup_result, '<snlite setup>'), local_variables)
             setup_locals = local_variables.get('setup')()
             local_variables.update(setup_locals)
             local_variables['socket_info']['setup_state'] = setup_locals
@@ -363,15 +367,18 @@ class SvScriptNodeLite(bpy.types.Node, SverchCustomTreeNode):
     def inject_draw_buttons(self, local_variables):
         draw_ui_result = self.get_ui_code()
         if draw_ui_result:
-            exec(draw_ui_result, local_variables, local_variables)
+            exec(compile_script(draw_ui_result, '<snlite ui>'), local_variables)
             ui_func = local_variables.get('ui')
             local_variables['socket_info']['drawfunc'] = ui_func
 
 
     def process_script(self):
+        # the script runs in a namespace of its own: inputs, helpers and
+        # setup state go in, outputs are read back from it by socket name
         __local__dict__ = self.make_new_locals()
-        locals().update(__local__dict__)
-        locals().update({
+        namespace = dict(__local__dict__)
+        namespace.update({
+            'self': self,
             'vectorize': vectorize,
             'bpy': bpy,
             'ddir': ddir, 
@@ -380,25 +387,27 @@ class SvScriptNodeLite(bpy.types.Node, SverchCustomTreeNode):
         })
 
         for output in self.outputs:
-            locals().update({output.name: []})
+            namespace[output.name] = []
 
         try:
             socket_info = self.node_dict[hash(self)]['sockets']
+            namespace['socket_info'] = socket_info
 
             # inject once! 
             if not self.injected_state:
-                self.inject_state(locals())
-                self.inject_draw_buttons(locals())
+                self.inject_state(namespace)
+                self.inject_draw_buttons(namespace)
             else:
-                locals().update(socket_info['setup_state'])
+                namespace.update(socket_info['setup_state'])
 
             if self.inject_params:
-                locals().update({'parameters': [__local__dict__.get(s.name) for s in self.inputs]})
+                namespace['parameters'] = [__local__dict__.get(s.name) for s in self.inputs]
 
-            exec(self.script_str, locals(), locals())
+            # compiled once per text of the script
+            exec(compile_script(self.script_str, self.script_name or '<snlite>'), namespace)
 
             for idx, _socket in enumerate(self.outputs):
-                vals = locals()[_socket.name]
+                vals = namespace[_socket.name]
                 self.outputs[idx].sv_set(vals)
 
             set_autocolor(self, True, READY_COLOR)
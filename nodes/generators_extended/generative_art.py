@@ -291,6 +291,7 @@ class SvGenerativeArtNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGenerativeArtNode'
     bl_label = 'Generative Art'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     def updateNode_filename(self, context):
         self.process_node(context)
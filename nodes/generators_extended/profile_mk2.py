@@ -730,6 +730,7 @@ class SvProfileNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvProfileNodeMK2'
     bl_label = 'Profile Parametric'
     bl_icon = 'SYNTAX_ON'
+    is_scene_dependent = True
 
     SvLists = bpy.props.CollectionProperty(type=SvListGroup)
     SvSubLists = bpy.props.CollectionProperty(type=SvSublistGroup)
@@ -156,6 +156,7 @@ class SvScriptNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvScriptNode'
     bl_label = 'Scripted Node'
     bl_icon = 'SCRIPTPLUGINS'
+    is_animation_dependent = True
 
     def avail_templates(self, context):
         fullpath = [sv_path, "node_scripts", "templates"]
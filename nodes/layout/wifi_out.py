@@ -21,6 +21,7 @@ from bpy.props import StringProperty, EnumProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
+from sverchok.core.update_system import tag_tree_changed
 
 OLD_OP = "node.sverchok_generic_callback_old"
 
@@ -34,8 +35,12 @@ class WifiOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Wifi out'
     bl_icon = 'OUTLINER_OB_EMPTY'
 
+    def change_var_name(self, context):
+        # the node depends on other wifi in node now
+        tag_tree_changed(self.id_data)
+
     var_name = StringProperty(name='var_name',
-                              default='')
+                              default='', update=change_var_name)
 
     def avail_var_name(self, context):
         ng = self.id_data
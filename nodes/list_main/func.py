@@ -94,7 +94,7 @@ class ListFuncNode(bpy.types.Node, SverchCustomTreeNode):
         if level:
             for obj in data:
                 out.append(self.count(obj, level-1, func))
-        elif type(data) in [list, tuple] and len(data) > 0:
+        elif isinstance(data, (list, tuple)) and len(data) > 0:
             if len(data) == 1:
                 data.extend(data)
             out = func(data)
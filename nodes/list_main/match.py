@@ -71,9 +71,9 @@ class ListMatchNode(bpy.types.Node, SverchCustomTreeNode):
         if level:
             tmp = [self.match(obj, level, f1, f2) for obj in zip(*f1(lsts))]
             return list(map(list, zip(*tmp)))
-        elif type(lsts) == list:
+        elif isinstance(lsts, list):
             return f2(lsts)
-        elif type(lsts) == tuple:
+        elif isinstance(lsts, tuple):
             return tuple(f2(list(lsts)))
         return None
 
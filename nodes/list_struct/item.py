@@ -81,17 +81,17 @@ class ListItem2Node(bpy.types.Node, SverchCustomTreeNode):
                 OOther.sv_set(out)
 
     def get_items(self, data, items):
-        if type(data) in [list, tuple]:
+        if isinstance(data, (list, tuple)):
             return [data[item] for item in items if item < len(data) and item >= -len(data)]
         else:
             return None
 
     def get_other(self, data, items):
         is_tuple = False
-        if type(data) == tuple:
+        if isinstance(data, tuple):
             data = list(data)
             is_tuple = True
-        if type(data) == list:
+        if isinstance(data, list):
             m_items = items.copy()
             for idx, item in enumerate(items):
                 if item < 0:
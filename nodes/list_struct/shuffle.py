@@ -75,11 +75,11 @@ class ListShuffleNode(bpy.types.Node, SverchCustomTreeNode):
             for l in lst:
                 out.append(self.shuffle(l, level))
             return out
-        elif type(lst) in [type([])]:
+        elif isinstance(lst, list):
             l = lst.copy()
             random.shuffle(l)
             return l
-        elif type(lst) in [type(tuple())]:
+        elif isinstance(lst, tuple):
             lst = list(lst)
             random.shuffle(lst)
             return tuple(lst)
@@ -284,13 +284,13 @@ class SvNeuroElman1LNode(bpy.types.Node, SverchCustomTreeNode):
             props['trashold'] = self.treshold
 
             data_ = self.inputs['data'].sv_get()[0]
-            if type(etalon[0]) not in [list, tuple]: etalon = [etalon]
-            if type(data_[0]) not in [list, tuple]: data_ = [data_]
+            if not isinstance(etalon[0], (list, tuple)): etalon = [etalon]
+            if not isinstance(data_[0], (list, tuple)): data_ = [data_]
             for idx, data in enumerate(data_):
                 let = len(etalon)-1
                 eta = etalon[min(idx,let)]
                 data2 = [1.0]+data
-                if type(eta) not in [list, tuple]: eta = [eta]
+                if not isinstance(eta, (list, tuple)): eta = [eta]
                 result.append([self.Elman.neuro(data2, eta, self.maximum, flag, props)])
 
         else:
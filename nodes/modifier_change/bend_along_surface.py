@@ -215,18 +215,16 @@ class SvBendAlongSurfaceNode(bpy.types.Node, SverchCustomTreeNode):
                 scale_z = - scale_z
             new_vertices = []
             for uv_row, vertices_row in zip(uv_coords,vertices):
-                new_row = []
-                for ((u, v), src_vertex) in zip(uv_row, vertices_row):
-                    #print("UV: ({}, {}), SRC: {}".format(u, v, src_vertex))
-                    spline_vertex = np.array(spline.eval(u, v))
-                    spline_normal = np.array(spline.normal(u, v, h=self.normal_precision))
-                    #print("Spline: M {}, N {}".format(spline_vertex, spline_normal))
-                    # Coordinate of source vertex corresponding to orientation axis
-                    z = src_vertex[self.orient_axis]
-                    new_vertex = tuple(spline_vertex + scale_z * z * spline_normal)
-                    new_row.append(new_vertex)
-                new_vertices.append(new_row)
-            result_vertices.append(new_vertices)
+                spline_vertices = np.array([spline.eval(u, v) for u, v in uv_row])
+                spline_normals = np.array([spline.normal(u, v, h=self.normal_precision) for u, v in uv_row])
+                # Coordinate of source vertices corresponding to orientation axis
+                z = np.array([src_vertex[self.orient_axis] for src_vertex in vertices_row])
+                new_vertices.append(spline_vertices + scale_z * z[:, np.newaxis] * spline_normals)
+            if len(set(len(row) for row in new_vertices)) == 1:
+                # pass numpy data as is, rows of the same length make an array
+                result_vertices.append(np.array(new_vertices))
+            else:
+                result_vertices.append([row.tolist() for row in new_vertices])
 
         if not self.grouped:
             result_vertices = result_vertices[0]
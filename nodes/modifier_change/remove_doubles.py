@@ -18,10 +18,10 @@
 
 import bpy
 from bpy.props import FloatProperty
-import bmesh
 
 from sverchok.node_tree import SverchCustomTreeNode
-from sverchok.data_structure import updateNode, Vector_generate, repeat_last
+from sverchok.data_structure import updateNode, repeat_last
+from sverchok.utils.sv_mesh_utils import remove_doubles as weld_mesh
 
 
 #
@@ -30,43 +30,13 @@ from sverchok.data_structure import updateNode, Vector_generate, repeat_last
 
 
 def remove_doubles(vertices, faces, d, find_doubles=False):
-
-    if faces:
-        EdgeMode = (len(faces[0]) == 2)
-
-    bm = bmesh.new()
-    bm_verts = [bm.verts.new(v) for v in vertices]
-
-    if faces:
-        if EdgeMode:
-            for edge in faces:
-                bm.edges.new([bm_verts[i] for i in edge])
-        else:
-            for face in faces:
-                bm.faces.new([bm_verts[i] for i in face])
-
-    if find_doubles:
-        res = bmesh.ops.find_doubles(bm, verts=bm_verts, dist=d)
-        doubles = [vert.co[:] for vert in res['targetmap'].keys()]
+    """Weld vertices closer than d, faces can be edges too"""
+    EdgeMode = bool(faces) and len(faces[0]) == 2
+    if EdgeMode:
+        verts, edges, faces, doubles = weld_mesh(vertices, faces, [], d)
     else:
-        doubles = []
-
-    bmesh.ops.remove_doubles(bm, verts=bm_verts, dist=d)
-    edges = []
-    faces = []
-    bm.verts.index_update()
-    verts = [vert.co[:] for vert in bm.verts[:]]
-
-    bm.edges.index_update()
-    bm.faces.index_update()
-    for edge in bm.edges[:]:
-        edges.append([v.index for v in edge.verts[:]])
-    for face in bm.faces:
-        faces.append([v.index for v in face.verts[:]])
-
-    bm.clear()
-    bm.free()
-    return (verts, edges, faces, doubles)
+        verts, edges, faces, doubles = weld_mesh(vertices, [], faces or [], d)
+    return (verts, edges, faces, doubles if find_doubles else [])
 
 
 class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
@@ -101,7 +71,7 @@ class SvRemoveDoublesNode(bpy.types.Node, SverchCustomTreeNode):
         if not self.inputs['Vertices'].is_linked:
             return
 
-        verts = Vector_generate(self.inputs['Vertices'].sv_get())
+        verts = self.inputs['Vertices'].sv_get()
         polys = self.inputs['PolyEdge'].sv_get(default=[[]])
         distance = self.inputs['Distance'].sv_get(default=[self.distance])[0]
         has_double_out = self.outputs['Doubles'].is_linked
@@ -17,34 +17,14 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-import sys
 from bpy.props import EnumProperty, BoolProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, match_long_cycle as mlr
-from sverchok.utils.csg_core import CSG
-
-
-def Boolean(VA, PA, VB, PB, operation):
-    a = CSG.Obj_from_pydata(VA, PA)
-    b = CSG.Obj_from_pydata(VB, PB)
-    faces = []
-    vertices = []
-    if operation == 'DIFF':
-        polygons = a.subtract(b).toPolygons()
-    elif operation == 'JOIN':
-        polygons = a.union(b).toPolygons()
-    elif operation == 'ITX':
-        polygons = a.intersect(b).toPolygons()
-    for polygon in polygons:
-        indices = []
-        for v in polygon.vertices:
-            pos = [v.pos.x, v.pos.y, v.pos.z]
-            if pos not in vertices:
-                vertices.append(pos)
-            index = vertices.index(pos)
-            indices.append(index)
-        faces.append(indices)
-    return [vertices, faces]
+from sverchok.utils.csg_arrays import boolean
+
+
+def Boolean(VA, PA, VB, PB, operation, cull=False):
+    return boolean(VA, PA, VB, PB, operation, cull)
 
 
 class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
@@ -84,6 +64,11 @@ class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
                             default=True,
                             update=update_mode)
 
+    cull = BoolProperty(name="cull far polygons",
+                        description="don't split polygons which can't touch the other mesh, output has fewer polygons",
+                        default=False,
+                        update=updateNode)
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', 'Verts A')
         self.inputs.new('StringsSocket',  'Polys A')
@@ -99,6 +84,7 @@ class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         row.prop(self, 'selected_mode', expand=True)
         col = layout.column(align=True)
         col.prop(self, "nest_objs", toggle=True)
+        col.prop(self, "cull", toggle=True)
         if self.nest_objs:
             col.prop(self, "out_last", toggle=True)
 
@@ -108,25 +94,23 @@ class SvCSGBooleanNodeMK2(bpy.types.Node, SverchCustomTreeNode):
             return
         VertA, PolA, VertB, PolB, VertN, PolN = self.inputs
         SMode = self.selected_mode
+        cull = self.cull
         out = []
-        recursionlimit = sys.getrecursionlimit()
-        sys.setrecursionlimit(10000)
         if not self.nest_objs:
             for v1, p1, v2, p2 in zip(*mlr([VertA.sv_get(), PolA.sv_get(), VertB.sv_get(), PolB.sv_get()])):
-                out.append(Boolean(v1, p1, v2, p2, SMode))
+                out.append(Boolean(v1, p1, v2, p2, SMode, cull))
         else:
             vnest, pnest = VertN.sv_get(), PolN.sv_get()
-            First = Boolean(vnest[0], pnest[0], vnest[1], pnest[1], SMode)
+            First = Boolean(vnest[0], pnest[0], vnest[1], pnest[1], SMode, cull)
             if not self.out_last:
                 out.append(First)
                 for i in range(2, len(vnest)):
-                    out.append(Boolean(First[0], First[1], vnest[i], pnest[i], SMode))
+                    out.append(Boolean(First[0], First[1], vnest[i], pnest[i], SMode, cull))
                     First = out[-1]
             else:
                 for i in range(2, len(vnest)):
-                    First = Boolean(First[0], First[1], vnest[i], pnest[i], SMode)
+                    First = Boolean(First[0], First[1], vnest[i], pnest[i], SMode, cull)
                 out.append(First)
-        sys.setrecursionlimit(recursionlimit)
         OutV.sv_set([i[0] for i in out])
         if OutP.is_linked:
             OutP.sv_set([i[1] for i in out])
@@ -17,11 +17,12 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 from bpy.props import FloatProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
-from sverchok.utils.voronoi import Site, computeVoronoiDiagram, computeDelaunayTriangulation
+from sverchok.utils.sv_voronoi import as_points, voronoi_cells, delaunay_2d, to_polygons
 
 
 class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
@@ -40,8 +41,7 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
         # self.inputs.new('StringsSocket', "Clipping")
         self.outputs.new('VerticesSocket', "Vertices")
         self.outputs.new('StringsSocket', "Edges")
-        # Polygon output does not work right now. Should be fixed
-        # self.outputs.new('StringsSocket', "Polygons")
+        self.outputs.new('StringsSocket', "Polygons")
 
     def draw_buttons(self, context, layout):
         layout.prop(self, "clip", text="Clipping")
@@ -57,54 +57,30 @@ class Voronoi2DNode(bpy.types.Node, SverchCustomTreeNode):
         points_in = self.inputs['Vertices'].sv_get()
 
         pts_out = []
-        # polys_out = []
         edges_out = []
+        polys_out = []
         for obj in points_in:
-            pt_list = []
-            x_max = obj[0][0]
-            x_min = obj[0][0]
-            y_min = obj[0][1]
-            y_max = obj[0][1]
-            # creates points in format for voronoi library, throwing away z
-            for pt in obj:
-                x, y = pt[0], pt[1]
-                x_max = max(x, x_max)
-                x_min = min(x, x_min)
-                y_max = max(y, y_max)
-                y_min = min(x, x_min)
-                pt_list.append(Site(pt[0], pt[1]))
-
-            res = computeVoronoiDiagram(pt_list)
-
-            edges = res[2]
-            delta = self.clip
-            x_max = x_max + delta
-            y_max = y_max + delta
-
-            x_min = x_min - delta
-            y_min = y_min - delta
-
-            # clipping box to bounding box.
-            pts_tmp = []
-            for pt in res[0]:
-                x, y = pt[0], pt[1]
-                if x < x_min:
-                    x = x_min
-                if x > x_max:
-                    x = x_max
-
-                if y < y_min:
-                    y = y_min
-                if y > y_max:
-                    y = y_max
-                pts_tmp.append((x, y, 0))
-
-            pts_out.append(pts_tmp)
-            edges_out.append([(edge[1], edge[2]) for edge in edges if -1 not in edge])
+            # cells are clipped to bounding box of points, z is thrown away
+            points = as_points(obj)
+            if not len(points):
+                pts_out.append([])
+                edges_out.append([])
+                polys_out.append([])
+                continue
+            x_min, y_min = points.min(axis=0) - self.clip
+            x_max, y_max = points.max(axis=0) + self.clip
+            verts, edges, counts, loops = voronoi_cells(points, (x_min, y_min, x_max, y_max))
+
+            pts_out.append(np.column_stack((verts, np.zeros(len(verts)))).tolist())
+            edges_out.append(edges.tolist())
+            polys_out.append(to_polygons(counts, loops))
 
         # outputs
         self.outputs['Vertices'].sv_set(pts_out)
         self.outputs['Edges'].sv_set(edges_out)
+        # nodes made before polygons worked have no socket
+        if 'Polygons' in self.outputs:
+            self.outputs['Polygons'].sv_set(polys_out)
 
 
 # computeDelaunayTriangulation
@@ -131,9 +107,8 @@ class DelaunayTriangulation2DNode(bpy.types.Node, SverchCustomTreeNode):
         points_in = self.inputs['Vertices'].sv_get()
 
         for obj in points_in:
-            pt_list = [Site(pt[0], pt[1]) for pt in obj]
-            res = computeDelaunayTriangulation(pt_list)
-            tris_out.append([tri for tri in res if -1 not in tri])
+            # clockwise, as the node always gave them
+            tris_out.append(delaunay_2d(obj)[:, ::-1].tolist())
 
 
         self.outputs['Polygons'].sv_set(tris_out)
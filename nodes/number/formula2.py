@@ -16,16 +16,6 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
-import parser
-from math import (
-    acos, acosh, asin, asinh, atan, atan2,
-    atanh, ceil, copysign, cos, cosh, degrees, e,
-    erf, erfc, exp, expm1, fabs, factorial, floor,
-    fmod, frexp, fsum, gamma, hypot, isfinite, isinf,
-    isnan, ldexp, lgamma, log, log10, log1p, log2, modf,
-    pi, pow, radians, sin, sinh, sqrt, tan, tanh, trunc
-)
-
 import bpy
 from bpy.props import BoolProperty, StringProperty
 
@@ -33,6 +23,7 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (
     updateNode, multi_socket, changable_sockets,
     dataSpoil, dataCorrect, levelsOflist)
+from sverchok.utils.sv_expression import get_expression, as_values
 
 
 
@@ -69,7 +60,8 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
 
     def process(self):
         if self.inputs['X'].is_linked:
-            vecs = self.inputs['X'].sv_get()
+            # only read, so shared data is fine and its cached shape gives the level
+            vecs = self.inputs['X'].sv_get(deepcopy=False)
         else:
             vecs = [[0.0]]
 
@@ -77,18 +69,19 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
         if not self.outputs['Result'].is_linked:
             return
 
+        # finding nested levels, make equal nastedness (canonical 0,1,2,3)
+        levels = [levelsOflist(vecs)]
         list_mult = []
         if self.inputs['n[0]'].is_linked:
             i = 0
             for socket in self.inputs[1:]:
                 if socket.is_linked:
-                    list_mult.append(socket.sv_get())
+                    n = socket.sv_get()
+                    shape = socket.sv_get_shape()
+                    list_mult.append(n)
+                    levels.append(shape.levels if shape is not None else levelsOflist(n))
 
-        code_formula = parser.expr(self.formula).compile()
-        # finding nested levels, make equal nastedness (canonical 0,1,2,3)
-        levels = [levelsOflist(vecs)]
-        for n in list_mult:
-            levels.append(levelsOflist(n))
+        expression = get_expression(self.formula)
         maxlevel = max(max(levels), 3)
         diflevel = maxlevel - levels[0]
 
@@ -103,48 +96,26 @@ class Formula2Node(bpy.types.Node, SverchCustomTreeNode):
                 list_temp = dataSpoil([list_mult[i-1]], diflevel-1)
                 list_mult[i-1] = dataCorrect(list_temp, nominal_dept=2)
 
-        r = self.inte(vecs, code_formula, list_mult, 3)
+        r = self.inte(vecs, expression, list_mult, 3)
         result = dataCorrect(r, nominal_dept=min((levels[0]-1), 2))
 
         self.outputs['Result'].sv_set(result)
 
 
-    def inte(self, list_x, formula, list_n, levels, index=0):
-        ''' calc lists in formula '''
+    def inte(self, list_x, expression, list_n, levels, index=0):
+        ''' calc lists in formula, whole innermost lists at once '''
         out = []
         new_list_n = self.normalize(list_n, list_x)
         for j, x_obj in enumerate(list_x):
             out1 = []
             for k, x_lis in enumerate(x_obj):
-                out2 = []
-                for q, x in enumerate(x_lis):
-                    out2.append(self.calc_item(x, formula, new_list_n, j, k, q))
-                out1.append(out2)
+                x = as_values(x_lis)
+                n = [as_values(nitem[j][k][:len(x_lis)]) for nitem in new_list_n]
+                out1.append(expression.evaluate({'x': x, 'X': x, 'n': n, 'N': n}, len(x_lis)))
             out.append(out1)
         return out
 
 
-    def calc_item(self, x, formula, nlist, j, k, q):
-        X = x
-        n = []
-        a = []
-        sv_Vars = {} #is dead for long time, but not sure about this
-        list_vars = [w for w in sv_Vars.keys()]
-        for v in list_vars:
-            if v[:6] == 'sv_typ':
-                continue
-            abra = sv_Vars[v]
-            exec(str(v)+'=[]')
-            for i, aa_abra in enumerate(abra):
-                eva = str(v)+'.append('+str(aa_abra)+')'
-                eval(eva)
-
-        for nitem in nlist:
-            n.append(nitem[j][k][q])
-        N = n
-        return eval(formula)
-
-
     def normalize(self, listN, listX):
         Lennox = len(listX)
         new_list_n = []
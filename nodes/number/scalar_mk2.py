@@ -20,6 +20,8 @@ from math import *
 from fractions import gcd
 from itertools import zip_longest
 
+import numpy as np
+
 import bpy
 from bpy.props import EnumProperty, FloatProperty, IntProperty
 
@@ -27,6 +29,7 @@ from sverchok.ui.sv_icons import custom_icon
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode
 from sverchok.utils.sv_itertools import (recurse_fx, recurse_fxy)
+from sverchok.utils.sv_matching import array_fx, array_fxy, INT_LIMIT
 # pylint: disable=C0326
 
 # Rules for modification:
@@ -88,6 +91,64 @@ func_dict = {
     "THETA TAU":   (140, lambda x: pi * 2 * ((x-1) / x),   ('s s'), "tau * (x-1 / x)")
 }
 
+
+def to_int(x):
+    # math.ceil, floor and round give ints, also for floats,
+    # inf, nan and ints too big for numpy are left to them
+    if not (np.abs(x) < INT_LIMIT).all():
+        raise OverflowError("cannot convert to int64")
+    return x.astype(np.int64)
+
+# numpy versions of functions for rectangular data, same results as func_dict
+array_func_dict = {
+    "SINE":        np.sin,
+    "COSINE":      np.cos,
+    "TANGENT":     np.tan,
+    "ARCSINE":     np.arcsin,
+    "ARCCOSINE":   np.arccos,
+    "ARCTANGENT":  np.arctan,
+    "ACOSH":       np.arccosh,
+    "ASINH":       np.arcsinh,
+    "ATANH":       np.arctanh,
+    "COSH":        np.cosh,
+    "SINH":        np.sinh,
+    "TANH":        np.tanh,
+    "DEGREES":     np.degrees,
+    "RADIANS":     np.radians,
+    "ADD":         np.add,
+    "SUB":         np.subtract,
+    "MUL":         np.multiply,
+    "DIV":         np.true_divide,
+    "INTDIV":      np.floor_divide,
+    "SQRT":        lambda x: np.sqrt(np.fabs(x)),
+    "EXP":         np.exp,
+    "POW":         np.power,
+    "POW2":        lambda x: x*x,
+    "LN":          np.log,
+    "LOG10":       np.log10,
+    "LOG1P":       np.log1p,
+    "ABS":         np.fabs,
+    "NEG":         np.negative,
+    "CEIL":        lambda x: to_int(np.ceil(x)),
+    "FLOOR":       lambda x: to_int(np.floor(x)),
+    "MIN":         np.minimum,
+    "MAX":         np.maximum,
+    "ROUND":       lambda x: to_int(np.round(x)),
+    "FMOD":        lambda x, y: np.fmod(x, y, dtype=np.float64),
+    "MODULO":      np.mod,
+    "MEAN":        lambda x, y: 0.5*(x + y),
+    "PI":          lambda x: pi * x,
+    "TAU":         lambda x: pi * 2 * x,
+    "E":           lambda x: e * x,
+    "PHI":         lambda x: 1.61803398875 * x,
+    "+1":          lambda x: x + 1,
+    "-1":          lambda x: x - 1,
+    "*2":          lambda x: x * 2,
+    "/2":          lambda x: x / 2,
+    "RECIP":       lambda x: 1 / x,
+    "THETA TAU":   lambda x: pi * 2 * ((x-1) / x),
+}
+
 def func_from_mode(mode):
     return func_dict[mode][1]
 
@@ -114,6 +175,8 @@ class SvScalarMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Math MK2'
     sv_icon = 'SV_FUNCTION'
 
+    is_list_transparent = True
+
     def mode_change(self, context):
         self.update_sockets()
         updateNode(self, context)
@@ -207,14 +270,23 @@ class SvScalarMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         if self.outputs[0].is_linked:
             result = []
             current_func = func_from_mode(self.current_op)
+            # numpy for rectangular numbers, recursion if that gives None
+            array_func = array_func_dict.get(self.current_op)
             if signature == (1, 1):
-                result = recurse_fx(x, current_func)
+                result = array_fx(x, array_func) if array_func else None
+                if result is None:
+                    result = recurse_fx(x, current_func)
             elif signature == (2, 1):
-                result = recurse_fxy(x, y, current_func)
+                result = array_fxy(x, y, array_func) if array_func else None
+                if result is None:
+                    result = recurse_fxy(x, y, current_func)
             elif signature == (1, 2):
                 # special case at the moment
-                result = recurse_fx(x, sin)
-                result2 = recurse_fx(x, cos)
+                result = array_fx(x, np.sin)
+                result2 = array_fx(x, np.cos)
+                if result is None or result2 is None:
+                    result = recurse_fx(x, sin)
+                    result2 = recurse_fx(x, cos)
                 self.outputs[1].sv_set(result2)
 
             self.outputs[0].sv_set(result)
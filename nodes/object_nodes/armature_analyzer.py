@@ -26,6 +26,7 @@ class SvArmaturePropsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvArmaturePropsNode'
     bl_label = 'Armature Props'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     def sv_init(self, context):
         self.inputs.new('SvObjectSocket', 'Armature Object')
@@ -29,6 +29,7 @@ class SvPointOnMeshNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvPointOnMeshNodeMK2'
     bl_label = 'Object ID Point on Mesh MK2' #new is pointless name
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     Mdist = FloatProperty(name='Max_Distance', default=10, update=updateNode)
     mode = BoolProperty(name='for in points', default=False, update=updateNode)
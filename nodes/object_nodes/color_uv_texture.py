@@ -30,6 +30,8 @@ class SvMeshUVColorNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvMeshUVColorNode'
     bl_label = 'Set UV Color'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     mode1 = BoolProperty(name='normal_update', default=True, update=updateNode)
     image = StringProperty(default='', update=updateNode)
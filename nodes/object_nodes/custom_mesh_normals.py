@@ -28,6 +28,7 @@ class SvSetCustomMeshNormals(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSetCustomMeshNormals'
     bl_label = 'Set Custom Normals'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     modes = [
         ("per Vert", "per Vert", "", 1),
@@ -27,6 +27,7 @@ class SvFilterObjsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvFilterObjsNode'
     bl_label = 'Object ID Filter'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     formula = StringProperty(name='formula', default='write name here', update=updateNode)
 
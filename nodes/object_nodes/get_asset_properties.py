@@ -66,6 +66,8 @@ class SvGetAssetProperties(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGetAssetProperties'
     bl_label = 'Object ID Selector'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def pre_updateNode(self, context):
         ''' must rebuild for each update'''
@@ -149,6 +149,8 @@ class SvGetPropNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGetPropNode'
     bl_label = 'Get property'
     bl_icon = 'FORCE_VORTEX'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     bad_prop = BoolProperty(default=False)
 
@@ -190,6 +192,7 @@ class SvSetPropNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSetPropNode'
     bl_label = 'Set property'
     bl_icon = 'FORCE_VORTEX'
+    is_scene_dependent = True
 
     ok_prop = BoolProperty(default=False)
     bad_prop = BoolProperty(default=False)
@@ -26,6 +26,7 @@ class SvLatticePropsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvLatticePropsNode'
     bl_label = 'Lattice Props'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     def sv_init(self, context):
         self.inputs.new('SvObjectSocket', 'Lattice Object')
@@ -55,6 +55,8 @@ class SvUVPointonMeshNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvUVPointonMeshNode'
     bl_label = 'Find UV Coord on Surface'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     object_ref = StringProperty(default='', update=updateNode)
 
@@ -30,6 +30,8 @@ class SvSampleUVColorNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSampleUVColorNode'
     bl_label = 'Sample UV Color'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     image = StringProperty(default='', update=updateNode)
     object_ref = StringProperty(default='', update=updateNode)
@@ -26,6 +26,8 @@ class SvSCNRayCastNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSCNRayCastNodeMK2'
     bl_label = 'Scene Raycast MK2' #new is nonsense name
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def sv_init(self, context):
         si,so = self.inputs.new,self.outputs.new
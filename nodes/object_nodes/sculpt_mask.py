@@ -28,6 +28,7 @@ class SvSculptMaskNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSculptMaskNode'
     bl_label = 'Vertex Sculpt Masking'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     def sv_init(self, context):
         self.inputs.new('SvObjectSocket', "Object")
@@ -29,6 +29,7 @@ class SvSelectMeshVerts(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSelectMeshVerts'
     bl_label = 'Select Object Vertices'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     formula = StringProperty(name='formula', default='val == 0', update=updateNode)
     deselect_all = BoolProperty(name='deselect', default=False, update=updateNode)
@@ -27,6 +27,7 @@ class SvSortObjsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSortObjsNode'
     bl_label = 'Object ID Sort'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     Modes = StringProperty(name='formula', default='location.x', update=updateNode)
 
@@ -91,6 +91,7 @@ class SvVertexColorNodeMK3(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvVertexColorNodeMK3'
     bl_label = 'Vertex color mk3'
     bl_icon = 'COLOR'
+    is_scene_dependent = True
 
     modes = [
         ("vertices", "Vert", "Vcol - color per vertex", 1),
@@ -27,6 +27,8 @@ class Sv3DviewPropsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'Sv3DviewPropsNode'
     bl_label = '3dview Props'
     bl_icon = 'SETTINGS'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def draw_buttons(self, context, layout):
         context = bpy.context
@@ -29,6 +29,8 @@ class SvFCurveInNodeMK1(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvFCurveInNodeMK1'
     bl_label = 'F-Curve In'
     bl_icon = 'FCURVE'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def wrapped_update(self, context):
 
@@ -28,6 +28,7 @@ class SvObjectToMeshNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjectToMeshNodeMK2'
     bl_label = 'Object ID Out MK2'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     modifiers = BoolProperty(name='Modifiers', default=False, update=updateNode)
 
@@ -30,6 +30,8 @@ class SvCacheNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvCacheNode'
     bl_label = 'Cache'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
 
     n_id = StringProperty()
@@ -22,6 +22,7 @@ from bpy.props import EnumProperty
 from mathutils.bvhtree import BVHTree
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, enum_item as e)
+from sverchok.utils.sv_spatial_index import get_bvhtree
 
 
 class SvBVHtreeNode(bpy.types.Node, SverchCustomTreeNode):
@@ -29,6 +30,7 @@ class SvBVHtreeNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvBVHtreeNode'
     bl_label = 'BVH Tree In'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     def mode_change(self, context):
         inputs = self.inputs
@@ -64,8 +66,9 @@ class SvBVHtreeNode(bpy.types.Node, SverchCustomTreeNode):
             for i in self.inputs[0].sv_get():
                 bvh.append(BVHTree.FromBMesh(i))
         else:
-            for i,i2 in zip(self.inputs[1].sv_get(),self.inputs[2].sv_get()):
-                bvh.append(BVHTree.FromPolygons(i, i2, all_triangles=False, epsilon=0.0))
+            # same trees as analyzer nodes build from these lists
+            for i,i2 in zip(self.inputs[1].sv_get(deepcopy=False),self.inputs[2].sv_get(deepcopy=False)):
+                bvh.append(get_bvhtree(i, i2))
         self.outputs[0].sv_set(bvh)
 
     def update_socket(self, context):
@@ -138,6 +138,8 @@ class SvCurveInputNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvCurveInputNode'
     bl_label = 'Curve Input'
     bl_icon = 'ROOTCURVE'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     object_names = bpy.props.CollectionProperty(type=bpy.types.PropertyGroup)
     mode_options = [(k, k, '', i) for i, k in enumerate(["LINEAR", "CATMUL"])]
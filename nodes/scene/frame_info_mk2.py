@@ -26,6 +26,8 @@ class SvFrameInfoNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvFrameInfoNodeMK2'
     bl_label = 'Frame info'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def sv_init(self, context):
         outputs = self.outputs
@@ -120,6 +120,7 @@ class SvGroupInputsNodeExp(Node, SverchCustomTreeNode, SvSocketAquisition):
     bl_idname = 'SvGroupInputsNodeExp'
     bl_label = 'Group Inputs Exp'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_list_transparent = True
 
     def sv_init(self, context):
         si = self.outputs.new
@@ -133,6 +134,7 @@ class SvGroupOutputsNodeExp(Node, SverchCustomTreeNode, SvSocketAquisition):
     bl_idname = 'SvGroupOutputsNodeExp'
     bl_label = 'Group Outputs Exp'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_list_transparent = True
 
     def sv_init(self, context):
         si = self.inputs.new
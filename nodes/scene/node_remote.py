@@ -53,6 +53,7 @@ class SvNodeRemoteNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvNodeRemoteNode'
     bl_label = 'Node Remote (Control)'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     activate = BoolProperty(
         default=True,
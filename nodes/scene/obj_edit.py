@@ -45,6 +45,7 @@ class SvObjEdit(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjEdit'
     bl_label = 'Obj Edit mode'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     obj_passed_in = StringProperty()
 
@@ -29,6 +29,7 @@ class SvObjRemoteNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjRemoteNodeMK2'
     bl_label = 'Object Remote (Control) mk2'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     def sv_init(self, context):
         self.inputs.new('MatrixSocket', 'matrices')
@@ -57,6 +57,8 @@ class SvObjectsNodeMK3(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvObjectsNodeMK3'
     bl_label = 'Objects in mk3'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def hide_show_versgroups(self, context):
         outs = self.outputs
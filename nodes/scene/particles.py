@@ -27,6 +27,8 @@ class SvParticlesNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvParticlesNode'
     bl_label = 'Particles'
     bl_icon = 'PARTICLES'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def sv_init(self, context):
         self.inputs.new('SvObjectSocket', "Object", "Object")
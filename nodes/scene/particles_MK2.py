@@ -28,6 +28,8 @@ class SvParticlesMK2Node(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvParticlesMK2Node'
     bl_label = 'ParticlesMK2'
     bl_icon = 'PARTICLES'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     Filt_D = BoolProperty(default=True, update=updateNode)
 
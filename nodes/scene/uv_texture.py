@@ -30,6 +30,8 @@ class SvUVtextureNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvUVtextureNode'
     bl_label = 'UVtextures'
     bl_icon = 'MATERIAL'
+    is_scene_dependent = True
+    is_animation_dependent = True
 
     def sv_init(self, context):
         self.inputs.new('SvObjectSocket', "Object", "Object")
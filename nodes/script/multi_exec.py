@@ -68,6 +68,7 @@ class SvExecNodeMod(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvExecNodeMod'
     bl_label = 'Exec Node Mod'
     bl_icon = 'CONSOLE'
+    is_scene_dependent = True
 
     text = StringProperty(default='', update=updateNode)
     dynamic_strings = bpy.props.CollectionProperty(type=SvExecNodeDynaStringItem)
@@ -62,6 +62,7 @@ class SvExportGcodeNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvExportGcodeNode'
     bl_label = 'Export Gcode'
     bl_icon = 'COPYDOWN'
+    is_scene_dependent = True
 
     last_e = FloatProperty(name="Pull", default=5.0, min=0, soft_max=10)
     path_length = FloatProperty(name="Pull", default=5.0, min=0, soft_max=10)
@@ -49,6 +49,7 @@ class SvStethoscopeNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvStethoscopeNodeMK2'
     bl_label = 'Stethoscope MK2'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     n_id = StringProperty(default='')
     font_id = IntProperty(default=0, update=updateNode)
@@ -93,6 +93,7 @@ class SvTextInNodeMK2(bpy.types.Node, SverchCustomTreeNode, CommonTextMixinIO):
     bl_idname = 'SvTextInNodeMK2'
     bl_label = 'Text in+'
     bl_icon = 'PASTEDOWN'
+    is_scene_dependent = True
 
     csv_data = {}
     list_data = {}
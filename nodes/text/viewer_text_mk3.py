@@ -168,6 +168,7 @@ class ViewerNodeTextMK3(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ViewerNodeTextMK3'
     bl_label = 'Viewer text mk3'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     autoupdate = BoolProperty(name='update', default=False)
     frame = BoolProperty(name='frame', default=True)
@@ -30,6 +30,8 @@ class SvMoveNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Move'
     bl_icon = 'MAN_TRANS'
 
+    is_list_transparent = True
+
     mult_ = FloatProperty(name='multiplier',
                           default=1.0,
                           options={'ANIMATABLE'}, update=updateNode)
@@ -32,6 +32,8 @@ class SvScaleNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Scale'
     bl_icon = 'MAN_SCALE'
 
+    is_list_transparent = True
+
     factor_ = FloatProperty(name='multiplyer', description='scaling factor',
                             default=1.0,
                             options={'ANIMATABLE'}, update=updateNode)
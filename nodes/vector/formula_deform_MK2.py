@@ -17,10 +17,11 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
-from math import *
+import numpy as np
 from bpy.props import StringProperty
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import (updateNode, second_as_first_cycle as safc)
+from sverchok.utils.sv_expression import get_expression, as_columns
 
 
 class SvFormulaDeformMK2Node(bpy.types.Node, SverchCustomTreeNode):
@@ -50,15 +51,18 @@ class SvFormulaDeformMK2Node(bpy.types.Node, SverchCustomTreeNode):
         Oo = self.outputs[0]
         if Oo.is_linked:
             V = Io.sv_get()
-            if Io2.is_linked:
-                str = "for Enum,Val2L in zip(enumerate(V), V2): \n    I,L = Enum \n    Pfin = [] \n    for Enum2, vert2 in zip(enumerate(L), safc(L, Val2L)): \n        i, (x, y, z) = Enum2 \n        (X, Y, Z) = vert2 \n        Pfin.append(({n.ModeX},{n.ModeY},{n.ModeZ})) \n    fin.append(Pfin)"
-                fin = []
-                V2 = Io2.sv_get()
-                exec(str.format(n=self))
-                Oo.sv_set(fin)
-            else:
-                exec_string = "Oo.sv_set([[({n.ModeX},{n.ModeY},{n.ModeZ}) for i, (x, y, z) in enumerate(L)] for I, L in enumerate(V)])"
-                exec(exec_string.format(n=self))
+            expressions = [get_expression(f) for f in (self.ModeX, self.ModeY, self.ModeZ)]
+            # second vertices are cycled to length of first, objects are matched short
+            V2 = Io2.sv_get() if Io2.is_linked else [None] * len(V)
+            fin = []
+            for I, (L, Val2L) in enumerate(zip(V, V2)):
+                size = len(L)
+                values = {'i': np.arange(size), 'I': I}
+                values.update(zip('xyz', as_columns(L)))
+                if Val2L is not None:
+                    values.update(zip('XYZ', as_columns(safc(L, Val2L)[:size])))
+                fin.append(list(zip(*[e.evaluate(values, size) for e in expressions])))
+            Oo.sv_set(fin)
 
     def update_socket(self, context):
         self.update()
@@ -19,12 +19,15 @@
 from math import degrees, sqrt
 from itertools import zip_longest
 
+import numpy as np
+
 import bpy
 from bpy.props import EnumProperty, FloatProperty, FloatVectorProperty
 from mathutils import Vector
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import levelsOflist, updateNode
+from sverchok.utils.sv_matching import as_numeric_array, match_nested_arrays, call_checked
 
 # pylint: disable=C0326
 
@@ -59,6 +62,46 @@ func_dict = {
 }
 
 
+def dot(u, v):
+    return (u * v).sum(axis=-1)
+
+def length(u):
+    return np.sqrt(dot(u, u))
+
+def angle(u, v):
+    # fallback of Vector.angle is 0 for zero length vectors
+    lengths = length(u) * length(v)
+    cosines = dot(u, v) / np.where(lengths > 0, lengths, 1)
+    return np.where(lengths > 0, np.arccos(np.clip(cosines, -1, 1)), 0.0)
+
+def scale_axes(u, s, axes):
+    return u * np.where(axes, s, 1)
+
+# numpy versions of functions for vectors as (..., 3) arrays and scalars as
+# (..., 1) arrays, zero length vectors raise numpy errors where Vector
+# has special results, these are left to func_dict
+array_func_dict = {
+    "DOT":            dot,
+    "DISTANCE":       lambda u, v: length(u - v),
+    "ANGLE DEG":      lambda u, v: np.degrees(angle(u, v)),
+    "ANGLE RAD":      angle,
+    "LEN":            length,
+    "CROSS":          np.cross,
+    "ADD":            np.add,
+    "SUB":            np.subtract,
+    "PROJECT":        lambda u, v: v * (dot(u, v) / dot(v, v))[..., np.newaxis],
+    "REFLECT":        lambda u, v: u - 2 * (dot(u, v) / dot(v, v))[..., np.newaxis] * v,
+    "COMPONENT-WISE": np.multiply,
+    "SCALAR":         np.multiply,
+    "1/SCALAR":       np.true_divide,
+    "NORMALIZE":      lambda u: u / length(u)[..., np.newaxis],
+    "NEG":            np.negative,
+    "SCALE XY":       lambda u, s: scale_axes(u, s, (True, True, False)),
+    "SCALE XZ":       lambda u, s: scale_axes(u, s, (True, False, True)),
+    "SCALE YZ":       lambda u, s: scale_axes(u, s, (False, True, True)),
+}
+
+
 mode_items = [(k, descr, '', ident) for k, (ident, _, _, descr) in sorted(func_dict.items(), key=lambda k: k[1][0])]
 
  
@@ -87,6 +130,24 @@ def recurse_fxy(l1, l2, f, level):
     return res
 
 
+def array_fxy(l1, l2, f, level, sockets):
+    """
+    recurse_fx and recurse_fxy for rectangular data, l2 is None for one
+    input, sockets tells if inputs are vectors or scalars, as in func_dict.
+    Returns the result array, or None to use the recursive functions.
+    """
+    arrays = []
+    for data, kind in zip((l1, l2), sockets):
+        if data is None:
+            break
+        array = as_numeric_array(data)
+        depth = level + 1 if kind == 'v' else level
+        if array is None or array.ndim != depth or (kind == 'v' and array.shape[-1] != 3):
+            return None
+        arrays.append(array)
+    if len(arrays) == 2:
+        arrays = match_nested_arrays(*arrays)
+    return call_checked(f, arrays)
 
 
 class SvVectorMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
@@ -95,6 +156,8 @@ class SvVectorMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Vector Math'
     bl_icon = 'OUTLINER_OB_EMPTY'
 
+    is_list_transparent = True
+
     def mode_change(self, context):
         self.update_sockets()
         updateNode(self, context)
@@ -151,18 +214,22 @@ class SvVectorMathNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         if not outputs[0].is_linked:
             return
 
-        func = func_dict.get(self.current_op)[1]
+        _, func, sockets, _ = func_dict.get(self.current_op)
+        array_func = array_func_dict.get(self.current_op)
         num_inputs = len(inputs)
 
         # get either input data, or socket default
         input_one = inputs[0].sv_get(deepcopy=False)
-        
+        input_two = inputs[1].sv_get(deepcopy=False) if num_inputs == 2 else None
+
         level = levelsOflist(input_one) - 1
-        if num_inputs == 1:
-            result = recurse_fx(input_one, func, level)
-        else:
-            input_two = inputs[1].sv_get(deepcopy=False)
-            result = recurse_fxy(input_one, input_two, func, level)
+        # numpy for rectangular data, recursion if that gives None
+        result = array_fxy(input_one, input_two, array_func, level, sockets) if array_func else None
+        if result is None:
+            if num_inputs == 1:
+                result = recurse_fx(input_one, func, level)
+            else:
+                result = recurse_fxy(input_one, input_two, func, level)
 
         outputs[0].sv_set(result)
 
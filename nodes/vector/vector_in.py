@@ -46,6 +46,8 @@ class GenVectorsNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Vector in'
     sv_icon = 'SV_COMBINE_IN'
 
+    is_list_transparent = True
+
     x_ = FloatProperty(name='X', description='X',
                        default=0.0, precision=3,
                        update=updateNode)
@@ -28,6 +28,8 @@ class VectorsOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_label = 'Vector out'
     sv_icon = 'SV_COMBINE_OUT'
 
+    is_list_transparent = True
+
     def sv_init(self, context):
         self.inputs.new('VerticesSocket', "Vectors", "Vectors")
         self.outputs.new('StringsSocket', "X", "X")
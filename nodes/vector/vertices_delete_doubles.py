@@ -17,9 +17,11 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import levelsOflist
+from sverchok.utils.sv_mesh_utils import weld_map
 
 
 class VertsDelDoublesNode(bpy.types.Node, SverchCustomTreeNode):
@@ -46,9 +48,15 @@ class VertsDelDoublesNode(bpy.types.Node, SverchCustomTreeNode):
             for x in vers:
                 out.append(self.remdou(x, levs))
         else:
-            for x in vers:
-                if x not in out:
-                    out.append(x)
+            points = np.asarray(vers)
+            if points.ndim == 2 and points.shape[1] == 3 and points.dtype.kind in 'iuf':
+                # first of equal vertices is kept
+                targets = weld_map(points, 0)
+                out = [vers[i] for i in np.flatnonzero(targets == np.arange(len(vers))).tolist()]
+            else:
+                for x in vers:
+                    if x not in out:
+                        out.append(x)
         return out
 
 
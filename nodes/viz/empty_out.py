@@ -22,6 +22,7 @@ from bpy.props import StringProperty, BoolProperty
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import node_id, Matrix_generate
+from sverchok.utils.sv_viewer_utils import viewer_data_unchanged, viewer_data_written, forget_viewer_data
 
 
 class SvEmptyOutNode(bpy.types.Node, SverchCustomTreeNode):
@@ -29,6 +30,7 @@ class SvEmptyOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvEmptyOutNode'
     bl_label = 'Empty out'
     bl_icon = 'OUTLINER_DATA_EMPTY'
+    is_scene_dependent = True
 
     def rename_empty(self, context):
         empty = self.find_empty()
@@ -93,13 +95,16 @@ class SvEmptyOutNode(bpy.types.Node, SverchCustomTreeNode):
 
     def process(self):
         empty = self.find_empty()
-        if not empty:
+        is_new = not empty
+        if is_new:
             empty = self.create_empty()
             print("created new empty")
 
         mat = self.inputs['Matrix'].sv_get([Matrix()])[0]
         self.label = empty.name
-        empty.matrix_world = mat
+        if not viewer_data_unchanged(self, empty.name, mat) or is_new:
+            empty.matrix_world = mat
+            viewer_data_written(self, empty.name)
         
         if 'Objects' in self.outputs:
             self.outputs['Objects'].sv_set([empty])
@@ -110,6 +115,7 @@ class SvEmptyOutNode(bpy.types.Node, SverchCustomTreeNode):
         self.label = empty.name
 
     def free(self):
+        forget_viewer_data(self)
         if self.auto_remove:
             empty = self.find_empty()
             if empty:
@@ -23,6 +23,9 @@ from bpy.props import StringProperty, BoolProperty, EnumProperty, FloatProperty,
 from sverchok.data_structure import node_id, Matrix_generate, updateNode, match_long_repeat, get_data_nesting_level, ensure_nesting_level
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.utils.sv_viewer_utils import (
+    viewer_data_unchanged,
+    viewer_data_written,
+    forget_viewer_data,
     matrix_sanitizer,
     natural_plus_one,
     get_random_init,
@@ -38,6 +41,7 @@ class SvLampOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = "SvLampOutNode"
     bl_label = "Lamp"
     bl_icon = "OUTLINER_OB_LAMP"
+    is_scene_dependent = True
 
     activate = BoolProperty(name = "Activate",
         default=True,
@@ -227,6 +231,13 @@ class SvLampOutNode(bpy.types.Node, SverchCustomTreeNode):
         objects = bpy.data.objects
         name = self.lamp_name + "_" + str(index)
 
+        settings = (self.type, self.area_type, self.show_cone, self.max_bounces,
+                    self.cast_shadow, self.multiple_imporance, self.emission_node_name)
+        unchanged = viewer_data_unchanged(self, name, object, settings)
+        if unchanged and name in objects and objects[name].get('basename') == self.lamp_name:
+            objects[name]['idx'] = index
+            return
+
         if name in objects:
             lamp_object = objects[name]
             if lamp_object.data.type != self.type:
@@ -274,6 +285,8 @@ class SvLampOutNode(bpy.types.Node, SverchCustomTreeNode):
                     raise Exception("Color data must contain 4 floats (RGBA), not {}".format(len(color)))
                 node.inputs['Color'].default_value = color
 
+        viewer_data_written(self, name)
+
     def process(self):
 
         if not self.activate:
@@ -321,6 +334,10 @@ class SvLampOutNode(bpy.types.Node, SverchCustomTreeNode):
         # delete associated lamps data
         for object_name in objs:
             lamps_data.remove(lamps_data[object_name])
+        forget_viewer_data(self, objs)
+
+    def free(self):
+        forget_viewer_data(self)
 
 def register():
     bpy.utils.register_class(SvLampOutNode)
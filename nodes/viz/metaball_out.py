@@ -55,6 +55,7 @@ class SvMetaballOutNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvMetaballOutNode'
     bl_label = 'Metaball'
     bl_icon = 'META_BALL'
+    is_scene_dependent = True
 
     def rename_metaball(self, context):
         meta = self.find_metaball()
@@ -28,6 +28,7 @@ class SvMetaballOutLiteNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvMetaballOutLiteNode'
     bl_label = 'Metaball Lite'
     bl_icon = 'META_BALL'
+    is_scene_dependent = True
 
     activate = BoolProperty(
         name='Activate',
@@ -179,6 +179,7 @@ class SvTextureViewerNode(bpy.types.Node, SverchCustomTreeNode):
     '''Texture Viewer node'''
     bl_idname = 'SvTextureViewerNode'
     bl_label = 'Texture viewer'
+    is_scene_dependent = True
     texture = {}
 
     def wrapped_update(self, context):
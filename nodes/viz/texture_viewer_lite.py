@@ -98,6 +98,7 @@ class SvTextureViewerNodeLite(bpy.types.Node, SverchCustomTreeNode):
     '''Texture Viewer node Lite'''
     bl_idname = 'SvTextureViewerNodeLite'
     bl_label = 'Texture viewer lite'
+    is_scene_dependent = True
     texture = {}
 
     n_id = StringProperty(default='')
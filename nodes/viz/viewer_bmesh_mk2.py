@@ -20,14 +20,19 @@
 
 import itertools
 
+import numpy as np
+
 import bpy
 from bpy.props import BoolProperty, StringProperty, BoolVectorProperty
-from mathutils import Matrix, Vector
+from mathutils import Matrix
 
 from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import dataCorrect, fullList, updateNode
-from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata
 from sverchok.utils.sv_viewer_utils import (
+    write_mesh_data,
+    viewer_data_unchanged,
+    viewer_data_written,
+    forget_viewer_data,
     matrix_sanitizer,
     natural_plus_one,
     get_random_init,
@@ -49,10 +54,13 @@ def make_bmesh_geometry(node, idx, context, verts, *topology):
     objects = bpy.data.objects
     edges, faces, matrix = topology
     name = node.basemesh_name + "_" + str(idx)
+    unchanged = viewer_data_unchanged(
+        node, name, verts, edges, faces, matrix, node.extended_matrix, node.calc_normals)
 
     if name in objects:
         sv_object = objects[name]
     else:
+        unchanged = False
         temp_mesh = default_mesh(name)
         sv_object = objects.new(name, temp_mesh)
         scene.objects.link(sv_object)
@@ -63,6 +71,9 @@ def make_bmesh_geometry(node, idx, context, verts, *topology):
     sv_object['basename'] = node.basemesh_name
 
     mesh = sv_object.data
+    if unchanged and len(mesh.vertices) == len(verts):
+        return
+
     current_count = len(mesh.vertices)
     propose_count = len(verts)
     difference = (propose_count - current_count)
@@ -79,12 +90,7 @@ def make_bmesh_geometry(node, idx, context, verts, *topology):
         mesh.vertices.foreach_set('co', f_v)
         mesh.update()
     else:
-
-        ''' get bmesh, write bmesh to obj, free bmesh'''
-        bm = bmesh_from_pydata(verts, edges, faces, normal_update=node.calc_normals)
-        bm.to_mesh(sv_object.data)
-        bm.free()
-
+        write_mesh_data(mesh, verts, edges, faces, calc_normals=node.calc_normals)
         sv_object.hide_select = False
 
     if matrix:
@@ -95,6 +101,7 @@ def make_bmesh_geometry(node, idx, context, verts, *topology):
             sv_object.matrix_local = matrix
     else:
         sv_object.matrix_local = Matrix.Identity(4)
+    viewer_data_written(node, name)
 
 
 def make_bmesh_geometry_merged(node, idx, context, yielder_object):
@@ -102,8 +109,9 @@ def make_bmesh_geometry_merged(node, idx, context, yielder_object):
     meshes = bpy.data.meshes
     objects = bpy.data.objects
     name = node.basemesh_name + "_" + str(idx)
+    is_new = name not in objects
 
-    if name in objects:
+    if not is_new:
         sv_object = objects[name]
     else:
         temp_mesh = default_mesh(name)
@@ -124,9 +132,13 @@ def make_bmesh_geometry_merged(node, idx, context, yielder_object):
 
         verts, topology = result
         edges, faces, matrix = topology
+        # an object without vertices adds nothing, and can't be sliced as (n, 3) array
+        if not len(verts):
+            continue
 
         if matrix:
-            verts = [matrix * Vector(v) for v in verts]
+            matrix = np.array(matrix)
+            verts = np.asarray(verts, dtype=np.float64)[:, :3] @ matrix[:3, :3].T + matrix[:3, 3]
 
         big_verts.extend(verts)
         big_edges.extend([[a + vert_count, b + vert_count] for a, b in edges])
@@ -134,6 +146,9 @@ def make_bmesh_geometry_merged(node, idx, context, yielder_object):
 
         vert_count += len(verts)
 
+    unchanged = viewer_data_unchanged(node, name, big_verts, big_edges, big_faces, node.calc_normals)
+    if unchanged and not is_new and len(sv_object.data.vertices) == len(big_verts):
+        return
 
     if node.fixed_verts and len(sv_object.data.vertices) == len(big_verts):
         mesh = sv_object.data
@@ -141,13 +156,11 @@ def make_bmesh_geometry_merged(node, idx, context, yielder_object):
         mesh.vertices.foreach_set('co', f_v)
         mesh.update()
     else:
-        ''' get bmesh, write bmesh to obj, free bmesh'''
-        bm = bmesh_from_pydata(big_verts, big_edges, big_faces, normal_update=node.calc_normals)
-        bm.to_mesh(sv_object.data)
-        bm.free()
+        write_mesh_data(sv_object.data, big_verts, big_edges, big_faces, calc_normals=node.calc_normals)
 
     sv_object.hide_select = False
     sv_object.matrix_local = Matrix.Identity(4)
+    viewer_data_written(node, name)
 
 
 class SvBmeshViewOp2(bpy.types.Operator):
@@ -210,6 +223,7 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvBmeshViewerNodeMK2'
     bl_label = 'Viewer BMesh'
     bl_icon = 'OUTLINER_OB_MESH'
+    is_scene_dependent = True
 
     # hints found at ba.org/forum/showthread.php?290106
     # - this will not allow objects on multiple layers, yet.
@@ -455,6 +469,7 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
         # delete associated meshes
         for object_name in objs:
             meshes.remove(meshes[object_name])
+        forget_viewer_data(self, objs)
 
     def to_group(self, objs):
         groups = bpy.data.groups
@@ -480,6 +495,9 @@ class SvBmeshViewerNodeMK2(bpy.types.Node, SverchCustomTreeNode):
             mesh.polygons.foreach_set('use_smooth', smooth_states)
             mesh.update()
 
+    def free(self):
+        forget_viewer_data(self)
+
     def update_socket(self, context):
         self.update()
 
@@ -35,6 +35,9 @@ from sverchok.data_structure import (
     updateNode)
 
 from sverchok.utils.sv_viewer_utils import (
+    viewer_data_unchanged,
+    viewer_data_written,
+    forget_viewer_data,
     matrix_sanitizer,
     natural_plus_one,
     get_random_init,
@@ -174,6 +177,10 @@ def live_curve(curve_name, verts, edges, matrix, node):
 def make_curve_geometry(node, context, name, verts, *topology):
     edges, matrix = topology
 
+    unchanged = viewer_data_unchanged(node, name, verts, edges, matrix, node.depth, node.resolution)
+    if unchanged and name in bpy.data.objects and name in bpy.data.curves:
+        return
+
     sv_object = live_curve(name, verts, edges, matrix, node)
     sv_object.hide_select = False
 
@@ -182,6 +189,7 @@ def make_curve_geometry(node, context, name, verts, *topology):
         sv_object.matrix_local = matrix
     else:
         sv_object.matrix_local = Matrix.Identity(4)
+    viewer_data_written(node, name)
 
 
 # could be imported from bmeshviewr directly, it's almost identical
@@ -242,6 +250,7 @@ class SvCurveViewerNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvCurveViewerNode'
     bl_label = 'Curve Viewer'
     bl_icon = 'MOD_CURVE'
+    is_scene_dependent = True
 
     activate = BoolProperty(
         name='Show',
@@ -429,10 +438,20 @@ class SvCurveViewerNode(bpy.types.Node, SverchCustomTreeNode):
 
         matrices = mrest[1]
         curve_name = self.basemesh_name + "_0"
+        unchanged = viewer_data_unchanged(
+            self, curve_name, TYPE, verts, edges, matrices, self.depth, self.resolution)
+        if TYPE == 'Merge':
+            names = [curve_name]
+        else:
+            names = [curve_name[:-1] + str(idx) for idx in range(len(matrices))]
+        objects = bpy.data.objects
+        if unchanged and curve_name in bpy.data.curves and all(name in objects for name in names):
+            return
         if TYPE == 'Merge':
             make_merged_live_curve(self, curve_name, verts, edges, matrices)
         elif TYPE == 'Duplicate':
             make_duplicates_live_curve(self, curve_name, verts, edges, matrices)
+        viewer_data_written(self, curve_name)
 
     def get_children(self):
         objects = bpy.data.objects
@@ -459,6 +478,7 @@ class SvCurveViewerNode(bpy.types.Node, SverchCustomTreeNode):
             obj.hide_select = False
             scene.objects.unlink(obj)
             objects.remove(obj)
+        forget_viewer_data(self, objs)
 
         # delete associated meshes
         if (self.selected_mode == 'Duplicate'):
@@ -474,6 +494,9 @@ class SvCurveViewerNode(bpy.types.Node, SverchCustomTreeNode):
             for object_name in objs:
                 curves.remove(curves[object_name])
 
+    def free(self):
+        forget_viewer_data(self)
+
     def to_group(self, objs):
         groups = bpy.data.groups
         named = self.basemesh_name
@@ -255,6 +255,7 @@ class SvCurveViewerNode2D(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvCurveViewerNodeAlt'
     bl_label = 'Curve Viewer 2D'
     bl_icon = 'MOD_CURVE'
+    is_scene_dependent = True
 
     activate = BoolProperty(
         name='Show',
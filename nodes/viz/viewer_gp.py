@@ -118,6 +118,7 @@ class SvGreasePencilStrokes(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvGreasePencilStrokes'
     bl_label = 'Grease Pencil'
     bl_icon = 'GREASEPENCIL'
+    is_scene_dependent = True
 
     # SCREEN / 3DSPACE / 2DSPACE / 2DIMAGE
     mode_options = [(k, k, '', i) for i, k in enumerate(['3DSPACE', '2DSPACE'])]
@@ -169,6 +169,7 @@ class IndexViewerNode(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'IndexViewerNode'
     bl_label = 'Viewer Index'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     # node id
     n_id = StringProperty(default='', options={'SKIP_SAVE'})
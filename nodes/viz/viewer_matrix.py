@@ -128,6 +128,7 @@ class SvMatrixViewer(bpy.types.Node, SverchCustomTreeNode):
     ''' mv - View Matrices '''
     bl_idname = 'SvMatrixViewer'
     bl_label = 'Matrix View'
+    is_scene_dependent = True
 
     color_start = FloatVectorProperty(subtype='COLOR', default=(1, 1, 1), min=0, max=1, size=3, update=updateNode)
     color_end = FloatVectorProperty(subtype='COLOR', default=(1, 0.02, 0.02), min=0, max=1, size=3, update=updateNode)
@@ -169,6 +169,7 @@ class ViewerNode2(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'ViewerNode2'
     bl_label = 'Viewer Draw'
     bl_icon = 'RETOPO'
+    is_scene_dependent = True
 
     n_id = StringProperty(default='')
 
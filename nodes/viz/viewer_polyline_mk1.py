@@ -181,6 +181,7 @@ class SvPolylineViewerNodeMK1(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvPolylineViewerNodeMK1'
     bl_label = 'Polyline Viewer MK1'
     bl_icon = 'MOD_CURVE'
+    is_scene_dependent = True
 
     activate = BoolProperty(
         name='Show',
@@ -28,7 +28,8 @@ from sverchok.node_tree import SverchCustomTreeNode
 from sverchok.data_structure import updateNode, match_long_repeat, fullList
 from sverchok.utils.sv_bmesh_utils import bmesh_from_pydata, pydata_from_bmesh
 from sverchok.utils.sv_viewer_utils import (
-    greek_alphabet, matrix_sanitizer, remove_non_updated_objects
+    greek_alphabet, matrix_sanitizer, remove_non_updated_objects,
+    viewer_data_unchanged, viewer_data_written, forget_viewer_data
 )
 
 
@@ -212,6 +213,7 @@ class SvSkinViewerNodeMK1b(bpy.types.Node, SverchCustomTreeNode):
     bl_idname = 'SvSkinViewerNodeMK1b'
     bl_label = 'Skin Mesher mk1b'
     bl_icon = 'OUTLINER_OB_EMPTY'
+    is_scene_dependent = True
 
     basemesh_name = StringProperty(
         default='Alpha',
@@ -329,6 +331,16 @@ class SvSkinViewerNodeMK1b(bpy.types.Node, SverchCustomTreeNode):
 
     def unit_generator(self, idx, geometry):
         verts, _, _, radiix, radiiy = geometry
+
+        name = self.basemesh_name + '.' + str("%04d" % idx)
+        settings = (self.distance_doubles, self.levels, self.render_levels,
+                    self.use_root, self.use_slow_root)
+        unchanged = viewer_data_unchanged(self, name, geometry, settings)
+        obj = bpy.data.objects.get(name)
+        if unchanged and obj and 'sv_skin' in obj.modifiers:
+            if bpy.data.materials.get(self.material):
+                self.set_corresponding_materials([obj])
+            return
         ntimes = len(verts)
         radiix, _ = match_long_repeat([radiix, verts])
         radiiy, _ = match_long_repeat([radiiy, verts])
@@ -355,6 +367,7 @@ class SvSkinViewerNodeMK1b(bpy.types.Node, SverchCustomTreeNode):
             obj.data.skin_vertices[0].data.foreach_set('use_root', all_yes)
         elif self.use_slow_root:
             process_mesh_into_features(obj.data.skin_vertices[0].data, obj.data.edge_keys)
+        viewer_data_written(self, name)
 
         # truthy if self.material is in .materials
         if bpy.data.materials.get(self.material):
@@ -365,6 +378,9 @@ class SvSkinViewerNodeMK1b(bpy.types.Node, SverchCustomTreeNode):
         for obj in objs:
             obj.active_material = bpy.data.materials[self.material]
 
+    def free(self):
+        forget_viewer_data(self)
+
     def flip_roots_or_junctions_only(self, data):
         ...
 
@@ -114,7 +114,7 @@ class FormulaNode(bpy.types.Node, SverchCustomTreeNode):
             for idx, i in enumerate(l):
                 j = self.inte(i, formula, list_n, idx)
                 t.append(j)
-            if type(l) == tuple:
+            if isinstance(l, tuple):
                 t = tuple(t)
         return t
 
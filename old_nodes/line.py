@@ -27,7 +27,7 @@ from mathutils import Vector
 
 def make_line(integer, step, center):
     vertices = [(0.0, 0.0, 0.0)]
-    integer = [int(integer) if type(integer) is not list else int(integer[0])]
+    integer = [int(integer) if not isinstance(integer, list) else int(integer[0])]
 
     # center the line: offset the starting point of the line by half its size
     if center:
@@ -42,7 +42,7 @@ def make_line(integer, step, center):
         # starting point of the line offset by half its size
         vertices = [(-0.5*size, 0.0, 0.0)]
 
-    if type(step) is not list:
+    if not isinstance(step, list):
         step = [step]
     fullList(step, integer[0])
 
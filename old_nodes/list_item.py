@@ -74,14 +74,14 @@ class ListItemNode(bpy.types.Node, SverchCustomTreeNode):
             for obj in data:
                 out.append(self.count(obj, level-1, item, itself))
 
-        elif type(data) == tuple:
+        elif isinstance(data, tuple):
             if item > len(data)-1:
                 item = len(data)-1
             if itself:
                 out = [data[item]]
             else:
                 out = [data[:item]+data[item+1:]]
-        elif type(data) == list:
+        elif isinstance(data, list):
             if item > len(data)-1:
                 item = len(data)-1
             if itself:
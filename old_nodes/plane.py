@@ -28,8 +28,8 @@ from mathutils import Vector
 def make_plane(int_x, int_y, step_x, step_y, separate, center):
     vertices = [(0.0, 0.0, 0.0)]
     vertices_S = []
-    int_x = [int(int_x) if type(int_x) is not list else int(int_x[0])]
-    int_y = [int(int_y) if type(int_y) is not list else int(int_y[0])]
+    int_x = [int(int_x) if not isinstance(int_x, list) else int(int_x[0])]
+    int_y = [int(int_y) if not isinstance(int_y, list) else int(int_y[0])]
 
     # center the grid: offset the starting point of the grid by half its size
     if center:
@@ -52,9 +52,9 @@ def make_plane(int_x, int_y, step_x, step_y, separate, center):
         # starting point of the grid offset by half its size in both directions
         vertices = [(-0.5*sizeX, -0.5*sizeY, 0.0)]
 
-    if type(step_x) is not list:
+    if not isinstance(step_x, list):
         step_x = [step_x]
-    if type(step_y) is not list:
+    if not isinstance(step_y, list):
         step_y = [step_y]
     fullList(step_x, int_x[0])
     fullList(step_y, int_y[0])
@@ -74,10 +74,10 @@ class ShiftNode(bpy.types.Node, SverchCustomTreeNode):
 
         else:
             list_all = []
-            if type(list_a) == list:
+            if isinstance(list_a, list):
                 indx = min(cou, len(shift)-1)
                 for i, l in enumerate(list_a):
-                    if type(l) == tuple:
+                    if isinstance(l, tuple):
                         l = list(l[:])
                     k = min(len(shift[indx])-1, i)
                     n = shift[indx][k]
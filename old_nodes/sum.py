@@ -51,7 +51,7 @@ class ListSumNode(bpy.types.Node, SverchCustomTreeNode):
             for obj in data:
                 out.append(obj)
             #print (data)
-        elif data and (type(data[0]) in [tuple, list]):
+        elif data and isinstance(data[0], (tuple, list)):
             for obj in data:
                 out.extend(self.summ(obj))
         return out
@@ -6,7 +6,7 @@ from bpy.props import BoolProperty, FloatVectorProperty, EnumProperty, IntProper
 
 from sverchok import data_structure
 from sverchok.core import handlers
-from sverchok.core import update_system
+from sverchok.core import update_system, socket_data
 from sverchok.utils import sv_panels_tools, logging
 from sverchok.ui import color_def
 
@@ -21,6 +21,17 @@ class SverchokPreferences(AddonPreferences):
     def update_heat_map(self, context):
         data_structure.heat_map_state(self.heat_map)
 
+    def update_incremental(self, context):
+        data_structure.INCREMENTAL_UPDATE = self.incremental_update
+        update_system.reset_node_fingerprints()
+
+    def update_parallel(self, context):
+        data_structure.PARALLEL_UPDATE = self.parallel_update
+        update_system.shutdown_thread_pool()
+
+    def update_cache_budget(self, context):
+        socket_data.set_cache_budget(self.cache_tree_budget * 2**20, self.cache_total_budget * 2**20)
+
     def set_frame_change(self, context):
         handlers.set_frame_change(self.frame_change_mode)
 
@@ -56,6 +67,36 @@ class SverchokPreferences(AddonPreferences):
         default=(0.8, 0.0, 0), subtype='COLOR',
         update=update_system.update_error_colors)
 
+    incremental_update = BoolProperty(
+        name="Incremental update",
+        description="Skip nodes whose input data and settings did not change since the last update",
+        default=False, subtype='NONE',
+        update=update_incremental)
+
+    parallel_update = BoolProperty(
+        name="Parallel update",
+        description="Compute independent nodes that support it at the same time, not used while heat map is on (experimental)",
+        default=False, subtype='NONE',
+        update=update_parallel)
+
+    parallel_workers = IntProperty(
+        name="Threads",
+        description="Number of threads for parallel update, 0 to use number of processors",
+        default=0, min=0, max=64,
+        update=update_parallel)
+
+    cache_tree_budget = IntProperty(
+        name="Per tree",
+        description="Memory for socket data of one tree in MB, least recently used data is evicted and computed again when needed, 0 for no limit",
+        default=0, min=0,
+        update=update_cache_budget)
+
+    cache_total_budget = IntProperty(
+        name="Total",
+        description="Memory for socket data of all trees in MB, 0 for no limit",
+        default=0, min=0,
+        update=update_cache_budget)
+
     #  heat map settings
     heat_map = BoolProperty(
         name="Heat map",
@@ -241,6 +282,17 @@ class SverchokPreferences(AddonPreferences):
             col2 = col_split.split().column()
             col2.label(text="Frame change handler:")
             col2.row().prop(self, "frame_change_mode", expand=True)
+            col2.prop(self, "incremental_update")
+            parallel_row = col2.row()
+            parallel_row.prop(self, "parallel_update")
+            if self.parallel_update:
+                parallel_row.prop(self, "parallel_workers")
+                if self.heat_map:
+                    col2.label(text="Heat map is on, parallel update is not used", icon='INFO')
+            col2.label(text="Socket data cache budget (MB):")
+            cache_row = col2.row()
+            cache_row.prop(self, "cache_tree_budget")
+            cache_row.prop(self, "cache_total_budget")
             col2.separator()
 
             col2box = col2.box()
@@ -249,6 +301,9 @@ class SverchokPreferences(AddonPreferences):
             col2box.prop(self, "show_debug")
             col2box.prop(self, "heat_map")
             col2box.prop(self, "developer_mode")
+            stats = socket_data.get_cache_stats()
+            col2box.label(text="Socket cache: {:.1f} MB, hit rate {:.0%}, {} evictions".format(
+                stats["resident_bytes"] / 2**20, stats["hit_rate"], stats["evictions"]))
 
             log_box = col2.box()
             log_box.label(text="Logging:")
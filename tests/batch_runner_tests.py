@@ -0,0 +1,45 @@
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_batch_runner import parse_output, load_params, save_data
+
+class BatchRunnerTests(SverchokTestCase):
+
+    def test_parse_output(self):
+        self.assertEqual(parse_output("Box:Vers"), ("Box", "Vers"))
+        # node names may contain colons, socket names don't
+        self.assertEqual(parse_output("Box: 2:Vers"), ("Box: 2", "Vers"))
+        with self.assertRaises(ValueError):
+            parse_output("Vers")
+
+    def test_load_params(self):
+        self.assertEqual(load_params(None), [{}])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "params.json")
+            with open(path, "w") as params_file:
+                json.dump([{"Box": {"Divx": 2}}, {}], params_file)
+            self.assertEqual(load_params(path), [{"Box": {"Divx": 2}}, {}])
+            with open(path, "w") as params_file:
+                json.dump({"Box": {"Divx": 2}}, params_file)
+            with self.assertRaises(ValueError):
+                load_params(path)
+
+    def test_save_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # rectangular data is saved as array
+            name = save_data(os.path.join(directory, "verts"), [[(0, 0, 0), (1, 0, 0)]])
+            self.assertEqual(name, "verts.npy")
+            self.assert_numpy_arrays_equal(np.load(os.path.join(directory, name)), np.array([[(0, 0, 0), (1, 0, 0)]]))
+            # polygons with different number of sides are not
+            name = save_data(os.path.join(directory, "faces"), [[[0, 1, 2], [0, 2, 3, 4]]])
+            self.assertEqual(name, "faces.json")
+            with open(os.path.join(directory, name)) as data_file:
+                self.assertEqual(json.load(data_file), [[[0, 1, 2], [0, 2, 3, 4]]])
+            name = save_data(os.path.join(directory, "arrays"), [np.arange(2), np.arange(3)])
+            with open(os.path.join(directory, name)) as data_file:
+                self.assertEqual(json.load(data_file), [[0, 1], [0, 1, 2]])
@@ -0,0 +1,104 @@
+import math
+import sys
+import timeit
+
+from sverchok.utils.testing import *
+from sverchok.utils.logging import info
+from sverchok.utils.csg_core import CSG
+from sverchok.utils.csg_arrays import boolean
+
+def csg_boolean(verts_a, faces_a, verts_b, faces_b, operation):
+    """Boolean as CSG Boolean node did it before csg_arrays"""
+    recursionlimit = sys.getrecursionlimit()
+    sys.setrecursionlimit(10000)
+    a = CSG.Obj_from_pydata(verts_a, faces_a)
+    b = CSG.Obj_from_pydata(verts_b, faces_b)
+    methods = {'DIFF': a.subtract, 'JOIN': a.union, 'ITX': a.intersect}
+    polygons = methods[operation](b).toPolygons()
+    sys.setrecursionlimit(recursionlimit)
+    vertices, faces = [], []
+    for polygon in polygons:
+        indices = []
+        for v in polygon.vertices:
+            pos = [v.pos.x, v.pos.y, v.pos.z]
+            if pos not in vertices:
+                vertices.append(pos)
+            indices.append(vertices.index(pos))
+        faces.append(indices)
+    return [vertices, faces]
+
+def box(center, size):
+    verts = [[center[0] + size * x, center[1] + size * y, center[2] + size * z]
+             for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [[0, 1, 3, 2], [4, 6, 7, 5], [0, 4, 5, 1], [2, 3, 7, 6], [0, 2, 6, 4], [1, 5, 7, 3]]
+    return verts, faces
+
+def uv_sphere(center, radius, rings, segments):
+    verts = [[center[0], center[1], center[2] - radius]]
+    for i in range(1, rings):
+        theta = math.pi * i / rings - math.pi / 2
+        for j in range(segments):
+            phi = 2 * math.pi * j / segments
+            verts.append([center[0] + radius * math.cos(theta) * math.cos(phi),
+                          center[1] + radius * math.cos(theta) * math.sin(phi),
+                          center[2] + radius * math.sin(theta)])
+    verts.append([center[0], center[1], center[2] + radius])
+    top = len(verts) - 1
+    faces = [[0, 1 + (j + 1) % segments, 1 + j] for j in range(segments)]
+    for i in range(rings - 2):
+        for j in range(segments):
+            a, b = 1 + i * segments + j, 1 + i * segments + (j + 1) % segments
+            faces.append([a, b, b + segments, a + segments])
+    faces.extend([top - segments + j, top - segments + (j + 1) % segments, top] for j in range(segments))
+    return verts, faces
+
+def volume(verts, faces):
+    total = 0.0
+    for face in faces:
+        a = verts[face[0]]
+        for b, c in zip((verts[i] for i in face[1:-1]), (verts[i] for i in face[2:])):
+            total += (a[0] * (b[1] * c[2] - b[2] * c[1])
+                      - a[1] * (b[0] * c[2] - b[2] * c[0])
+                      + a[2] * (b[0] * c[1] - b[1] * c[0])) / 6
+    return total
+
+class CSGArraysTests(SverchokTestCase):
+
+    def test_same_as_csg(self):
+        pairs = [
+            (box([0, 0, 0], 1), box([0.5, 0.5, 0.5], 1)),
+            (box([0, 0, 0], 1), box([0, 0, 0], 0.5)),
+            (box([0, 0, 0], 1), box([3, 0, 0], 1)),
+            (uv_sphere([0, 0, 0], 1, 6, 8), box([0.7, 0.2, -0.1], 0.6)),
+            (uv_sphere([0, 0, 0], 1, 5, 7), uv_sphere([0.4, 0.3, 0.2], 0.9, 6, 9)),
+        ]
+        for mesh_a, mesh_b in pairs:
+            for operation in ('DIFF', 'JOIN', 'ITX'):
+                with self.subTest(operation=operation):
+                    self.assertEqual(boolean(*mesh_a, *mesh_b, operation),
+                                     csg_boolean(*mesh_a, *mesh_b, operation))
+
+    def test_cull(self):
+        mesh_a = uv_sphere([0, 0, 0], 1, 8, 12)
+        mesh_b = uv_sphere([0.8, 0.1, 0.3], 0.7, 8, 12)
+        for operation in ('DIFF', 'JOIN', 'ITX'):
+            with self.subTest(operation=operation):
+                exact = boolean(*mesh_a, *mesh_b, operation)
+                culled = boolean(*mesh_a, *mesh_b, operation, cull=True)
+                # same solid, far polygons are not split
+                self.assertAlmostEqual(volume(*culled), volume(*exact), places=9)
+                self.assertLessEqual(len(culled[1]), len(exact[1]))
+
+class CSGArraysBenchmarks(SverchokTestCase):
+
+    @manual_only
+    def test_spheres(self):
+        mesh_a = uv_sphere([0, 0, 0], 1, 16, 24)
+        mesh_b = uv_sphere([0.6, 0.3, 0.2], 1, 16, 24)
+        timings = [
+            ("csg_core", min(timeit.repeat(lambda: csg_boolean(*mesh_a, *mesh_b, 'DIFF'), number=1, repeat=3))),
+            ("csg_arrays", min(timeit.repeat(lambda: boolean(*mesh_a, *mesh_b, 'DIFF'), number=1, repeat=3))),
+            ("csg_arrays, cull", min(timeit.repeat(lambda: boolean(*mesh_a, *mesh_b, 'DIFF', cull=True), number=1, repeat=3))),
+        ]
+        for name, duration in timings:
+            info("%s: %.4f s", name, duration)
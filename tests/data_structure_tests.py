@@ -1,6 +1,8 @@
 
 import unittest
 
+import numpy as np
+
 from sverchok.utils.logging import error
 from sverchok.utils.testing import *
 from sverchok.data_structure import *
@@ -18,6 +20,36 @@ class DataStructureTests(SverchokTestCase):
         expected_output = [[1,2,3,4,5] ,[10,11,10,11,10]]
         self.assertEquals(output, expected_output)
 
+    def test_match_cross(self):
+        inputs = [[1,2], [5,6,7]]
+        output = match_cross(inputs)
+        expected_output = [[1,1,1,2,2,2], [5,6,7,5,6,7]]
+        self.assertEquals(output, expected_output)
+
+    def test_match_short(self):
+        self.assertEquals(match_short([[1,2,3,4,5], [10,11]]), [[1,2], [10,11]])
+        self.assertEquals(match_short([[1,2,3], []]), [])
+
+    def test_match_views(self):
+        inputs = [[1,2,3,4,5], [10,11]]
+        self.assertEquals([list(view) for view in match_long_repeat_views(inputs)], match_long_repeat(inputs))
+        self.assertEquals([list(view) for view in match_long_cycle_views(inputs)], match_long_cycle(inputs))
+        self.assertEquals([list(view) for view in match_cross_views(inputs)], match_cross(inputs))
+        view = match_long_repeat_views(inputs)[1]
+        self.assertEquals((len(view), view[3], view[-1]), (5, 11, 11))
+
+    def test_match_arrays(self):
+        verts, scale = match_long_repeat([np.zeros((4, 3)), np.array([2.0])])
+        self.assertEquals(scale.shape, (4,))
+        # matched arrays can be changed in place
+        scale[0] = 1.0
+        self.assert_numpy_arrays_equal(scale, np.array([1.0, 2.0, 2.0, 2.0]))
+        source = np.zeros(3)
+        matched, _ = match_short([source, np.arange(2)])
+        matched[0] = 1.0
+        self.assertEqual(source[0], 0.0)
+        self.assert_numpy_arrays_equal(match_long_cycle([np.arange(5), np.array([1, 2])])[1], np.array([1, 2, 1, 2, 1]))
+
     def test_full_list_1(self):
         data = [1,2,3]
         fullList(data, 7)
@@ -68,3 +100,29 @@ class DataStructureTests(SverchokTestCase):
         self.subtest_assert_equals(describe_data_shape([1]), 'Level 1: list [1] of int')
         self.subtest_assert_equals(describe_data_shape([[(1,2,3)]]), 'Level 3: list [1] of list [1] of tuple [3] of int')
 
+    def test_data_shape(self):
+        shape = get_data_shape([[(1,2,3)], [(4,5,6)]])
+        self.subtest_assert_equals(shape.depth, 3)
+        self.subtest_assert_equals(shape.lengths, (2, 1, 3))
+        self.subtest_assert_equals(shape.leaf_type, int)
+        self.subtest_assert_equals(shape.is_rectangular, True)
+        self.subtest_assert_equals(get_data_shape([[1, 2], [3]]).is_rectangular, False)
+        self.subtest_assert_equals(get_data_shape([[]]).levels, levelsOflist([[]]))
+
+    def test_cached_data_shape(self):
+        data = [[1, 2], [3, 4]]
+        shape = cache_data_shape(data)
+        try:
+            self.assertIs(get_data_shape(data), shape)
+            self.subtest_assert_equals(levelsOflist(data), 2)
+            self.subtest_assert_equals(get_data_nesting_level(data), 2)
+            # data changed in place gets a new shape
+            data[0] = [(1, 2)]
+            self.subtest_assert_equals(levelsOflist(data), 3)
+            self.assertIsNot(get_data_shape(data), shape)
+            shape = cache_data_shape(data)
+            data.append([1])
+            self.subtest_assert_equals(get_data_shape(data).is_rectangular, False)
+        finally:
+            forget_data_shape(shape)
+        self.assertIsNot(get_data_shape(data), shape)
@@ -0,0 +1,52 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_expression import get_expression, ExpressionError, as_values
+
+class ExpressionTests(SverchokTestCase):
+
+    def test_cached(self):
+        self.assertIs(get_expression("sin(x) + n[0]"), get_expression("sin(x) + n[0]"))
+
+    def test_whitelist(self):
+        for text in ["__import__('os')", "x.real", "[a for a in x]", "open('f')"]:
+            with self.assertRaises(ExpressionError):
+                get_expression(text)
+
+    def test_evaluate(self):
+        x = as_values([0.5, 1.0, 2.0])
+        n = [as_values([1, 2, 3])]
+        for text in ["sin(x) * n[0]", "log(x, 2) + pi", "x if x > 1 else -x", "factorial(n[0]) + x", "(x, n[0])"]:
+            expression = get_expression(text)
+            self.assertEqual(expression.evaluate({'x': x, 'n': n}, 3),
+                             expression.evaluate_items({'x': x, 'n': n}, 3))
+        self.assertEqual(get_expression("pi").evaluate({}, 2), [np.pi, np.pi])
+
+    def test_math_errors(self):
+        # same errors as math functions give, numpy would answer nan or inf
+        with self.assertRaises(ValueError):
+            get_expression("sqrt(x)").evaluate({'x': as_values([1.0, -1.0])}, 2)
+        with self.assertRaises(ZeroDivisionError):
+            get_expression("1 / x").evaluate({'x': as_values([1, 0])}, 2)
+
+    def test_int_functions(self):
+        # math.floor, ceil and trunc give ints
+        x = as_values([-1.5, 0.5, 2.0])
+        for text in ["floor(x)", "ceil(x)", "trunc(x)", "floor(x) // 2"]:
+            expression = get_expression(text)
+            result = expression.evaluate({'x': x}, 3)
+            self.assertEqual(result, expression.evaluate_items({'x': x}, 3))
+            self.assertEqual([type(value) for value in result], [int] * 3)
+        # math.fmod gives floats for ints
+        i = as_values([-7, 7])
+        expression = get_expression("fmod(i, 3)")
+        result = expression.evaluate({'i': i}, 2)
+        self.assertEqual(result, expression.evaluate_items({'i': i}, 2))
+        self.assertEqual([type(value) for value in result], [float] * 2)
+
+    def test_int_overflow(self):
+        # python ints don't overflow, int64 would give wrong values silently
+        i = as_values([1, 2, 3, 4])
+        self.assertEqual(get_expression("i ** 40").evaluate({'i': i}, 4), [1, 2 ** 40, 3 ** 40, 4 ** 40])
+        self.assertEqual(get_expression("2 ** (i * 20)").evaluate({'i': i}, 4), [2 ** 20, 2 ** 40, 2 ** 60, 2 ** 80])
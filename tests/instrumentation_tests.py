@@ -0,0 +1,67 @@
+
+import collections
+
+from sverchok.utils.testing import *
+from sverchok.core import instrumentation
+
+FakeNode = collections.namedtuple("FakeNode", ["name", "bl_idname", "outputs"])
+FakeTree = collections.namedtuple("FakeTree", ["name", "bl_idname"])
+
+class InstrumentationTests(SverchokTestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+        box = FakeNode("Box", "SvBoxNode", [])
+        bevel = FakeNode("Bevel", "SvBevelNode", [])
+        for i in range(3):
+            update = instrumentation.new_update("TestTree")
+            instrumentation.record_node(update, box, i, 0.1)
+            instrumentation.record_node(update, bevel, i + 0.1, 0.5)
+
+    def tearDown(self):
+        instrumentation.reset()
+
+    def test_node_stats(self):
+        stats = instrumentation.get_node_stats("TestTree")
+        bevel = stats[("TestTree", "Bevel")]
+        self.assertEqual(bevel["calls"], 3)
+        self.assertAlmostEqual(bevel["total_time"], 1.5)
+        self.assertAlmostEqual(bevel["mean_time"], 0.5)
+        self.assertEqual(instrumentation.get_node_stats("OtherTree"), {})
+
+    def test_slowest_nodes(self):
+        slowest = instrumentation.get_slowest_nodes(1)
+        self.assertEqual([key for key, stats in slowest], [("TestTree", "Bevel")])
+
+    def test_history_length(self):
+        instrumentation.set_history_length(2)
+        try:
+            self.assertEqual(len(instrumentation.get_updates()), 2)
+        finally:
+            instrumentation.set_history_length(10)
+
+    def test_chrome_trace(self):
+        events = instrumentation.get_chrome_trace()["traceEvents"]
+        durations = [event["dur"] for event in events if event["ph"] == "X"]
+        self.assertEqual(len(durations), 6)
+        self.assertAlmostEqual(max(durations), 500000)
+
+    def test_top_level_updates(self):
+        # monad runs are part of the monad node of the tree update
+        self.assertIsNone(instrumentation.start_update(FakeTree("Monad", "SverchGroupTreeType")))
+        instrumentation.record_node(None, FakeNode("Math", "SvScalarMathNodeMK2", []), 0, 0.1)
+        self.assertEqual(len(instrumentation.get_updates()), 3)
+        instrumentation.start_update(FakeTree("TestTree", "SverchCustomTreeType"))
+        self.assertEqual(len(instrumentation.get_updates()), 4)
+
+    def test_output_size_when_tracing(self):
+        stats = instrumentation.get_node_stats("TestTree")
+        self.assertIsNone(stats[("TestTree", "Box")]["output_bytes"])
+        instrumentation.set_tracing(True)
+        try:
+            update = instrumentation.new_update("TestTree")
+            instrumentation.record_node(update, FakeNode("Box", "SvBoxNode", []), 4, 0.1)
+        finally:
+            instrumentation.set_tracing(False)
+        stats = instrumentation.get_node_stats("TestTree")
+        self.assertEqual(stats[("TestTree", "Box")]["output_bytes"], 0)
@@ -0,0 +1,62 @@
+
+import itertools
+import timeit
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.logging import info
+from sverchok.data_structure import match_long_repeat, match_long_cycle, match_cross
+from sverchok.utils.sv_matching import match_long_repeat_views, match_arrays, array_fx, array_fxy
+from sverchok.utils.sv_itertools import recurse_fx, recurse_fxy
+
+def best_time(statement, number=3):
+    return min(timeit.repeat(statement, number=1, repeat=number))
+
+class ArrayFunctionTests(SverchokTestCase):
+
+    def test_array_fxy(self):
+        # same matching as recurse_fxy: outer levels first, padding by last element
+        for x, y in [([[1, 2, 3], [4, 5, 6]], [[10]]),
+                     ([[1, 2, 3]], [[10, 20], [30, 40]]),
+                     ([[1.5, 2.5]], [[[1, 2], [3, 4]]]),
+                     ([[[1, 2], [3, 4]]], [[0.5, 1, 2]])]:
+            self.assertEqual(array_fxy(x, y, np.add).tolist(), recurse_fxy(x, y, lambda a, b: a + b))
+
+    def test_fallback(self):
+        self.assertIsNone(array_fxy([[1, 2]], [[0, 1]], np.true_divide))
+        self.assertIsNone(array_fx([[-1.0]], np.log))
+        self.assertIsNone(array_fxy([[10]], [[30]], np.power))
+        self.assertIsNone(array_fx([[1, 2], [3]], np.sin))
+        self.assertEqual(array_fxy([[2]], [[3]], np.power).tolist(), [[8]])
+
+
+class ListMatchingBenchmarks(SverchokTestCase):
+
+    @manual_only
+    def test_long_against_scalar(self):
+        # 1M elements matched against a single value
+        data = [list(range(1000000)), [0.5]]
+        arrays = [np.arange(1000000), np.array([0.5])]
+        timings = [
+            ("match_long_repeat", best_time(lambda: match_long_repeat(data))),
+            ("match_long_repeat_views", best_time(lambda: match_long_repeat_views(data))),
+            ("match_long_repeat_views + zip", best_time(lambda: sum(1 for _ in zip(*match_long_repeat_views(data))))),
+            ("match_arrays", best_time(lambda: match_arrays(arrays))),
+            ("recurse_fxy", best_time(lambda: recurse_fxy(data[:1], data[1:], lambda x, y: x * y))),
+            ("array_fxy", best_time(lambda: array_fxy(data[:1], data[1:], np.multiply))),
+        ]
+        for name, duration in timings:
+            info("%s: %.4f s", name, duration)
+
+    @manual_only
+    def test_cycle_and_cross(self):
+        data = [list(range(1000)), list(range(300))]
+        timings = [
+            ("match_long_cycle", best_time(lambda: match_long_cycle(data))),
+            ("match_cross", best_time(lambda: match_cross(data))),
+            ("itertools.product", best_time(lambda: list(map(list, zip(*itertools.product(*data)))))),
+        ]
+        for name, duration in timings:
+            info("%s: %.4f s", name, duration)
+
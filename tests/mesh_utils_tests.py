@@ -0,0 +1,26 @@
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_mesh_utils import weld_map, remove_doubles
+
+class WeldTests(SverchokTestCase):
+
+    def test_weld_map(self):
+        verts = [[0, 0, 0], [1, 0, 0], [0, 0, 0.05], [1.05, 0, 0], [3, 0, 0]]
+        self.assert_numpy_arrays_equal(weld_map(verts, 0.1), np.array([0, 1, 0, 1, 4]))
+        # exact duplicates only, first one is kept
+        self.assert_numpy_arrays_equal(weld_map(verts + [[1, 0, 0]], 0), np.array([0, 1, 2, 3, 4, 1]))
+
+    def test_remove_doubles(self):
+        verts = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (1.0001, 0, 0)]
+        faces = [[0, 4, 2, 3], [1, 4, 2]]
+        verts_out, edges, faces_out, doubles = remove_doubles(verts, [], faces, 0.001)
+        self.assertEqual(verts_out, verts[:4])
+        self.assertEqual(faces_out, [[0, 1, 2, 3]])
+        self.assertEqual(edges, [[0, 1], [1, 2], [2, 3], [3, 0]])
+        self.assertEqual(doubles, [(1.0001, 0, 0)])
+
+        _, edges, faces_out, _ = remove_doubles(verts, [[0, 1], [0, 4], [1, 4]], [], 0.001)
+        self.assertEqual(edges, [[0, 1]])
+        self.assertEqual(faces_out, [])
@@ -0,0 +1,82 @@
+
+import collections
+import pickle
+import threading
+from multiprocessing import Pipe
+
+from mathutils import Matrix, Vector
+
+from sverchok.utils.testing import *
+from sverchok.core.monad import find_batch_blocker, find_scene_dependency
+from sverchok.utils.sv_monad_pool import make_chunks, make_payloads, dispatch, MonadWorker, MonadWorkerError
+
+FakeNode = collections.namedtuple("FakeNode", ["bl_idname", "is_list_transparent"])
+FakeMonad = collections.namedtuple("FakeMonad", ["nodes"])
+SceneNode = collections.namedtuple("SceneNode", ["is_scene_dependent", "is_animation_dependent"])
+SceneMonad = collections.namedtuple("SceneMonad", ["nodes", "animation_data"])
+
+class MonadBatchTests(SverchokTestCase):
+
+    def test_find_batch_blocker(self):
+        monad = FakeMonad({
+            "Group Inputs Exp": FakeNode("SvGroupInputsNodeExp", True),
+            "Math": FakeNode("SvScalarMathNodeMK2", True),
+            "Reroute": FakeNode("NodeReroute", False),
+            "Monad Info": FakeNode("SvMonadInfoNode", False),
+            "Group Outputs Exp": FakeNode("SvGroupOutputsNodeExp", True),
+        })
+        update_list = ["Group Inputs Exp", "Math", "Reroute", "Group Outputs Exp"]
+        self.assertIsNone(find_batch_blocker(monad, update_list))
+        self.assertEqual(find_batch_blocker(monad, ["Monad Info"] + update_list), "Monad Info")
+
+    def test_make_chunks(self):
+        self.assertEqual(make_chunks(10, 3, 0), [(0, 4), (4, 8), (8, 10)])
+        self.assertEqual(make_chunks(5, 2, 2), [(0, 2), (2, 4), (4, 5)])
+        self.assertEqual(make_chunks(2, 4, 0), [(0, 1), (1, 2)])
+
+class MonadPoolTests(SverchokTestCase):
+
+    def test_find_scene_dependency(self):
+        nodes = {"Math": SceneNode(False, False), "Objects in": SceneNode(True, True)}
+        self.assertEqual(find_scene_dependency(SceneMonad(nodes, None)), "Objects in")
+        del nodes["Objects in"]
+        self.assertIsNone(find_scene_dependency(SceneMonad(nodes, None)))
+        nodes["Frame info"] = SceneNode(False, True)
+        self.assertEqual(find_scene_dependency(SceneMonad(nodes, None)), "Frame info")
+
+    def test_make_payloads(self):
+        data_in = [[Vector((1, 2, 3)), Vector((4, 5, 6)), Vector((7, 8, 9))], [Matrix(), Matrix(), Matrix()]]
+        payloads = make_payloads(data_in, make_chunks(3, 2, 0), 3)
+        message = pickle.loads(payloads[1])
+        self.assertEqual(message, ("run", 1, [[Vector((7, 8, 9))], [Matrix()]], 2, 3))
+        # data that can't be sent is found before anything is sent
+        self.assertIsNone(make_payloads([[1, lambda: 2]], [(0, 1), (1, 2)], 2))
+
+    def test_dispatch(self):
+        ends = [Pipe() for _ in range(2)]
+        workers = [MonadWorker(None, end) for end, _ in ends]
+
+        def serve(connection):
+            while True:
+                message = connection.recv()
+                if message[0] == "quit":
+                    return
+                _, index, data_in, first_index, total = message
+                connection.send(("result", index, [[item * 2 for item in data_in[0]]], ""))
+
+        threads = [threading.Thread(target=serve, args=(other,), daemon=True) for _, other in ends]
+        for thread in threads:
+            thread.start()
+        prepared = []
+        payloads = make_payloads([list(range(5))], make_chunks(5, 2, 1), 5)
+        replies = dispatch(workers, payloads, prepared.append)
+        self.assertEqual([reply[2] for reply in replies], [[[0]], [[2]], [[4]], [[6]], [[8]]])
+        self.assertEqual(len(prepared), 5)
+        for worker in workers:
+            worker.send("quit")
+
+    def test_dispatch_timeout(self):
+        end, other = Pipe()
+        payloads = make_payloads([[1]], [(0, 1)], 1)
+        with self.assertRaises(MonadWorkerError):
+            dispatch([MonadWorker(None, end)], payloads, lambda worker: None, timeout=0.1)
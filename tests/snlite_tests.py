@@ -0,0 +1,70 @@
+
+from sverchok.utils.testing import *
+from sverchok.core.socket_data import get_output_socket_data
+from sverchok.utils.snlite_utils import compile_script
+from sverchok.utils.snlite_importhelper import parse_sockets
+
+class FakeNode(object):
+    def __init__(self, script_str):
+        self.script_str = script_str
+
+class SNLiteTests(SverchokTestCase):
+
+    def test_compile_once(self):
+        script = "y = [[v * 2 for v in x[0]]]"
+        code = compile_script(script)
+        self.assertIs(compile_script(script), code)
+        namespace = {'x': [[1, 2]]}
+        exec(code, namespace)
+        self.assertEqual(namespace['y'], [[2, 4]])
+
+    def test_vectorized_header(self):
+        header = '"""\nin x s .=[] n=0\nout y s\n{}"""\n'
+        self.assertFalse(parse_sockets(FakeNode(header.format('')))['vectorized'])
+        self.assertTrue(parse_sockets(FakeNode(header.format('vectorized\n')))['vectorized'])
+
+NAMESPACE_SCRIPT = '''"""
+in n s d=3 n=2
+out y s
+out name s
+"""
+def setup():
+    base = 10
+
+y = [[base + n]]
+name = [[self.bl_idname]]
+'''
+
+VECTORIZED_SCRIPT = '''"""
+in verts v d=[] n=0
+out kinds s
+vectorized
+"""
+kinds = [[type(obj).__name__ for obj in verts]]
+'''
+
+class SNLiteNodeTests(EmptyTreeTestCase):
+
+    def make_script_node(self, script):
+        node = create_node("SvScriptNodeLite", self.tree.name)
+        node.script_name = "test_script.py"
+        node.script_str = script
+        node.load()
+        return node
+
+    def test_namespace(self):
+        # inputs, self and setup state go in, outputs are read by socket name
+        node = self.make_script_node(NAMESPACE_SCRIPT)
+        self.assertEqual(get_output_socket_data(node, "y"), [[13]])
+        self.assertEqual(get_output_socket_data(node, "name"), [["SvScriptNodeLite"]])
+        # setup runs once, its state is kept for next runs
+        node.process()
+        self.assertEqual(get_output_socket_data(node, "y"), [[13]])
+
+    def test_vectorized_inputs(self):
+        box = create_node("SvBoxNode", self.tree.name)
+        node = self.make_script_node(VECTORIZED_SCRIPT)
+        self.tree.links.new(box.outputs[0], node.inputs[0])
+        box.process()
+        node.process()
+        self.assertEqual(get_output_socket_data(node, "kinds"), [["ndarray"]])
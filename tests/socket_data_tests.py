@@ -0,0 +1,194 @@
+
+import copy
+import time
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.logging import info
+from sverchok.core.socket_data import (
+    sv_deep_copy, sv_cow_copy, SvCowList,
+    is_array_data, data_to_list, data_to_arrays, is_same_data,
+    SvSetSocket, SvGetSocket, get_output_socket_data, reset_socket_cache,
+    estimate_data_size, get_cache_stats, set_cache_budget, enforce_cache_budget, socket_data_sizes,
+    socket_data_cache, forget_freed_sockets)
+
+class CowListTests(SverchokTestCase):
+
+    def setUp(self):
+        self.source = [[[0, 1, 2], [2, 3, 4]], [[5, 6, 7]]]
+        self.original = copy.deepcopy(self.source)
+
+    def test_same_as_deep_copy(self):
+        data = sv_cow_copy(self.source)
+        self.assertIsInstance(data, list)
+        self.assertEqual(data, sv_deep_copy(self.source))
+
+    def test_mutate_nested(self):
+        data = sv_cow_copy(self.source)
+        data[0].append([9])
+        data[0][0].append(3)
+        data[1][0][0] = 100
+        for obj in data:
+            for face in obj:
+                face.append(-1)
+        self.assertEqual(self.source, self.original)
+        self.assertEqual(data, [[[0, 1, 2, 3, -1], [2, 3, 4, -1], [9, -1]], [[100, 6, 7, -1]]])
+
+    def test_mutate_after_taking_out(self):
+        data = sv_cow_copy(self.source)
+        list(data)[0][0].append('a')
+        sorted(data)[1].append('b')
+        first, second = data
+        first.append('c')
+        data[:][1][0].append('d')
+        data.pop()[0].append('e')
+        self.assertEqual(self.source, self.original)
+
+    def test_numpy_reads_without_copy(self):
+        data = sv_cow_copy([[[0, 1, 2], [2, 3, 4]], [[5, 6, 7], [1, 2, 3]]])
+        shared = list.__getitem__(data, 0)
+        self.assertEqual(np.array(data).shape, (2, 2, 3))
+        self.assertIs(list.__getitem__(data, 0), shared)
+        # lists of different length are taken out
+        data = sv_cow_copy(self.source)
+        array = np.array(data[0] + [[1]], dtype=object)
+        array[0].append(3)
+        self.assertEqual(self.source, self.original)
+
+    def test_identity_is_kept(self):
+        data = sv_cow_copy(self.source)
+        obj = data[0]
+        obj.append([8])
+        self.assertIs(data[0], obj)
+        self.assertEqual(data[0][-1], [8])
+
+    def test_appended_lists_are_not_copied(self):
+        data = sv_cow_copy(self.source)
+        new = []
+        data.append(new)
+        new.append(1)
+        self.assertEqual(data[-1], [1])
+
+    def test_leaf_lists(self):
+        self.subtest_assert_equals(sv_cow_copy([1, 2, 3]), [1, 2, 3])
+        self.subtest_assert_equals(sv_cow_copy(1), 1)
+        self.subtest_assert_equals(type(sv_cow_copy([[(1, 2, 3)]])), SvCowList)
+
+class ArrayDataTests(SverchokTestCase):
+
+    def test_is_array_data(self):
+        self.subtest_assert_equals(is_array_data(np.zeros((2, 3))), True)
+        self.subtest_assert_equals(is_array_data([np.zeros((2, 3))]), True)
+        self.subtest_assert_equals(is_array_data([[(1, 2, 3)]]), False)
+        self.subtest_assert_equals(is_array_data([]), False)
+        self.subtest_assert_equals(is_array_data([[(1, 2, 3)], np.zeros((2, 3))]), True)
+
+    def test_data_to_list(self):
+        data = [np.array([[1, 2, 3], [4, 5, 6]])]
+        self.assertEqual(data_to_list(data), [[[1, 2, 3], [4, 5, 6]]])
+        # objects given as lists are kept next to converted arrays
+        self.assertEqual(data_to_list([[[0, 1, 2]], np.array([[1, 2, 3]])]), [[[0, 1, 2]], [[1, 2, 3]]])
+
+    def test_data_to_arrays(self):
+        arrays = data_to_arrays([[(1, 2, 3), (4, 5, 6)], [[0, 1, 2], [1, 2]]])
+        self.assert_numpy_arrays_equal(arrays[0], np.array([[1, 2, 3], [4, 5, 6]]))
+        # not rectangular, left as is
+        self.assertEqual(arrays[1], [[0, 1, 2], [1, 2]])
+
+    def test_is_same_data(self):
+        self.subtest_assert_equals(is_same_data([np.arange(3)], [np.arange(3)]), True)
+        self.subtest_assert_equals(is_same_data([np.arange(3)], [np.arange(4)]), False)
+        self.subtest_assert_equals(is_same_data([np.arange(3)], [[0, 1, 2]]), False)
+        self.subtest_assert_equals(is_same_data([[1, 2]], [[1, 2]]), True)
+        data = [[1, 2]]
+        self.subtest_assert_equals(is_same_data(data, data), False)
+
+
+class SocketCacheTests(EmptyTreeTestCase):
+
+    def test_socket_id(self):
+        node = create_node("ListLengthNode", self.tree.name)
+        socket = node.outputs[0]
+        self.assertIsInstance(socket.socket_id, int)
+        self.assertEqual(socket.socket_id, node.outputs[0].socket_id)
+        self.assertNotEqual(socket.socket_id, node.inputs[0].socket_id)
+
+    def test_tree_rename(self):
+        node = create_node("ListLengthNode", self.tree.name)
+        SvSetSocket(node.outputs[0], [[1]])
+        name = self.tree.name
+        self.tree.name = name + "_renamed"
+        try:
+            self.assertEqual(get_output_socket_data(node, "Length"), [[1]])
+        finally:
+            self.tree.name = name
+        reset_socket_cache(self.tree)
+        with self.assertRaises(LookupError):
+            get_output_socket_data(node, "Length")
+
+    def test_cow_list_through_shuffle(self):
+        node = create_node("ListShuffleNode", self.tree.name)
+        source = [[0, 1, 2, 3], [4, 5, 6, 7]]
+        data = sv_cow_copy(source)
+        self.assertIsInstance(data, SvCowList)
+        result = node.shuffle(data, 2)
+        self.assertEqual([sorted(item) for item in result], source)
+        self.assertEqual(source, [[0, 1, 2, 3], [4, 5, 6, 7]])
+
+    def test_estimate_data_size(self):
+        self.assertEqual(estimate_data_size([np.zeros((10, 3))]), estimate_data_size([]) + 240)
+        small = estimate_data_size([[(0.0, 0.0, 0.0)] * 10])
+        big = estimate_data_size([[(0.0, 0.0, 0.0)] * 1000])
+        self.assertTrue(big > 50 * small)
+
+    def test_cache_budget(self):
+        node1 = create_node("ListLengthNode", self.tree.name)
+        node2 = create_node("ListLengthNode", self.tree.name)
+        data = [np.zeros((1000, 3))]
+        evictions = get_cache_stats()["evictions"]
+        set_cache_budget(estimate_data_size(data) + 1000, 0)
+        try:
+            SvSetSocket(node1.outputs[0], data)
+            SvSetSocket(node2.outputs[0], data)
+            # nothing is evicted during an update
+            self.assertEqual(get_cache_stats()["evictions"], evictions)
+            enforce_cache_budget()
+        finally:
+            set_cache_budget(0, 0)
+        # least recently used data is evicted
+        with self.assertRaises(LookupError):
+            get_output_socket_data(node1, "Length")
+        self.assertIs(get_output_socket_data(node2, "Length"), data)
+        self.assertTrue(get_cache_stats(self.tree)["resident_bytes"] < 2 * estimate_data_size(data))
+
+    def test_forget_freed_sockets(self):
+        node = create_node("ListLengthNode", self.tree.name)
+        s_id = node.outputs[0].socket_id
+        SvSetSocket(node.outputs[0], [[1]])
+        self.tree.nodes.remove(node)
+        # the id may be given to a new socket
+        forget_freed_sockets(self.tree)
+        self.assertNotIn(s_id, socket_data_cache)
+
+    def test_no_accounting_without_budget(self):
+        node = create_node("ListLengthNode", self.tree.name)
+        data = [np.zeros((1000, 3))]
+        SvSetSocket(node.outputs[0], data)
+        self.assertNotIn(node.outputs[0].socket_id, socket_data_sizes)
+        self.assertEqual(get_cache_stats(self.tree)["resident_bytes"], estimate_data_size(data))
+
+    @manual_only
+    def test_link_overhead(self):
+        # a chain of nodes with a few thousands of links
+        count = 2000
+        nodes = [create_node("ListLengthNode", self.tree.name) for i in range(count)]
+        for node, next_node in zip(nodes, nodes[1:]):
+            self.tree.links.new(node.outputs[0], next_node.inputs[0])
+
+        data = [[1, 2, 3]]
+        start = time.perf_counter()
+        for node, next_node in zip(nodes, nodes[1:]):
+            SvSetSocket(node.outputs[0], data)
+            SvGetSocket(next_node.inputs[0], deepcopy=False)
+        duration = time.perf_counter() - start
+        info("Socket data overhead: %.2f us per link", duration * 1e6 / (count - 1))
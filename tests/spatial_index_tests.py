@@ -0,0 +1,63 @@
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_spatial_index import (
+        data_fingerprint, get_kdtree, get_bvhtree,
+        clear_index_cache, get_index_stats,
+        PointGrid, find_n_batch, find_range_batch, split_results)
+from sverchok.nodes.analyzer.kd_tree_MK2 import SvKDTreeNodeMK2
+
+class SpatialIndexTests(SverchokTestCase):
+
+    def setUp(self):
+        clear_index_cache()
+
+    def test_fingerprint(self):
+        verts = [[0, 0, 0], [1, 0, 0], [1, 1, 0]]
+        self.assertEqual(data_fingerprint(verts), data_fingerprint(np.array(verts)))
+        self.assertNotEqual(data_fingerprint([[0, 1, 2]]), data_fingerprint([[0, 1], [2]]))
+
+    def test_shared_trees(self):
+        verts = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+        faces = [[0, 1, 2, 3]]
+        bvh = get_bvhtree(verts, faces)
+        # same content from other lists gives the same tree
+        self.assertIs(get_bvhtree([list(v) for v in verts], [[0, 1, 2, 3]]), bvh)
+        self.assertIsNot(get_bvhtree(verts, faces, epsilon=0.1), bvh)
+
+        kd = get_kdtree(verts)
+        self.assertIs(get_kdtree(verts), kd)
+        self.assertEqual(kd.find((0.9, 0.1, 0))[1], 1)
+        self.assertEqual(get_index_stats()["builds"], 3)
+
+    def test_batch_queries(self):
+        verts = [[0, 0, 0], [1, 0, 0], [3, 0, 0]]
+        queries = [[0.9, 0, 0], [10, 0, 0]]
+        indices, distances, offsets = find_n_batch(verts, queries, 2)
+        self.assertEqual(split_results(indices, offsets), [[1, 0], [2, 1]])
+        indices, distances, offsets = find_range_batch(verts, queries, [1.0, 1.0])
+        self.assertEqual(split_results(indices, offsets), [[1, 0], []])
+
+    def test_point_grid(self):
+        # grid answers the same as KDTree, also for flat clouds and far queries
+        random = np.random.RandomState(1)
+        verts = np.vstack((random.rand(500, 3), random.rand(300, 3) * (10, 10, 0)))
+        queries = np.vstack((random.rand(100, 3) * 1.2 - 0.1, [(100, -30, 4)]))
+        grid = PointGrid(verts)
+        for grid_result, kd_result in [(grid.find_n(queries, 4), find_n_batch(verts, queries, 4)),
+                                       (grid.find_range(queries, 0.2), find_range_batch(verts, queries, 0.2))]:
+            self.assert_numpy_arrays_equal(grid_result[2], kd_result[2])
+            self.assert_numpy_arrays_equal(grid_result[1], kd_result[1], precision=4)
+
+    def test_compute_in_thread(self):
+        # parallel update runs sv_compute on plain data in a worker thread
+        verts = [[0, 0, 0], [1, 0, 0], [3, 0, 0]]
+        data = ([verts], [[[0.9, 0, 0]]], [[2]], True, [True, True, False])
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            co, ind, dist = pool.submit(SvKDTreeNodeMK2.sv_compute, data).result()
+        self.assertEqual(ind, [[1, 0]])
+        self.assertEqual(co, [[[1, 0, 0], [0, 0, 0]]])
+        self.assertEqual(dist, [])
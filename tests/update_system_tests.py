@@ -4,7 +4,9 @@ import unittest
 
 from sverchok.utils.testing import *
 from sverchok.utils.logging import debug, info
-from sverchok.core.update_system import make_dep_dict, make_update_list
+from sverchok.core.update_system import (
+    make_dep_dict, make_update_list, make_update_waves, node_fingerprint,
+    get_dep_dict, tag_tree_changed, make_animation_update_list)
 #from sverchok.tests.mocks import *
 
 class UpdateSystemTests(ReferenceTreeTestCase):
@@ -35,3 +37,84 @@ class UpdateSystemTests(ReferenceTreeTestCase):
                 dep_idx = result.index(dep)
                 self.assertTrue(dep_idx < node_idx)
 
+    def test_node_fingerprint(self):
+        tree = get_node_tree()
+        # Box has no linked inputs, it is a source and always processed
+        self.assertIsNone(node_fingerprint(tree.nodes['Box']))
+
+        bevel = tree.nodes['Bevel']
+        fingerprint = node_fingerprint(bevel)
+        self.assertIsNotNone(fingerprint)
+        self.assertEqual(fingerprint, node_fingerprint(bevel))
+
+    def test_make_update_waves(self):
+        tree = get_node_tree()
+        deps = make_dep_dict(tree)
+        update_list = make_update_list(tree)
+        waves = make_update_waves(update_list, deps)
+
+        self.assertEqual(sorted(sum(waves, [])), sorted(update_list))
+        # Each node is in a later wave than all its dependencies
+        wave_index = {name: i for i, wave in enumerate(waves) for name in wave}
+        for node, node_deps in deps.items():
+            for dep in node_deps:
+                self.assertTrue(wave_index[dep] < wave_index[node])
+
+
+    def test_get_dep_dict(self):
+        tree = get_node_tree()
+        deps = get_dep_dict(tree)
+        self.assertEqual(deps, make_dep_dict(tree))
+        # The graph is cached until the tree is changed
+        self.assertIs(deps, get_dep_dict(tree))
+        tag_tree_changed(tree)
+        self.assertIsNot(deps, get_dep_dict(tree))
+        self.assertEqual(deps, get_dep_dict(tree))
+
+    def test_make_animation_update_list(self):
+        tree = get_node_tree()
+        # Nothing in the tree depends on time
+        self.assertEqual(make_animation_update_list(tree), [])
+
+class AnimationUpdateTests(EmptyTreeTestCase):
+
+    def test_make_animation_update_list(self):
+        frame = create_node("SvFrameInfoNodeMK2", self.tree.name)
+        frame_length = create_node("ListLengthNode", self.tree.name)
+        self.tree.links.new(frame.outputs[0], frame_length.inputs[0])
+        number = create_node("FloatNode", self.tree.name)
+        number.keyframe_insert("float_")
+        number_length = create_node("ListLengthNode", self.tree.name)
+        self.tree.links.new(number.outputs[0], number_length.inputs[0])
+        box = create_node("SvBoxNode", self.tree.name)
+        box_length = create_node("ListLengthNode", self.tree.name)
+        self.tree.links.new(box.outputs[0], box_length.inputs[0])
+
+        update_list = make_animation_update_list(self.tree)
+        self.assertEqual(set(update_list), {frame.name, frame_length.name, number.name, number_length.name})
+        self.assertTrue(update_list.index(frame.name) < update_list.index(frame_length.name))
+        self.assertTrue(update_list.index(number.name) < update_list.index(number_length.name))
+
+class FingerprintTests(EmptyTreeTestCase):
+
+    def test_scene_dependent_node(self):
+        box = create_node("SvBoxNode", self.tree.name)
+        length = create_node("ListLengthNode", self.tree.name)
+        viewer = create_node("SvBmeshViewerNodeMK2", self.tree.name)
+        self.tree.links.new(box.outputs[0], length.inputs[0])
+        self.tree.links.new(box.outputs[0], viewer.inputs[0])
+        self.assertIsNotNone(node_fingerprint(length))
+        # objects of viewer may have been changed or deleted in the scene
+        self.assertIsNone(node_fingerprint(viewer))
+
+class WifiDependencyTests(EmptyTreeTestCase):
+
+    def test_var_name_changes_dep_dict(self):
+        wifi_in = create_node("WifiInNode", self.tree.name)
+        wifi_out = create_node("WifiOutNode", self.tree.name)
+        wifi_out.outputs.new('StringsSocket', wifi_in.var_name + "[0]")
+        deps = get_dep_dict(self.tree)
+        # linking by name is an edit of the graph
+        wifi_out.var_name = wifi_in.var_name
+        self.assertIsNot(deps, get_dep_dict(self.tree))
+        self.assertEqual(get_dep_dict(self.tree)[wifi_out.name], {wifi_in.name})
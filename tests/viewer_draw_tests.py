@@ -0,0 +1,64 @@
+
+import time
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.logging import info
+from sverchok.ui.viewer_draw_mk2 import make_draw_buffers
+
+def draw_options(**kwargs):
+    options = {
+        'verlen': 0,
+        'show_verts': True,
+        'show_edges': True,
+        'show_faces': True,
+        'shading': False,
+        'forced_tessellation': False,
+        'light_direction': (0.2, 0.6, 0.4),
+        'face_colors': (0.8, 0.8, 0.8),
+    }
+    options.update(kwargs)
+    return options
+
+class ViewerDrawTests(SverchokTestCase):
+
+    def test_draw_buffers(self):
+        verts = [[(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]]
+        # the second polygon refers to missing vertex and is skipped
+        faces = [[[0, 1, 2, 3], [0, 1, 7]]]
+        matrices = [np.eye(4), np.diag([2.0, 2.0, 2.0, 1.0])]
+        buffers = make_draw_buffers(draw_options(shading=True), verts, faces, matrices, [])
+
+        self.assertEqual(buffers['points'].shape, (8, 3))
+        # quad is fanned into two triangles, drawn once per matrix
+        self.assertEqual(buffers['faces'].shape, (12, 3))
+        self.assertEqual(buffers['face_colors'].shape, (12, 3))
+        # four unique edges of the quad, two line ends each
+        self.assertEqual(buffers['edges'].shape, (16, 3))
+        self.assert_numpy_arrays_equal(buffers['faces'][6:9], np.array([(0, 0, 0), (2, 0, 0), (2, 2, 0)], dtype=np.float32))
+
+    def test_draw_buffers_edges(self):
+        verts = [[(0, 0, 0), (1, 0, 0), (1, 1, 0)]]
+        edges = [[(0, 1), (1, 2), (2, 5)]]
+        buffers = make_draw_buffers(draw_options(show_verts=False), verts, [], [np.eye(4)], edges)
+        self.assertEqual(buffers['points'].shape, (0, 3))
+        self.assert_numpy_arrays_equal(buffers['edges'], np.array([(0, 0, 0), (1, 0, 0), (1, 0, 0), (1, 1, 0)], dtype=np.float32))
+
+    @manual_only
+    def test_draw_buffers_benchmark(self):
+        # a grid of quads with 250k vertices, instanced by a few matrices
+        side = 500
+        xs, ys = np.meshgrid(np.arange(side), np.arange(side))
+        verts = [np.stack((xs.ravel(), ys.ravel(), np.zeros(side * side)), axis=1).tolist()]
+        index = np.arange(side * side).reshape(side, side)
+        quads = np.stack((index[:-1, :-1], index[:-1, 1:], index[1:, 1:], index[1:, :-1]), axis=2)
+        faces = [quads.reshape(-1, 4).tolist()]
+        matrices = [np.eye(4) for i in range(4)]
+
+        start = time.perf_counter()
+        buffers = make_draw_buffers(draw_options(shading=True), verts, faces, matrices, [])
+        duration = time.perf_counter() - start
+        info("Viewer draw buffers for %s vertices, %s triangles built in %.3f s",
+             len(buffers['points']), len(buffers['faces']) // 3, duration)
+
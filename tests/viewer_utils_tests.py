@@ -0,0 +1,73 @@
+
+import numpy as np
+
+import bpy
+
+from sverchok.utils.testing import *
+from sverchok.utils.sv_viewer_utils import (
+    pydata_to_arrays, data_hash, viewer_data_unchanged, viewer_data_written, forget_viewer_data,
+    write_mesh_data, clear_viewer_data)
+
+class FakeViewer(object):
+    def as_pointer(self):
+        return id(self)
+
+class ViewerUtilsTests(SverchokTestCase):
+
+    def test_pydata_to_arrays(self):
+        edges, loop_totals, loops = pydata_to_arrays([(0, 1)], [[0, 1, 2], [0, 2, 3, 4]])
+        self.assert_numpy_arrays_equal(edges, np.array([0, 1]))
+        self.assert_numpy_arrays_equal(loop_totals, np.array([3, 4]))
+        self.assert_numpy_arrays_equal(loops, np.array([0, 1, 2, 0, 2, 3, 4]))
+
+    def test_data_hash(self):
+        verts = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0)]
+        faces = [[0, 1, 2], [0, 2]]
+        self.assertEqual(data_hash((verts, faces, None)), data_hash((list(verts), [[0, 1, 2], [0, 2]], None)))
+        self.assertEqual(data_hash(verts), data_hash(np.array(verts)))
+        self.assertNotEqual(data_hash((verts, faces)), data_hash((verts, [[0, 1], [2, 0, 2]])))
+        self.assertNotEqual(data_hash(verts), data_hash(verts[:2]))
+
+    def test_viewer_data_unchanged(self):
+        node = FakeViewer()
+        verts = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)]
+        self.assertFalse(viewer_data_unchanged(node, "Object", verts))
+        # write failed, data is not remembered
+        self.assertFalse(viewer_data_unchanged(node, "Object", verts))
+        viewer_data_written(node, "Object")
+        self.assertTrue(viewer_data_unchanged(node, "Object", verts))
+        self.assertFalse(viewer_data_unchanged(node, "Object", verts[:1]))
+        viewer_data_written(node, "Object")
+        forget_viewer_data(node, ["Other"])
+        self.assertTrue(viewer_data_unchanged(node, "Object", verts[:1]))
+        forget_viewer_data(node)
+        self.assertFalse(viewer_data_unchanged(node, "Object", verts[:1]))
+
+class WriteMeshDataTests(SverchokTestCase):
+
+    def setUp(self):
+        self.mesh = bpy.data.meshes.new("WriteMeshDataTest")
+
+    def tearDown(self):
+        bpy.data.meshes.remove(self.mesh)
+        clear_viewer_data()
+
+    def mesh_faces(self):
+        return [list(polygon.vertices) for polygon in self.mesh.polygons]
+
+    def test_coordinates_only(self):
+        verts = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+        write_mesh_data(self.mesh, verts, [], [[0, 1, 2, 3]])
+        moved = [(x, y, 1.0) for x, y, z in verts]
+        write_mesh_data(self.mesh, moved, [], [[0, 1, 2, 3]])
+        self.assertEqual([tuple(v.co) for v in self.mesh.vertices], moved)
+        self.assertEqual(self.mesh_faces(), [[0, 1, 2, 3]])
+
+    def test_topology_rewrite(self):
+        verts = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+        write_mesh_data(self.mesh, verts, [], [[0, 1, 2, 3]])
+        write_mesh_data(self.mesh, verts, [], [[0, 1, 2], [0, 2, 3]])
+        self.assertEqual(self.mesh_faces(), [[0, 1, 2], [0, 2, 3]])
+        # same number of vertices and faces, other faces
+        write_mesh_data(self.mesh, verts, [], [[0, 1, 3], [1, 2, 3]])
+        self.assertEqual(self.mesh_faces(), [[0, 1, 3], [1, 2, 3]])
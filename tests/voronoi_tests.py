@@ -0,0 +1,91 @@
+import random
+import timeit
+
+import numpy as np
+
+from sverchok.utils.testing import *
+from sverchok.utils.logging import info
+from sverchok.utils.voronoi import Site, computeVoronoiDiagram, computeDelaunayTriangulation
+from sverchok.utils.sv_voronoi import delaunay_2d, voronoi_2d, voronoi_cells, next_in_polygon, to_polygons
+
+def random_points(count, seed):
+    rnd = random.Random(seed)
+    return [(rnd.uniform(-5, 5), rnd.uniform(-5, 5)) for _ in range(count)]
+
+def cell_areas(vertices, counts, loops):
+    x, y = vertices[loops, 0], vertices[loops, 1]
+    following = next_in_polygon(counts)
+    polygon = np.repeat(np.arange(len(counts)), counts)
+    return 0.5 * np.bincount(polygon, weights=x * y[following] - x[following] * y, minlength=len(counts))
+
+class VoronoiTests(SverchokTestCase):
+
+    def test_delaunay(self):
+        # same triangles as the Fortune's algorithm
+        for seed in range(5):
+            points = random_points(100, seed)
+            expected = computeDelaunayTriangulation([Site(x, y) for x, y in points])
+            triangles = delaunay_2d(points)
+            self.assertEqual(set(tuple(sorted(t)) for t in triangles.tolist()),
+                             set(tuple(sorted(t)) for t in expected if -1 not in t))
+
+    def test_voronoi_2d(self):
+        def segments(vertices, edges):
+            return set(frozenset((round(vertices[i][0], 6), round(vertices[i][1], 6)) for i in edge) for edge in edges)
+
+        for seed in range(5):
+            points = random_points(100, seed)
+            expected_vertices, _, expected_edges = computeVoronoiDiagram([Site(x, y) for x, y in points])
+            vertices, edges = voronoi_2d(points)
+            self.assertEqual(len(vertices), len(expected_vertices))
+            self.assertEqual(segments(vertices.tolist(), edges.tolist()),
+                             segments(expected_vertices, [e[1:] for e in expected_edges if -1 not in e[1:]]))
+
+    def test_cells(self):
+        points = np.array(random_points(300, 0))
+        bounds = (-6, -6, 6, 6)
+        vertices, edges, counts, loops = voronoi_cells(points, bounds)
+        self.assertEqual(len(counts), len(points))
+        # cells cover the rectangle, polygons are counterclockwise and
+        # have their point inside
+        areas = cell_areas(vertices, counts, loops)
+        self.assertTrue((areas > 0).all())
+        self.assertAlmostEqual(areas.sum(), 144, places=9)
+        for point, polygon in zip(points, to_polygons(counts, loops)):
+            a = vertices[polygon]
+            b = np.roll(a, -1, axis=0)
+            cross = (b[:, 0] - a[:, 0]) * (point[1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (point[0] - a[:, 0])
+            self.assertTrue((cross > 0).all())
+        # vertices are shared by cells
+        self.assertEqual(len(vertices) - len(edges) + len(counts), 1)
+
+    def test_degenerate(self):
+        grid = [(x, y, 0) for x in range(3) for y in range(3)]
+        vertices, edges, counts, loops = voronoi_cells(grid, (-0.5, -0.5, 2.5, 2.5))
+        self.assertEqual((len(vertices), len(edges)), (16, 24))
+        self.assertEqual(counts.tolist(), [4] * 9)
+
+        # points on one line, equal points
+        _, _, counts, _ = voronoi_cells([(0, 0), (1, 0), (2, 0)], (-1, -1, 3, 1))
+        self.assertEqual(counts.tolist(), [4, 4, 4])
+        self.assertEqual(len(delaunay_2d([(0, 0), (1, 0), (2, 0)])), 0)
+        _, _, counts, loops = voronoi_cells([(0, 0), (1, 1), (0, 0)], (-1, -1, 2, 2))
+        polygons = to_polygons(counts, loops)
+        self.assertEqual(polygons[0], polygons[2])
+        vertices, _, _, _ = voronoi_cells([(0.5, 0.5)], (0, 0, 1, 1))
+        self.assertEqual(sorted(vertices.tolist()), [[0, 0], [0, 1], [1, 0], [1, 1]])
+
+class VoronoiBenchmarks(SverchokTestCase):
+
+    @manual_only
+    def test_sites(self):
+        points = random_points(20000, 0)
+        sites = [Site(x, y) for x, y in points]
+        timings = [
+            ("computeVoronoiDiagram", min(timeit.repeat(lambda: computeVoronoiDiagram(sites), number=1, repeat=3))),
+            ("voronoi_cells", min(timeit.repeat(lambda: voronoi_cells(points, (-6, -6, 6, 6)), number=1, repeat=3))),
+        ]
+        many = np.random.rand(1000000, 2)
+        timings.append(("voronoi_cells, 1M sites", min(timeit.repeat(lambda: voronoi_cells(many, (0, 0, 1, 1)), number=1, repeat=1))))
+        for name, duration in timings:
+            info("%s: %.4f s", name, duration)
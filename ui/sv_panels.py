@@ -303,6 +303,7 @@ class SverchokToolsMenu(bpy.types.Panel):
                 row.operator("node.sverchok_profile_dump", text="Dump data", icon="TEXT")
                 row.operator("node.sverchok_profile_save", text="Save data", icon="SAVE_AS")
                 profile_col.operator("node.sverchok_profile_reset", text="Reset data", icon="X")
+            profile_col.operator("node.sverchok_update_trace_save", text="Save update trace", icon="SAVE_AS")
 
         row = layout.row(align=True)
         col = row.column(align=True)
@@ -21,6 +21,8 @@ import time
 from math import pi
 import traceback
 
+import numpy as np
+
 import bpy
 import mathutils
 from mathutils import Vector, Matrix
@@ -28,6 +30,7 @@ from mathutils.geometry import normal
 from mathutils.geometry import tessellate_polygon as tessellate
 
 from sverchok.data_structure import Vector_generate, Matrix_generate
+from sverchok.utils.sv_viewer_utils import pydata_to_arrays
 
 drawlists_3dview = {}
 callback_dict = {}
@@ -50,6 +53,17 @@ from bgl import (
     GL_NICEST, GL_FASTEST, GL_FLAT, GL_SMOOTH, GL_LINE_SMOOTH, GL_LINE_SMOOTH_HINT
 )
 
+# vertex arrays let a whole buffer go into the display list with one call,
+# drawing falls back to glVertex3f per vertex where bgl does not wrap them
+try:
+    from bgl import (
+        glEnableClientState, glDisableClientState, glVertexPointer, glColorPointer,
+        glDrawArrays, GL_VERTEX_ARRAY, GL_COLOR_ARRAY
+    )
+    HAS_CLIENT_ARRAYS = True
+except ImportError:
+    HAS_CLIENT_ARRAYS = False
+
 # ------------------------------------------------------------------------ #
 # parts taken from  "Math Vis (Console)" addon, author Campbell Barton     #
 # ------------------------------------------------------------------------ #
@@ -164,200 +178,259 @@ def callback_disable(n_id):
     tag_redraw_all_view3d()
 
 
-def get_color_from_normal(dvk, pol, num_verts, vectorlight, colo):
-    if num_verts <= 4:
-        normal_no = normal(dvk[pol[0]], dvk[pol[1]], dvk[pol[2]])
+def matrices_to_array(data_matrix):
+    """(m, 4, 4) array of matrices"""
+    return np.array([np.array(m, dtype=np.float64) for m in data_matrix]).reshape(-1, 4, 4)
+
+
+def transform_verts(verts, matrices):
+    """Vertices (n, 3) transformed by each of matrices (m, 4, 4), returns (m * n, 3)"""
+    rotations = matrices[:, :3, :3]
+    translations = matrices[:, :3, 3]
+    coords = np.matmul(verts[np.newaxis], rotations.transpose(0, 2, 1)) + translations[:, np.newaxis]
+    return coords.reshape(-1, 3)
+
+
+def polygon_normals(verts, totals, starts, loops):
+    """
+    Normals of polygons as mathutils.geometry.normal computes them when it is
+    given the first three vertices, or the first four for ngons.
+    """
+    v1 = verts[loops[starts]]
+    v2 = verts[loops[starts + 1]]
+    v3 = verts[loops[starts + 2]]
+    normals = np.cross(v1 - v2, v2 - v3)
+    ngons = totals > 4
+    if ngons.any():
+        n_starts = starts[ngons]
+        normals[ngons] = np.cross(verts[loops[n_starts]] - verts[loops[n_starts + 2]],
+                                  verts[loops[n_starts + 1]] - verts[loops[n_starts + 3]])
+    return normals
+
+
+def get_colors_from_normals(normals, vectorlight, colo):
+    """Face colors shaded by angle between polygon normal and light direction"""
+    light = np.array(vectorlight, dtype=np.float64)
+    lengths = np.linalg.norm(normals, axis=1) * np.linalg.norm(light)
+    cos = np.divide(normals.dot(light), lengths, out=np.ones(len(normals)), where=lengths > 0)
+    # zero length normal counts as angle 0, like Vector.angle(light, 0)
+    angle = np.arccos(np.clip(cos, -1.0, 1.0)) / pi
+    return angle[:, np.newaxis] * np.array(colo[:3], dtype=np.float64) + 0.1
+
+
+def polygon_triangles(verts, totals, starts, loops, forced_tessellation):
+    """
+    Triangles covering polygons as (t, 3) array of vertex indices and index
+    of polygon for each triangle. Polygons are fanned from the first vertex
+    as GL_POLYGON draws them, ngons are tessellated if forced_tessellation.
+    """
+    if forced_tessellation:
+        tessellated = totals > 4
+        fanned = np.flatnonzero(~tessellated)
     else:
-        normal_no = normal(dvk[pol[0]], dvk[pol[1]], dvk[pol[2]], dvk[pol[3]])
-
-    normal_no = (normal_no.angle(vectorlight, 0)) / pi
+        tessellated = None
+        fanned = np.arange(len(totals))
+
+    tri_counts = totals[fanned] - 2
+    tri_polygon = np.repeat(fanned, tri_counts)
+    first = np.repeat(starts[fanned], tri_counts)
+    step = np.arange(len(tri_polygon)) - np.repeat(np.cumsum(tri_counts) - tri_counts, tri_counts) + 1
+    tris = np.stack((loops[first], loops[first + step], loops[first + step + 1]), axis=1)
+
+    if tessellated is not None and tessellated.any():
+        extra_tris, extra_polygon = [], []
+        for index in np.flatnonzero(tessellated):
+            pol = loops[starts[index]:starts[index] + totals[index]]
+            v = [Vector(co) for co in verts[pol]]
+            for tri in tessellate([v]):
+                extra_tris.append(pol[list(tri)])
+                extra_polygon.append(index)
+        if extra_tris:
+            tris = np.concatenate((tris, np.array(extra_tris, dtype=tris.dtype)))
+            tri_polygon = np.concatenate((tri_polygon, np.array(extra_polygon, dtype=tri_polygon.dtype)))
+
+    return tris, tri_polygon
+
+
+def polygon_edges(totals, starts, loops):
+    """Unique edges (e, 2) of polygons, each sorted by vertex index"""
+    following = np.arange(1, len(loops) + 1)
+    following[starts + totals - 1] = starts
+    edges = np.stack((loops, loops[following]), axis=1)
+    edges.sort(axis=1)
+    if not len(edges):
+        return edges
+    return np.unique(edges, axis=0)
+
+
+def mesh_buffers(options, verts, polygons):
+    """Triangles, face colors and edges of one mesh, shared by all matrices drawing it"""
+    num_verts = len(verts)
+    _, totals, loops = pydata_to_arrays([], polygons)
+    starts = np.cumsum(totals) - totals
+    max_index = np.maximum.reduceat(loops, np.minimum(starts, max(len(loops) - 1, 0))) if len(loops) else totals
+    # skip polygons which refer to indices not present in the vertex list
+    valid = (totals >= 3) & (max_index < num_verts) & (max_index >= 0)
+    valid_loops = np.repeat(valid, totals)
+    totals, loops = totals[valid], loops[valid_loops]
+    starts = np.cumsum(totals) - totals
+
+    result = {}
+    if options['show_faces']:
+        tris, tri_polygon = polygon_triangles(verts, totals, starts, loops, options['forced_tessellation'])
+        result['tris'] = tris
+        if options['shading']:
+            normals = polygon_normals(verts, totals, starts, loops)
+            colors = get_colors_from_normals(normals, options['light_direction'], options['face_colors'])
+            result['tri_colors'] = colors[tri_polygon]
+    if options['show_edges']:
+        result['edges'] = polygon_edges(totals, starts, loops)
+    return result
+
+
+def make_draw_buffers(options, data_vector, data_polygons, data_matrix, data_edges):
+    """
+    Pack geometry drawn by the viewer into flat float32 arrays of shape (n, 3):
+    'points', 'edges' (pairs of line ends), 'faces' (triangle corners) and
+    'face_colors' (color per corner, only when shading). Every matrix draws
+    the mesh with the same index, the last mesh is repeated for extra matrices.
+    """
+    points, edges, faces, face_colors = [], [], [], []
+
+    def pack(arrays):
+        if not arrays:
+            return np.empty((0, 3), dtype=np.float32)
+        return np.concatenate(arrays).astype(np.float32)
+
+    if not data_vector:
+        return {'points': pack(points), 'edges': pack(edges),
+                'faces': pack(faces), 'face_colors': pack(face_colors)}
 
-    r = (normal_no * colo[0]) - 0.1
-    g = (normal_no * colo[1]) - 0.1
-    b = (normal_no * colo[2]) - 0.1
-    return (r+0.2, g+0.2, b+0.2)
+    verlen = options['verlen']
+    matrices = matrices_to_array(data_matrix)
+    mesh_index = np.minimum(np.arange(len(matrices)), verlen)
 
+    for k in np.unique(mesh_index):
+        k = int(k)
+        verts = np.array(data_vector[k], dtype=np.float64).reshape(-1, 3)
+        mesh_matrices = matrices[mesh_index == k]
 
-def display_face(options, pol, data_vector, data_matrix, k, i):
+        if options['show_verts']:
+            points.append(transform_verts(verts, mesh_matrices))
 
-    colo = options['face_colors']
-    shade = options['shading']
-    forced_tessellation = options['forced_tessellation']
+        if data_polygons:
+            if len(verts) < 3:
+                print("can't make faces between fewer than 3 vertices")
+                continue
+            mesh = mesh_buffers(options, verts, data_polygons[min(k, len(data_polygons) - 1)])
+            coords = transform_verts(verts, mesh_matrices).reshape(len(mesh_matrices), -1, 3)
+            if 'tris' in mesh:
+                faces.append(coords[:, mesh['tris'].ravel()].reshape(-1, 3))
+                if 'tri_colors' in mesh:
+                    corner_colors = np.repeat(mesh['tri_colors'], 3, axis=0)
+                    face_colors.append(np.tile(corner_colors, (len(mesh_matrices), 1)))
+            if 'edges' in mesh:
+                edges.append(coords[:, mesh['edges'].ravel()].reshape(-1, 3))
+
+        elif data_edges and options['show_edges'] and k < len(data_edges):
+            if len(verts) < 2:
+                print("can't make edges between fewer than 2 vertices")
+                continue
+            edges_flat = pydata_to_arrays(data_edges[k], [])[0].reshape(-1, 2)
+            # skip edges which refer to indices not present in the vertex list
+            edges_flat = edges_flat[(edges_flat.max(axis=1) < len(verts)) & (edges_flat.min(axis=1) >= 0)]
+            lines = edges_flat.ravel()
+            coords = transform_verts(verts, mesh_matrices).reshape(len(mesh_matrices), -1, 3)
+            edges.append(coords[:, lines].reshape(-1, 3))
 
-    num_verts = len(pol)
-    dvk = data_vector[k]
+    return {'points': pack(points), 'edges': pack(edges),
+            'faces': pack(faces), 'face_colors': pack(face_colors)}
 
-    if shade:
-        vectorlight = options['light_direction']
-        face_color = get_color_from_normal(dvk, pol, num_verts, vectorlight, colo)
-    else:
-        face_color = colo[:]
 
-    glColor3f(*face_color)
+def draw_array(mode, coords, colors=None):
+    """Draw coordinates (n, 3) as primitives of given mode with one draw call"""
+    count = len(coords)
+    if not count:
+        return
 
-    if (num_verts in {3, 4}) or (not forced_tessellation):
-        glBegin(GL_POLYGON)
-        for point in pol:
-            vec = data_matrix[i] * dvk[point]
-            glVertex3f(*vec)
-        glEnd()
+    if HAS_CLIENT_ARRAYS:
+        vertex_buffer = Buffer(GL_FLOAT, [count, 3], coords.tolist())
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, vertex_buffer)
+        if colors is not None:
+            color_buffer = Buffer(GL_FLOAT, [count, 3], colors.tolist())
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(3, GL_FLOAT, 0, color_buffer)
+        glDrawArrays(mode, 0, count)
+        if colors is not None:
+            glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        return
 
+    glBegin(mode)
+    if colors is None:
+        for co in coords.tolist():
+            glVertex3f(*co)
     else:
-        ''' ngons, we tessellate '''
-        glBegin(GL_TRIANGLES)
-        v = [dvk[i] for i in pol]
-        for pol in tessellate([v]):
-            for point in pol:
-                vec = data_matrix[i] * v[point]
-                glVertex3f(*vec)
-        glEnd()
+        for color, co in zip(colors.tolist(), coords.tolist()):
+            glColor3f(*color)
+            glVertex3f(*co)
+    glEnd()
 
 
-def draw_geometry(n_id, options, data_vector, data_polygons, data_matrix, data_edges):
+def draw_geometry(n_id, options, buffers, data_matrix):
+    """Draw packed buffers, data_matrix is given only to display matrices without vertices"""
 
     show_verts = options['show_verts']
     show_edges = options['show_edges']
     show_faces = options['show_faces']
 
-    vertex_colors = options['vertex_colors']
-    edge_colors = options['edge_colors']
-    edge_width = options['edge_width']
-
     tran = options['transparent']
-    shade = options['shading']
-
-    verlen = options['verlen']
-    max_verts_ = [len(d) for d in data_vector]
 
     if tran:
         polyholy = GL_POLYGON_STIPPLE
         edgeholy = GL_LINE_STIPPLE
-        edgeline = GL_LINE_STRIP
     else:
         polyholy = GL_POLYGON
         edgeholy = GL_LINE
-        edgeline = GL_LINES
-
-    def get_max_k(i, verlen):
-        k = i
-        if i > verlen:
-            k = verlen
-        return k
 
     ''' vertices '''
 
     glEnable(GL_POINT_SIZE)
     glEnable(GL_POINT_SMOOTH)
     glHint(GL_POINT_SMOOTH_HINT, GL_NICEST)
-    # glHint(GL_POINT_SMOOTH_HINT, GL_FASTEST)
-
-    vsize = options['vertex_size']
-
-    if show_verts and data_vector:
-
-        glPointSize(vsize)
-        glColor3f(*vertex_colors)
-        glBegin(GL_POINTS)
 
-        for i, matrix in enumerate(data_matrix):
-            k = get_max_k(i, verlen)
-            for vert in data_vector[k]:
-                vec = data_matrix[i] * vert
-                glVertex3f(*vec)
-
-        glEnd()
+    if show_verts:
+        glPointSize(options['vertex_size'])
+        glColor3f(*options['vertex_colors'])
+        draw_array(GL_POINTS, buffers['points'])
 
     glDisable(GL_POINT_SIZE)
     glDisable(GL_POINT_SMOOTH)
 
     ''' polygons '''
 
-    if data_polygons and data_vector:
-        num_datapolygon_lists = len(data_polygons)
-
+    if show_faces and len(buffers['faces']):
         glEnable(polyholy)
-        for i, matrix in enumerate(data_matrix):
-
-            k = get_max_k(i, verlen)
-            mesh_edges = set()
-            if k >= num_datapolygon_lists:
-                k = (num_datapolygon_lists-1)
-                #break
-
-            if len(data_vector[k]) < 3:
-                print("can't make faces between fewer than 3 vertices")
-                continue
-
-            for j, pol in enumerate(data_polygons[k]):
-
-                if max(pol) >= max_verts_[k]:
-                    continue
-
-                if show_faces:
-                    display_face(options, pol, data_vector, data_matrix, k, i)
-
-                # collect raw edges, sort by index, use set to prevent dupes.
-                if show_edges:
-                    er = list(pol) + [pol[0]]
-                    kb = {tuple(sorted((e, er[i+1]))) for i, e in enumerate(er[:-1])}
-                    mesh_edges.update(kb)
-
-            if show_edges and mesh_edges:
-                # glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
-                glEnable(edgeholy)
-                glLineWidth(edge_width)
-                glColor3f(*edge_colors)
-                glBegin(GL_LINES)
-                for edge in mesh_edges:
-                    for p in edge:
-                        vec = data_matrix[i] * data_vector[k][p]
-                        glVertex3f(*vec)
-
-                glEnd()
-                glDisable(edgeholy)
-
+        if len(buffers['face_colors']):
+            draw_array(GL_TRIANGLES, buffers['faces'], buffers['face_colors'])
+        else:
+            glColor3f(*options['face_colors'][:3])
+            draw_array(GL_TRIANGLES, buffers['faces'])
         glDisable(polyholy)
 
     ''' edges '''
 
-    if data_edges and data_vector and show_edges:
-
-
-        glColor3f(*edge_colors)
-        glLineWidth(edge_width)
-        # glEnable(GL_LINE_SMOOTH)
+    if show_edges and len(buffers['edges']):
         glEnable(edgeholy)
-        # glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
-
-        for i, matrix in enumerate(data_matrix):
-            k = get_max_k(i, verlen)
-
-            if k >= len(data_edges):
-                continue
-
-            if len(data_vector[k]) < 2:
-                print("can't make edges between fewer than 2 vertices")
-                continue
-
-            for line in data_edges[k]:
-
-                # i think this catches edges which refer to indices not present in
-                # the accompanying vertex list.
-                if max(line) >= max_verts_[k]:
-                    continue
-
-                glBegin(edgeline)
-                for p in line:
-                    vec = data_matrix[i] * data_vector[k][p]
-                    glVertex3f(*vec)
-                glEnd()
-
+        glLineWidth(options['edge_width'])
+        glColor3f(*options['edge_colors'])
+        draw_array(GL_LINES, buffers['edges'])
         glDisable(edgeholy)
-        # glDisable(GL_LINE_SMOOTH)
 
     ''' matrix '''
 
-    if data_matrix and not data_vector:
+    if data_matrix:
         md = MatrixDraw()
         for mat in data_matrix:
             md.draw_matrix(mat)
@@ -365,13 +438,6 @@ def draw_geometry(n_id, options, data_vector, data_polygons, data_matrix, data_e
 
 def draw_callback_view(n_id, cached_view, options):
 
-    def Vector_generate2(prop):
-        # try:
-        #     return [[Vector(v[:3]) for v in obj] for obj in prop]
-        # except ValueEror:
-        #     return []
-        return [[Vector(v) for v in obj] for obj in prop]
-
     # context = bpy.context
     if options["timings"]:
         start = time.perf_counter()
@@ -383,8 +449,7 @@ def draw_callback_view(n_id, cached_view, options):
         sl3 = cached_view[n_id + 'm']
 
         if sl1:
-            data_vector = Vector_generate2(sl1)
-            verlen = len(data_vector)-1
+            verlen = len(sl1)-1
         else:
             if not sl3:
                 # end early: no matrix and no vertices
@@ -392,7 +457,6 @@ def draw_callback_view(n_id, cached_view, options):
                 return
 
             # display matrix repr only.
-            data_vector = []
             verlen = 0
 
         options['verlen'] = verlen
@@ -415,9 +479,6 @@ def draw_callback_view(n_id, cached_view, options):
         else:
             data_matrix = [Matrix() for i in range(verlen+1)]
 
-        if (data_vector, data_polygons, data_matrix, data_edges) == (0, 0, 0, 0):
-            return
-
         try:
             existing_list = drawlists_3dview.get(n_id)
             if existing_list:
@@ -427,7 +488,8 @@ def draw_callback_view(n_id, cached_view, options):
                 drawlists_3dview[n_id] = the_display_list
 
             glNewList(the_display_list, GL_COMPILE)
-            draw_geometry(n_id, options, data_vector, data_polygons, data_matrix, data_edges)
+            buffers = make_draw_buffers(options, sl1, data_polygons, data_matrix, data_edges)
+            draw_geometry(n_id, options, buffers, [] if sl1 else data_matrix)
         except Exception as err:
             print("Error in callback!:")
             traceback.print_exc()
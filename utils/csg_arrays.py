@@ -0,0 +1,509 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+CSG booleans on polygons stored in numpy arrays.
+
+This is the BSP algorithm of csg_core / csg_geom (Evan Wallace's csg.js),
+with polygons kept as indices into one array of points instead of
+objects per vertex. A BSP node classifies all polygons it gets against
+its plane at once, only polygons spanning the plane are split one by one.
+Arithmetic is done in the same order as in csg_geom, so results are the
+same polygons, to the last bit, as CSG gives.
+
+With cull=True polygons which can't touch the other mesh (no bounding box
+of its polygons overlaps theirs) are not clipped, one point of them tells
+if they are inside or outside the other solid, and the resulting trees
+are not merged. The surface is the same, polygons are split less.
+"""
+
+import math
+
+import numpy as np
+
+# same tolerance as CSGPlane
+EPSILON = 1e-5
+
+COPLANAR = 0
+FRONT = 1
+BACK = 2
+SPANNING = 3
+
+# state of polygon in cull mode
+NEAR = -1
+OUTSIDE = 0
+INSIDE = 1
+
+
+class GrowArray(object):
+    """Array with amortized appends, view() gives the used part"""
+
+    def __init__(self, dtype, width=None, capacity=256):
+        shape = (capacity,) if width is None else (capacity, width)
+        self.data = np.empty(shape, dtype=dtype)
+        self.size = 0
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        end = self.size + len(values)
+        if end > len(self.data):
+            data = np.empty((max(end, 2 * len(self.data)),) + self.data.shape[1:], dtype=self.data.dtype)
+            data[:self.size] = self.data[:self.size]
+            self.data = data
+        self.data[self.size:end] = values
+        self.size = end
+
+    def view(self):
+        return self.data[:self.size]
+
+
+def ranges(starts, counts):
+    """Indices start, start+1 .. start+count-1 of all ranges, concatenated"""
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+
+def plane_from_points(a, b, c):
+    """CSGPlane.fromPoints with python floats, same operations in same order"""
+    ux, uy, uz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+    vx, vy, vz = c[0] - a[0], c[1] - a[1], c[2] - a[2]
+    nx = uy * vz - uz * vy
+    ny = uz * vx - ux * vz
+    nz = ux * vy - uy * vx
+    length = math.sqrt(nx * nx + ny * ny + nz * nz)
+    nx, ny, nz = nx / length, ny / length, nz / length
+    return (nx, ny, nz), nx * a[0] + ny * a[1] + nz * a[2]
+
+
+class PolygonStore(object):
+    """
+    Polygons of both meshes and their fragments: loops index points,
+    polygon i uses loops start[i] .. start[i]+count[i], its plane is
+    normal[i], w[i]. Polygon ids are never reused, flipping is in place.
+    """
+
+    def __init__(self):
+        self.points = GrowArray(np.float64, 3)
+        self.loops = GrowArray(np.int64)
+        self.start = GrowArray(np.int64)
+        self.count = GrowArray(np.int64)
+        self.normal = GrowArray(np.float64, 3)
+        self.w = GrowArray(np.float64)
+        self.state = GrowArray(np.int8)
+
+    def add_mesh(self, verts, faces):
+        """Add polygons of mesh, returns their ids"""
+        if not len(faces):
+            return np.zeros(0, dtype=np.int64)
+        counts = np.array([len(f) for f in faces], dtype=np.int64)
+        if counts.min() < 3:
+            raise ValueError("CSG needs polygons of at least 3 vertices")
+        loops = np.fromiter((i for f in faces for i in f), dtype=np.int64, count=counts.sum())
+        first_point = self.points.size
+        self.points.extend(np.asarray(verts, dtype=np.float64).reshape(-1, 3))
+        loops += first_point
+
+        first_loop = self.loops.size
+        starts = np.cumsum(counts) - counts + first_loop
+        self.loops.extend(loops)
+
+        # CSGPlane.fromPoints for all polygons, element-wise numpy
+        # operations round the same way as python floats
+        points = self.points.view()
+        a, b, c = (points[self.loops.view()[starts + k]] for k in range(3))
+        u, v = b - a, c - a
+        n = np.empty_like(u)
+        n[:, 0] = u[:, 1] * v[:, 2] - u[:, 2] * v[:, 1]
+        n[:, 1] = u[:, 2] * v[:, 0] - u[:, 0] * v[:, 2]
+        n[:, 2] = u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]
+        length = np.sqrt(n[:, 0] * n[:, 0] + n[:, 1] * n[:, 1] + n[:, 2] * n[:, 2])
+        if not length.all():
+            raise ZeroDivisionError("CSG polygon without area")
+        n /= length[:, np.newaxis]
+        w = n[:, 0] * a[:, 0] + n[:, 1] * a[:, 1] + n[:, 2] * a[:, 2]
+        return self.add_polygons(starts, counts, n, w, np.full(len(counts), NEAR))
+
+    def add_polygons(self, starts, counts, normals, ws, states):
+        first = self.start.size
+        self.start.extend(starts)
+        self.count.extend(counts)
+        self.normal.extend(normals)
+        self.w.extend(ws)
+        self.state.extend(states)
+        return np.arange(first, self.start.size)
+
+    def loop_points(self, ids):
+        """Points of all loops of polygons, and offsets of polygons in them"""
+        counts = self.count.view()[ids]
+        loops = self.loops.view()[ranges(self.start.view()[ids], counts)]
+        return self.points.view()[loops], np.cumsum(counts) - counts
+
+    def flip(self, ids):
+        """CSGPolygon.flip for polygons ids"""
+        if not len(ids):
+            return
+        starts = self.start.view()[ids]
+        counts = self.count.view()[ids]
+        positions = ranges(starts, counts)
+        mirrored = np.repeat(2 * starts + counts - 1, counts) - positions
+        loops = self.loops.view()
+        loops[positions] = loops[mirrored]
+        self.normal.view()[ids] *= -1
+        self.w.view()[ids] *= -1
+
+    def split(self, plane, ids):
+        """
+        CSGPlane.splitPolygon for polygons ids. Returns arrays along ids:
+        front and back polygon of each one (-1 if none) and whether it's
+        coplanar, then front or back tells its orientation.
+        """
+        (nx, ny, nz), w = plane
+        p, offsets = self.loop_points(ids)
+        t = nx * p[:, 0] + ny * p[:, 1] + nz * p[:, 2] - w
+        types = np.where(t < -EPSILON, BACK, np.where(t > EPSILON, FRONT, COPLANAR)).astype(np.int8)
+        polygon_types = np.bitwise_or.reduceat(types, offsets)
+
+        front = np.where(polygon_types == FRONT, ids, -1)
+        back = np.where(polygon_types == BACK, ids, -1)
+        coplanar = polygon_types == COPLANAR
+        if coplanar.any():
+            normals = self.normal.view()[ids[coplanar]]
+            facing = nx * normals[:, 0] + ny * normals[:, 1] + nz * normals[:, 2] > 0
+            front[coplanar] = np.where(facing, ids[coplanar], -1)
+            back[coplanar] = np.where(facing, -1, ids[coplanar])
+
+        spanning = np.flatnonzero(polygon_types == SPANNING)
+        if len(spanning):
+            self.split_spanning(plane, ids, spanning, types, offsets, front, back)
+        return front, back, coplanar
+
+    def split_spanning(self, plane, ids, spanning, types, offsets, front, back):
+        (nx, ny, nz), w = plane
+        counts = self.count.view()[ids]
+        starts = self.start.view()[ids]
+        loops = self.loops.view()
+        points = self.points.view()
+        states = self.state.view()
+        next_point = self.points.size
+        new_points = []
+        new_loops = []
+        new_polygons = []
+
+        def add_polygon(vertices, positions, state):
+            plane = plane_from_points(*positions[:3])
+            new_polygons.append((len(vertices), plane, state))
+            new_loops.extend(vertices)
+
+        for k in spanning.tolist():
+            offset, count = offsets[k], counts[k]
+            vertex_ids = loops[starts[k]:starts[k] + count].tolist()
+            positions = points[vertex_ids].tolist()
+            vertex_types = types[offset:offset + count].tolist()
+            f, f_pos, b, b_pos = [], [], [], []
+            for i in range(count):
+                j = (i + 1) % count
+                ti, tj = vertex_types[i], vertex_types[j]
+                vi, pi = vertex_ids[i], positions[i]
+                if ti != BACK:
+                    f.append(vi)
+                    f_pos.append(pi)
+                if ti != FRONT:
+                    b.append(vi)
+                    b_pos.append(pi)
+                if (ti | tj) == SPANNING:
+                    pj = positions[j]
+                    dx, dy, dz = pj[0] - pi[0], pj[1] - pi[1], pj[2] - pi[2]
+                    t = (w - (nx * pi[0] + ny * pi[1] + nz * pi[2])) / (nx * dx + ny * dy + nz * dz)
+                    v = [pi[0] + dx * t, pi[1] + dy * t, pi[2] + dz * t]
+                    new_points.append(v)
+                    f.append(next_point)
+                    f_pos.append(v)
+                    b.append(next_point)
+                    b_pos.append(v)
+                    next_point += 1
+            # fragments are near or far as the polygon they come from
+            state = states[ids[k]]
+            if len(f) >= 3:
+                front[k] = -2 - len(new_polygons)
+                add_polygon(f, f_pos, state)
+            if len(b) >= 3:
+                back[k] = -2 - len(new_polygons)
+                add_polygon(b, b_pos, state)
+
+        if new_points:
+            self.points.extend(new_points)
+        if not new_polygons:
+            return
+        counts = np.array([count for count, _, _ in new_polygons], dtype=np.int64)
+        first_loop = self.loops.size
+        self.loops.extend(new_loops)
+        new_ids = self.add_polygons(
+            np.cumsum(counts) - counts + first_loop, counts,
+            [normal for _, (normal, _), _ in new_polygons],
+            [w for _, (_, w), _ in new_polygons],
+            [state for _, _, state in new_polygons])
+        # placeholders -2, -3 .. are indices of new polygons
+        for items in (front, back):
+            new = items < -1
+            items[new] = new_ids[-2 - items[new]]
+
+    def bounds(self, ids):
+        p, offsets = self.loop_points(ids)
+        return np.minimum.reduceat(p, offsets), np.maximum.reduceat(p, offsets)
+
+    def centers(self, ids):
+        p, offsets = self.loop_points(ids)
+        return np.add.reduceat(p, offsets) / self.count.view()[ids][:, np.newaxis]
+
+
+class BSPNode(object):
+    """CSGNode with polygons as array of polygon ids"""
+
+    __slots__ = ('plane', 'front', 'back', 'polygons', 'inverted')
+
+    def __init__(self):
+        self.plane = None
+        self.front = None
+        self.back = None
+        self.polygons = np.zeros(0, dtype=np.int64)
+        # solid of the tree is inverted, kept by the root only
+        self.inverted = False
+
+    def nodes(self):
+        """All nodes of tree, in the order of allPolygons"""
+        out = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            out.append(node)
+            if node.back:
+                stack.append(node.back)
+            if node.front:
+                stack.append(node.front)
+        return out
+
+    def all_polygons(self):
+        nodes = self.nodes()
+        if len(nodes) == 1:
+            return self.polygons
+        return np.concatenate([node.polygons for node in nodes])
+
+    def invert(self, store):
+        nodes = self.nodes()
+        store.flip(np.concatenate([node.polygons for node in nodes]))
+        for node in nodes:
+            if node.plane:
+                (nx, ny, nz), w = node.plane
+                node.plane = (-nx, -ny, -nz), -w
+            node.front, node.back = node.back, node.front
+        self.inverted = not self.inverted
+
+    def build(self, store, polygons):
+        if not len(polygons):
+            return
+        stack = [(self, polygons)]
+        while stack:
+            node, polygons = stack.pop()
+            if node.plane is None:
+                first = polygons[0]
+                node.plane = tuple(store.normal.view()[first].tolist()), float(store.w.view()[first])
+            front, back, coplanar = store.split(node.plane, polygons)
+            node.polygons = np.concatenate((node.polygons, polygons[coplanar]))
+            front = front[(front >= 0) & ~coplanar]
+            back = back[(back >= 0) & ~coplanar]
+            if len(back):
+                if node.back is None:
+                    node.back = BSPNode()
+                stack.append((node.back, back))
+            if len(front):
+                if node.front is None:
+                    node.front = BSPNode()
+                stack.append((node.front, front))
+
+    def clip_polygons(self, store, polygons, labels):
+        """
+        CSGNode.clipPolygons, labels go along with polygons and their
+        fragments. Returns polygons left and their labels, in order.
+        """
+        if self.plane is None or not len(polygons):
+            return polygons, labels
+        out = []
+        stack = [(self, polygons, labels)]
+        while stack:
+            node, polygons, labels = stack.pop()
+            if node is None:
+                out.append((polygons, labels))
+                continue
+            front, back, _ = store.split(node.plane, polygons)
+            in_back = back >= 0
+            if node.back and in_back.any():
+                stack.append((node.back, back[in_back], labels[in_back]))
+            in_front = front >= 0
+            if in_front.any():
+                stack.append((node.front, front[in_front], labels[in_front]))
+        if not out:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate([p for p, _ in out]), np.concatenate([l for _, l in out])
+
+    def clip_to(self, store, bsp):
+        """
+        CSGNode.clipTo, polygons of all nodes are clipped together.
+        Polygons far from the other mesh (cull mode) are kept or removed
+        by their state only.
+        """
+        nodes = self.nodes()
+        polygons = np.concatenate([node.polygons for node in nodes])
+        labels = np.repeat(np.arange(len(nodes)), [len(node.polygons) for node in nodes])
+        states = store.state.view()[polygons]
+        near = states == NEAR
+        kept_polygons, kept_labels = bsp.clip_polygons(store, polygons[near], labels[near])
+        if not near.all():
+            # far polygons inside the (maybe inverted) solid of bsp go
+            inside = states == (OUTSIDE if bsp.inverted else INSIDE)
+            far = ~near & ~inside
+            kept_polygons = np.concatenate((kept_polygons, polygons[far]))
+            kept_labels = np.concatenate((kept_labels, labels[far]))
+        order = np.argsort(kept_labels, kind='stable')
+        kept_polygons = kept_polygons[order]
+        ends = np.searchsorted(kept_labels[order], np.arange(len(nodes)), side='right')
+        for node, start, end in zip(nodes, np.concatenate(([0], ends[:-1])), ends):
+            node.polygons = kept_polygons[start:end]
+
+    def point_inside(self, points):
+        """Which points are inside the solid of the tree, for points away from its polygons"""
+        inside = np.zeros(len(points), dtype=bool)
+        if self.plane is None:
+            return inside
+        stack = [(self, np.arange(len(points)))]
+        while stack:
+            node, indices = stack.pop()
+            (nx, ny, nz), w = node.plane
+            p = points[indices]
+            t = nx * p[:, 0] + ny * p[:, 1] + nz * p[:, 2] - w
+            behind = t < -EPSILON
+            for child, selected, is_inside in ((node.front, indices[~behind], False),
+                                               (node.back, indices[behind], True)):
+                if not len(selected):
+                    continue
+                if child is None:
+                    inside[selected] = is_inside
+                else:
+                    stack.append((child, selected))
+        return inside
+
+
+def overlapping(min_a, max_a, min_b, max_b, margin, chunk=256):
+    """
+    Which boxes a overlap any box b, sweep along x: boxes a sorted by
+    x are tested in chunks against boxes b in the x range of the chunk
+    """
+    result = np.zeros(len(min_a), dtype=bool)
+    if not len(min_a) or not len(min_b):
+        return result
+    min_b = min_b - margin
+    max_b = max_b + margin
+    order = np.argsort(min_a[:, 0], kind='stable')
+    for start in range(0, len(order), chunk):
+        indices = order[start:start + chunk]
+        lo, hi = min_a[indices], max_a[indices]
+        candidates = np.flatnonzero((min_b[:, 0] <= hi[:, 0].max()) & (max_b[:, 0] >= lo[:, 0].min()))
+        if not len(candidates):
+            continue
+        c_min, c_max = min_b[candidates], max_b[candidates]
+        hits = ((lo[:, np.newaxis, :] <= c_max[np.newaxis]) & (hi[:, np.newaxis, :] >= c_min[np.newaxis])).all(axis=2)
+        result[indices] = hits.any(axis=1)
+    return result
+
+
+def mark_far_polygons(store, ids_a, ids_b, tree_a, tree_b):
+    """State of polygons: NEAR if they may touch the other mesh, else INSIDE or OUTSIDE of it"""
+    min_a, max_a = store.bounds(ids_a)
+    min_b, max_b = store.bounds(ids_b)
+    points = store.points.view()
+    extent = points.max(axis=0) - points.min(axis=0) if len(points) else np.zeros(3)
+    margin = 10 * EPSILON + 1e-9 * extent.max()
+    states = store.state.view()
+    for ids, lo, hi, other_lo, other_hi, other_tree in ((ids_a, min_a, max_a, min_b, max_b, tree_b),
+                                                        (ids_b, min_b, max_b, min_a, max_a, tree_a)):
+        far = ~overlapping(lo, hi, other_lo, other_hi, margin)
+        far_ids = ids[far]
+        if len(far_ids):
+            inside = other_tree.point_inside(store.centers(far_ids))
+            states[far_ids] = np.where(inside, INSIDE, OUTSIDE)
+
+
+def weld_polygons(store, ids):
+    """Vertices and faces of polygons, equal points are one vertex, in order of first use"""
+    p, offsets = store.loop_points(ids)
+    weld = {}
+    indices = [weld.setdefault(point, len(weld)) for point in map(tuple, p.tolist())]
+    ends = np.append(offsets[1:], len(indices)).tolist()
+    faces = [indices[start:end] for start, end in zip(offsets.tolist(), ends)]
+    return [[list(point) for point in weld], faces]
+
+
+def boolean(verts_a, faces_a, verts_b, faces_b, operation, cull=False):
+    """
+    Boolean of two meshes, operation is 'ITX' (intersect), 'JOIN' (union)
+    or 'DIFF' (a minus b). Returns [vertices, faces] as lists.
+    """
+    store = PolygonStore()
+    ids_a = store.add_mesh(verts_a, faces_a)
+    ids_b = store.add_mesh(verts_b, faces_b)
+    a = BSPNode()
+    a.build(store, ids_a)
+    b = BSPNode()
+    b.build(store, ids_b)
+    if cull:
+        mark_far_polygons(store, ids_a, ids_b, a, b)
+
+    def merge():
+        # fragments of b go into tree of a, cull mode skips splitting them
+        if cull:
+            a.polygons = np.concatenate((a.polygons, b.all_polygons()))
+        else:
+            a.build(store, b.all_polygons())
+
+    if operation == 'JOIN':
+        a.clip_to(store, b)
+        b.clip_to(store, a)
+        b.invert(store)
+        b.clip_to(store, a)
+        b.invert(store)
+        merge()
+    elif operation == 'DIFF':
+        a.invert(store)
+        a.clip_to(store, b)
+        b.clip_to(store, a)
+        b.invert(store)
+        b.clip_to(store, a)
+        b.invert(store)
+        merge()
+        a.invert(store)
+    elif operation == 'ITX':
+        a.invert(store)
+        b.clip_to(store, a)
+        b.invert(store)
+        a.clip_to(store, b)
+        b.clip_to(store, a)
+        merge()
+        a.invert(store)
+    else:
+        raise ValueError("Unknown boolean operation: {}".format(operation))
+
+    return weld_polygons(store, a.all_polygons())
@@ -24,7 +24,7 @@ from functools import reduce
 
 
 def create_list(x, y):
-    if type(y) in [list, tuple]:
+    if isinstance(y, (list, tuple)):
         return reduce(create_list, y, x)
     else:
         return x.append(y) or x
@@ -38,11 +38,11 @@ def preobrazovatel(list_a, levels, level2=1):
     level = levels[0]
 
     if level > level2:
-        if type(list_a)in [list, tuple]:
+        if isinstance(list_a, (list, tuple)):
             for l in list_a:
-                if type(l) in [list, tuple]:
+                if isinstance(l, (list, tuple)):
                     tmp = preobrazovatel(l, levels, level2+1)
-                    if type(tmp) in [list, tuple]:
+                    if isinstance(tmp, (list, tuple)):
                         list_tmp.extend(tmp)
                     else:
                         list_tmp.append(tmp)
@@ -50,7 +50,7 @@ def preobrazovatel(list_a, levels, level2=1):
                     list_tmp.append(l)
 
     elif level == level2:
-        if type(list_a) in [list, tuple]:
+        if isinstance(list_a, (list, tuple)):
             for l in list_a:
                 if len(levels) == 1:
                     tmp = preobrazovatel(l, levels, level2+1)
@@ -59,7 +59,7 @@ def preobrazovatel(list_a, levels, level2=1):
                 list_tmp.append(tmp if tmp else l)
 
     else:
-        if type(list_a) in [list, tuple]:
+        if isinstance(list_a, (list, tuple)):
             list_tmp = reduce(create_list, list_a, [])
 
     return list_tmp
@@ -67,11 +67,11 @@ def preobrazovatel(list_a, levels, level2=1):
 
 def myZip(list_all, level, level2=0):
     if level == level2:
-        if type(list_all) in [list, tuple]:
+        if isinstance(list_all, (list, tuple)):
             list_lens = []
             list_res = []
             for l in list_all:
-                if type(l) in [list, tuple]:
+                if isinstance(l, (list, tuple)):
                     list_lens.append(len(l))
                 else:
                     list_lens.append(0)
@@ -88,14 +88,14 @@ def myZip(list_all, level, level2=0):
         else:
             return False
     elif level > level2:
-        if type(list_all) in [list, tuple]:
+        if isinstance(list_all, (list, tuple)):
             list_res = []
             list_tr = myZip(list_all, level, level2+1)
             if list_tr is False:
                 list_tr = list_all
             t = []
             for tr in list_tr:
-                if type(list_tr) in [list, tuple]:
+                if isinstance(list_tr, (list, tuple)):
                     list_tl = myZip(tr, level, level2+1)
                     if list_tl is False:
                         list_tl = list_tr
@@ -116,7 +116,7 @@ def myZip_2(list_all, level, level2=1):
         def subDown(list_a, level):
             list_b = []
             for l2 in list_a:
-                if type(l2) in [list, tuple]:
+                if isinstance(l2, (list, tuple)):
                     list_b.extend(l2)
                 else:
                     list_b.append(l2)
@@ -125,7 +125,7 @@ def myZip_2(list_all, level, level2=1):
             return list_b
 
         list_tmp = []
-        if type(list_all) in [list, tuple]:
+        if isinstance(list_all, (list, tuple)):
             for l in list_all:
                 list_b = subDown(l, level-1)
                 list_tmp.append(list_b)
@@ -141,7 +141,7 @@ def myZip_2(list_all, level, level2=1):
     l_min = []
 
     for el in list_tmp:
-        if type(el) not in [list, tuple]:
+        if not isinstance(el, (list, tuple)):
             break
 
         l_min.append(len(el))
@@ -165,9 +165,9 @@ def joiner(list_all, level, level2=1):
     list_tmp = []
 
     if level > level2:
-        if type(list_all) in [list, tuple]:
+        if isinstance(list_all, (list, tuple)):
             for list_a in list_all:
-                if type(list_a) in [list, tuple]:
+                if isinstance(list_a, (list, tuple)):
                     list_tmp.extend(list_a)
                 else:
                     list_tmp.append(list_a)
@@ -178,9 +178,9 @@ def joiner(list_all, level, level2=1):
         list_tmp = [list_res]
 
     if level == level2:
-        if type(list_all) in [list, tuple]:
+        if isinstance(list_all, (list, tuple)):
             for list_a in list_all:
-                if type(list_a) in [list, tuple]:
+                if isinstance(list_a, (list, tuple)):
                     list_tmp.extend(list_a)
                 else:
                     list_tmp.append(list_a)
@@ -188,7 +188,7 @@ def joiner(list_all, level, level2=1):
             list_tmp.append(list_all)
 
     if level < level2:
-        if type(list_all) in [list, tuple]:
+        if isinstance(list_all, (list, tuple)):
             for l in list_all:
                 list_tmp.append(l)
         else:
@@ -218,7 +218,7 @@ def wrapper_2(l_etalon, list_a, level):
 
     def subWrap_2(l_etalon, len_l, level):
         len_r = len_l
-        if type(l_etalon) in [list, tuple]:
+        if isinstance(l_etalon, (list, tuple)):
             len_r = len(l_etalon) * len_l
             if level > 1:
                 len_r = subWrap_2(l_etalon[0], len_r, level-1)
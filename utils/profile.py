@@ -18,6 +18,7 @@
 
 import cProfile
 import pstats
+import time
 from io import StringIO
 
 import bpy
@@ -25,6 +26,7 @@ from bpy.props import BoolProperty, EnumProperty
 
 from sverchok.utils.logging import info, debug
 from sverchok.utils.context_managers import sv_preferences
+from sverchok.core import instrumentation
 
 # Global cProfile.Profile singleton
 _global_profile = None
@@ -83,6 +85,9 @@ def profile(function = None, section = "MANUAL"):
     conditions are met:
     * profiling for specified section is enabled in settings (profile_mode option),
     * profiling is currently active.
+
+    Profiled calls are also recorded as spans of the update trace,
+    see core/instrumentation.py.
     """
 
     def profiling_decorator(func):
@@ -94,7 +99,9 @@ def profile(function = None, section = "MANUAL"):
                 _profile_nesting += 1
                 if _profile_nesting == 1:
                     profile.enable()
+                start = time.perf_counter()
                 result = func(*args, **kwargs)
+                instrumentation.record_span(func.__name__, section, start, time.perf_counter() - start)
                 _profile_nesting -= 1
                 if _profile_nesting == 0:
                     profile.disable()
@@ -161,6 +168,7 @@ class SvProfilingToggle(bpy.types.Operator):
         global is_currently_enabled
 
         is_currently_enabled = not is_currently_enabled
+        instrumentation.set_tracing(is_currently_enabled)
         info("Profiling is set to %s", is_currently_enabled)
 
         return {'FINISHED'}
@@ -223,7 +231,25 @@ class SvProfileReset(bpy.types.Operator):
         info("Profiling statistics data cleared.")
         return {'FINISHED'}
     
-classes = [SvProfilingToggle, SvProfileDump, SvProfileSave, SvProfileReset]
+class SvUpdateTraceSave(bpy.types.Operator):
+    """Save timings of recent node updates to file in Chrome trace format"""
+    bl_idname = "node.sverchok_update_trace_save"
+    bl_label = "Save update trace"
+    bl_options = {'INTERNAL'}
+
+    filepath = bpy.props.StringProperty(subtype="FILE_PATH")
+
+    def execute(self, context):
+        instrumentation.export_chrome_trace(self.filepath)
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "sverchok_trace.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+classes = [SvProfilingToggle, SvProfileDump, SvProfileSave, SvProfileReset, SvUpdateTraceSave]
 
 def register():
     for class_name in classes:
@@ -86,7 +86,8 @@ def parse_sockets(node):
     snlite_info = {
         'inputs': [], 'outputs': [], 
         'snlite_ui': [], 'includes': {},
-        'custom_enum': [], 'callbacks': {}
+        'custom_enum': [], 'callbacks': {},
+        'vectorized': False
     }
 
     quotes = 0
@@ -123,6 +124,10 @@ def parse_sockets(node):
         elif L in {'fh', 'filehandler'}:
             snlite_info['display_file_handler'] = True
 
+        elif L in {'vectorized', 'vectorised'}:
+            # linked inputs are passed as numpy arrays, one per object
+            snlite_info['vectorized'] = True
+
         # elif L.startswith('cb '):
         #     cb_name = L[3:].strip()
         #     snlite_info['callbacks'].append(cb_name)
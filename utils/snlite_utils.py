@@ -17,10 +17,17 @@
 # ##### END GPL LICENSE BLOCK #####
 
 
+from collections import OrderedDict
+
 import bpy
 
 from sverchok.data_structure import match_long_repeat
 
+# number of compiled scripts to keep
+MAX_SCRIPTS = 64
+
+_compiled_scripts = OrderedDict()
+
 
 def get_valid_node(mat_name, node_name, bl_idname):
 
@@ -61,6 +68,23 @@ def get_valid_evaluate_function(mat_name, node_name):
     return curve.evaluate
 
 
+def compile_script(script_str, filename='<snlite>'):
+    """
+    Code object of script, compiled once and reused while the text is the same,
+    nodes showing the same script share it
+    """
+    key = (filename, script_str)
+    code = _compiled_scripts.get(key)
+    if code is None:
+        code = compile(script_str, filename, 'exec')
+        _compiled_scripts[key] = code
+        while len(_compiled_scripts) > MAX_SCRIPTS:
+            _compiled_scripts.popitem(last=False)
+    else:
+        _compiled_scripts.move_to_end(key)
+    return code
+
+
 def vectorize(all_data):
 
     def listify(data):
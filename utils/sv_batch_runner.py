@@ -0,0 +1,253 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Headless batch evaluation of a Sverchok tree.
+
+Loads a JSON layout (as exported by the IO panel), evaluates it once for
+every parameter set and saves data of selected output sockets to disk.
+
+    $ blender -b --addons sverchok --python utils/sv_batch_runner.py -- \\
+          layout.json --params params.json --outputs "Box:Vers" "Box:Pols" \\
+          --out-dir results --workers 4
+
+params.json is a list of parameter sets, each one maps node names to
+properties to override:
+
+    [{"Box": {"Divx": 2}, "Move": {"mult_": 0.5}},
+     {"Box": {"Divx": 4}}]
+
+Every run gets a run_NNNN directory with an .npy file per output socket
+(.json if data is not rectangular) and result.json with parameters,
+errors and timing; summary.json in out-dir lists all runs. With --workers
+the runs are spread over that many background Blender processes.
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import bpy
+
+from sverchok import data_structure
+from sverchok.core.socket_data import get_output_socket_data, SvNoDataError
+from sverchok.core.update_system import process_tree
+from sverchok.utils.sv_IO_panel_tools import import_tree
+from sverchok.utils.logging import info, error, exception
+
+# node linked to requested outputs, many nodes don't output to unlinked sockets
+OUTPUT_NODE_BL_IDNAME = "NoteNode"
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Evaluate Sverchok tree for a list of parameter sets")
+    parser.add_argument("layout", help="JSON or zip layout exported by Sverchok")
+    parser.add_argument("--params", help="JSON file with list of parameter sets, evaluated once if not given")
+    parser.add_argument("--outputs", nargs="+", default=[], metavar="NODE:SOCKET",
+                        help="Output sockets to save")
+    parser.add_argument("--out-dir", default="sverchok_batch", help="Directory for results")
+    parser.add_argument("--workers", type=int, default=1, help="Number of Blender processes")
+    parser.add_argument("--worker-index", type=int, default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def script_args():
+    """Arguments after -- on Blender command line"""
+    if "--" in sys.argv:
+        return sys.argv[sys.argv.index("--") + 1:]
+    return []
+
+
+def load_params(path):
+    if not path:
+        return [{}]
+    with open(path) as params_file:
+        params = json.load(params_file)
+    if not isinstance(params, list):
+        raise ValueError("Parameter file must contain a list of parameter sets")
+    return params
+
+
+def parse_output(spec):
+    node_name, _, socket_name = spec.rpartition(":")
+    if not node_name:
+        raise ValueError("Output must be given as NODE:SOCKET, got {}".format(spec))
+    return node_name, socket_name
+
+
+def load_tree(layout_path, outputs):
+    """Import layout into new tree and link output nodes to requested sockets"""
+    ng = bpy.data.node_groups.new("SvBatchTree", "SverchCustomTreeType")
+    import_tree(ng, layout_path)
+    ng.freeze(hard=True)
+    for node_name, socket_name in outputs:
+        socket = ng.nodes[node_name].outputs[socket_name]
+        if not socket.is_linked:
+            out_node = ng.nodes.new(OUTPUT_NODE_BL_IDNAME)
+            ng.links.new(socket, out_node.inputs[0])
+    ng.unfreeze(hard=True)
+    ng.build_update_list()
+    return ng
+
+
+def apply_params(ng, params):
+    """Set node properties without triggering updates"""
+    ng.freeze(hard=True)
+    try:
+        for node_name, props in params.items():
+            node = ng.nodes[node_name]
+            for prop_name, value in props.items():
+                setattr(node, prop_name, value)
+    finally:
+        ng.unfreeze(hard=True)
+
+
+def save_data(path, data):
+    """Save socket data as .npy if it is rectangular, json otherwise, returns file name"""
+    try:
+        array = np.array(data)
+    except ValueError:
+        array = None
+    if array is not None and array.dtype != object:
+        np.save(path + ".npy", array)
+        return os.path.basename(path) + ".npy"
+    with open(path + ".json", "w") as data_file:
+        json.dump(data, data_file, default=lambda obj: obj.tolist())
+    return os.path.basename(path) + ".json"
+
+
+def get_run_dir(out_dir, index):
+    return os.path.join(out_dir, "run_{:04d}".format(index))
+
+
+def run_one(ng, index, params, outputs, out_dir):
+    """Evaluate tree for one parameter set and save outputs, returns result dict"""
+    run_dir = get_run_dir(out_dir, index)
+    os.makedirs(run_dir, exist_ok=True)
+    result = {"index": index, "params": params, "errors": [], "files": {}}
+    start = time.perf_counter()
+    try:
+        apply_params(ng, params)
+        process_tree(ng)
+    except Exception as err:
+        exception("Run %s failed", index)
+        result["errors"].append(str(err))
+    result["time"] = time.perf_counter() - start
+    if "error nodes" in ng:
+        # error nodes are stored as repr of dict
+        error_nodes = ast.literal_eval(ng["error nodes"])
+        result["errors"].extend("Node {} failed".format(name) for name in sorted(error_nodes))
+
+    for node_name, socket_name in outputs:
+        key = "{}:{}".format(node_name, socket_name)
+        try:
+            data = get_output_socket_data(ng.nodes[node_name], socket_name)
+        except SvNoDataError:
+            result["errors"].append("No data in {}".format(key))
+            continue
+        file_name = "{}__{}".format(node_name, socket_name).replace(os.sep, "_")
+        result["files"][key] = save_data(os.path.join(run_dir, file_name), data)
+
+    with open(os.path.join(run_dir, "result.json"), "w") as result_file:
+        json.dump(result, result_file, indent=2)
+    return result
+
+
+def run_batch(layout_path, params_list, outputs, out_dir, indices=None):
+    """Evaluate tree for parameter sets with given indices, all by default"""
+    os.makedirs(out_dir, exist_ok=True)
+    ng = load_tree(layout_path, outputs)
+    if indices is None:
+        indices = range(len(params_list))
+    results = []
+    for index in indices:
+        result = run_one(ng, index, params_list[index], outputs, out_dir)
+        info("Run %s done in %.3f s, %s errors", index, result["time"], len(result["errors"]))
+        results.append(result)
+    return results
+
+
+def run_workers(argv, workers, out_dir, count):
+    """
+    Start background Blender processes, each one evaluates part of count
+    parameter sets, returns results of the runs that were done
+    """
+    # results of an earlier sweep must not hide runs of crashed workers
+    result_paths = [os.path.join(get_run_dir(out_dir, index), "result.json") for index in range(count)]
+    for result_path in result_paths:
+        if os.path.exists(result_path):
+            os.remove(result_path)
+
+    this_script = os.path.abspath(__file__)
+    processes = []
+    for worker_index in range(workers):
+        command = [bpy.app.binary_path, "-b", "--factory-startup",
+                   "--addons", data_structure.SVERCHOK_NAME,
+                   "--python", this_script, "--python-exit-code", "1",
+                   "--"] + argv + ["--worker-index", str(worker_index)]
+        processes.append(subprocess.Popen(command))
+    failed = [i for i, process in enumerate(processes) if process.wait() != 0]
+    if failed:
+        error("Workers %s failed", failed)
+
+    results = []
+    for result_path in result_paths:
+        if os.path.exists(result_path):
+            with open(result_path) as result_file:
+                results.append(json.load(result_file))
+    return results
+
+
+def main(argv):
+    args = parse_args(argv)
+    outputs = [parse_output(spec) for spec in args.outputs]
+    params_list = load_params(args.params)
+
+    if args.worker_index is not None:
+        indices = range(args.worker_index, len(params_list), args.workers)
+        run_batch(args.layout, params_list, outputs, args.out_dir, indices)
+        return 0
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        os.makedirs(args.out_dir, exist_ok=True)
+        results = run_workers(argv, args.workers, args.out_dir, len(params_list))
+    else:
+        results = run_batch(args.layout, params_list, outputs, args.out_dir)
+
+    summary = {"layout": args.layout,
+               "runs": len(params_list),
+               "failed": [result["index"] for result in results if result["errors"]],
+               "missing": sorted(set(range(len(params_list))) - {result["index"] for result in results}),
+               "time": time.perf_counter() - start,
+               "results": results}
+    with open(os.path.join(args.out_dir, "summary.json"), "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    info("%s runs done in %.3f s, %s failed", len(params_list), summary["time"],
+         len(summary["failed"]) + len(summary["missing"]))
+    return 1 if summary["failed"] or summary["missing"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(script_args()))
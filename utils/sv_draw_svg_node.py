@@ -66,7 +66,7 @@ width = 365
 
 def slider(dwg, parameter, pos, width):
     dwg.add(dwg.rect(insert=(20, pos-17), size=(width-40, 34), rx=18, ry=18, fill=col_slider, stroke=col_stroke, stroke_width=1))
-    if type(parameter[1]) is list:
+    if isinstance(parameter[1], list):
         x = (width-40)/len(parameter[1])
         for i, v in enumerate(parameter[0]):
             dwg.add(dwg.text(v+':', insert=(50+x*i, pos+7), fill=col_whitetext, font_size=20))
@@ -0,0 +1,262 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Formula expressions compiled once and evaluated over whole arrays.
+
+get_expression parses the text, checks it against a whitelist of syntax
+and functions, and keeps the compiled code by text. Expression.evaluate
+runs the code once with numpy arrays in place of variables and numpy
+ufuncs in place of math functions. Expressions numpy can't do the same
+way as math (tuples, conditions, functions without ufunc, math errors
+such as log(0)) are evaluated element by element with the math module,
+so results and errors are the same as with plain eval.
+"""
+
+import ast
+import builtins
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from sverchok.utils.sv_matching import INT_LIMIT, call_checked
+
+# number of compiled expressions to keep
+MAX_EXPRESSIONS = 256
+
+MATH_NAMES = [
+    'acos', 'acosh', 'asin', 'asinh', 'atan', 'atan2',
+    'atanh', 'ceil', 'copysign', 'cos', 'cosh', 'degrees', 'e',
+    'erf', 'erfc', 'exp', 'expm1', 'fabs', 'factorial', 'floor',
+    'fmod', 'frexp', 'fsum', 'gamma', 'hypot', 'isfinite', 'isinf',
+    'isnan', 'ldexp', 'lgamma', 'log', 'log10', 'log1p', 'log2', 'modf',
+    'pi', 'pow', 'radians', 'sin', 'sinh', 'sqrt', 'tan', 'tanh', 'trunc'
+]
+
+# builtins allowed in expressions
+BUILTIN_NAMES = ['abs', 'bool', 'float', 'int', 'len', 'max', 'min', 'range', 'round', 'sum']
+
+MATH_NAMESPACE = {name: getattr(math, name) for name in MATH_NAMES}
+MATH_NAMESPACE.update((name, getattr(builtins, name)) for name in BUILTIN_NAMES)
+MATH_NAMESPACE['__builtins__'] = {}
+
+
+def _log(x, base=None):
+    if base is None:
+        return np.log(x)
+    return np.log(x) / np.log(base)
+
+def _to_int(f):
+    """f giving ints as math.floor, ceil and trunc do"""
+    def call(x):
+        result = f(x)
+        # inf, nan and ints too big for numpy are left to math
+        if not (np.abs(result) < INT_LIMIT).all():
+            raise OverflowError("cannot convert to int64")
+        return result.astype(np.int64)
+    return call
+
+def _fmod(x, y):
+    """np.fmod giving floats for ints too, as math.fmod does"""
+    return np.fmod(x, y, dtype=np.float64)
+
+# math functions which numpy does the same way for arrays
+UFUNCS = {
+    'acos': np.arccos, 'acosh': np.arccosh, 'asin': np.arcsin, 'asinh': np.arcsinh,
+    'atan': np.arctan, 'atan2': np.arctan2, 'atanh': np.arctanh,
+    'ceil': _to_int(np.ceil), 'copysign': np.copysign, 'cos': np.cos, 'cosh': np.cosh,
+    'degrees': np.degrees, 'exp': np.exp, 'expm1': np.expm1, 'fabs': np.fabs,
+    'floor': _to_int(np.floor), 'fmod': _fmod, 'hypot': np.hypot,
+    'isfinite': np.isfinite, 'isinf': np.isinf, 'isnan': np.isnan,
+    'log': _log, 'log10': np.log10, 'log1p': np.log1p, 'log2': np.log2,
+    'pow': np.float_power, 'radians': np.radians, 'sin': np.sin, 'sinh': np.sinh,
+    'sqrt': np.sqrt, 'tan': np.tan, 'tanh': np.tanh, 'trunc': _to_int(np.trunc),
+    'abs': np.abs,
+}
+
+ARRAY_NAMESPACE = dict(MATH_NAMESPACE)
+ARRAY_NAMESPACE.update(UFUNCS)
+
+# syntax allowed in expressions
+ALLOWED_NODES = tuple(getattr(ast, name) for name in (
+    'Expression', 'BinOp', 'UnaryOp', 'BoolOp', 'Compare', 'IfExp', 'Call',
+    'Name', 'Load', 'Constant', 'Num', 'NameConstant', 'Subscript', 'Index',
+    'Slice', 'Tuple', 'List',
+    'Add', 'Sub', 'Mult', 'Div', 'FloorDiv', 'Mod', 'Pow', 'USub', 'UAdd',
+    'Not', 'And', 'Or', 'Eq', 'NotEq', 'Lt', 'LtE', 'Gt', 'GtE',
+) if hasattr(ast, name))
+
+# syntax which numpy arrays don't evaluate as python numbers do
+ELEMENTWISE_NODES = tuple(getattr(ast, name) for name in (
+    'BoolOp', 'IfExp', 'Tuple', 'List', 'Slice', 'Not'
+) if hasattr(ast, name))
+
+
+class ExpressionError(Exception):
+    pass
+
+
+class Expression:
+    """Compiled expression, see get_expression"""
+
+    def __init__(self, text):
+        self.text = text
+        try:
+            tree = ast.parse(text.strip(), mode='eval')
+        except SyntaxError as err:
+            raise ExpressionError("Invalid expression {!r}: {}".format(text, err.msg))
+        self.names = set()
+        self.vectorized = True
+        for node in ast.walk(tree):
+            if not isinstance(node, ALLOWED_NODES):
+                raise ExpressionError("{} is not allowed in expression {!r}".format(type(node).__name__, text))
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in MATH_NAMESPACE:
+                    raise ExpressionError("Unknown function in expression {!r}".format(text))
+                if node.func.id not in UFUNCS or node.keywords:
+                    self.vectorized = False
+            elif isinstance(node, ast.Name):
+                self.names.add(node.id)
+            elif isinstance(node, ast.Compare) and len(node.ops) > 1:
+                self.vectorized = False
+            elif isinstance(node, ELEMENTWISE_NODES):
+                self.vectorized = False
+        self.code = compile(tree, '<expression>', 'eval')
+
+    def evaluate(self, variables, size):
+        """
+        List of size values of the expression. Values of variables are
+        numbers, numpy arrays of size values, or lists of these (as n in
+        Formula node, used as n[0], n[1]...).
+        """
+        if self.vectorized and all_numeric(variables.values()):
+            names = list(variables)
+            values = [variables[name] for name in names]
+
+            def f(*arrays):
+                local = dict(zip(names, with_arrays(values, iter(arrays))))
+                return eval(self.code, ARRAY_NAMESPACE, local)
+
+            # errors and int overflow give None, python ints don't overflow
+            result = call_checked(f, array_leaves(values))
+            if result is not None:
+                if result.shape == ():
+                    return [result.item()] * size
+                if result.shape == (size,) and result.dtype.kind in 'biuf':
+                    return result.tolist()
+        return self.evaluate_items(variables, size)
+
+    def evaluate_items(self, variables, size):
+        """Same as evaluate, with math functions called element by element"""
+        names = [name for name in variables if name in self.names]
+        columns = [to_items(variables[name], size) for name in names]
+        code = self.code
+        local = {}
+        out = []
+        for values in zip(*columns) if columns else ((),) * size:
+            local.update(zip(names, values))
+            out.append(eval(code, MATH_NAMESPACE, local))
+        return out
+
+
+def all_numeric(values):
+    for value in values:
+        if isinstance(value, np.ndarray):
+            if value.dtype.kind not in 'biuf':
+                return False
+        elif isinstance(value, (list, tuple)):
+            if not all_numeric(value):
+                return False
+    return True
+
+
+def array_leaves(value):
+    """numpy arrays in value of a variable (or list of values), in order"""
+    if isinstance(value, np.ndarray):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [array for item in value for array in array_leaves(item)]
+    return []
+
+
+def with_arrays(value, arrays):
+    """value with its numpy arrays replaced by next items of arrays iterator"""
+    if isinstance(value, np.ndarray):
+        return next(arrays)
+    if isinstance(value, (list, tuple)):
+        return type(value)(with_arrays(item, arrays) for item in value)
+    return value
+
+
+def to_items(value, size):
+    """Sequence of size values of variable for element by element evaluation"""
+    if isinstance(value, np.ndarray):
+        return value.tolist() if value.dtype.kind in 'biuf' else list(value)
+    if isinstance(value, (list, tuple)):
+        return list(zip(*(to_items(item, size) for item in value))) if value else [value] * size
+    return [value] * size
+
+
+def as_values(values):
+    """
+    Values of a variable as numpy array, numbers give numeric array,
+    anything else (vectors, strings) an object array of the same items
+    """
+    if not len(values):
+        return np.zeros(0)
+    try:
+        array = np.asarray(values)
+        if array.ndim == 1 and array.dtype.kind in 'biuf':
+            return array
+    except ValueError:
+        # ragged items
+        pass
+    array = np.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        array[index] = value
+    return array
+
+
+def as_columns(vectors):
+    """x, y and z values of vectors as three arrays, see as_values"""
+    if not len(vectors):
+        return [np.zeros(0)] * 3
+    array = np.asarray(vectors)
+    if array.ndim == 2 and array.shape[1] == 3 and array.dtype.kind in 'biuf':
+        return [array[:, 0], array[:, 1], array[:, 2]]
+    return [as_values(column) for column in zip(*vectors)]
+
+
+_expressions = OrderedDict()
+_lock = threading.Lock()
+
+def get_expression(text):
+    """Expression for text, compiled once and reused while text is the same"""
+    with _lock:
+        expression = _expressions.get(text)
+        if expression is not None:
+            _expressions.move_to_end(text)
+            return expression
+    expression = Expression(text)
+    with _lock:
+        _expressions[text] = expression
+        while len(_expressions) > MAX_EXPRESSIONS:
+            _expressions.popitem(last=False)
+    return expression
@@ -0,0 +1,286 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+List matching without padded copies.
+
+The *_views functions match lists the same way as match_long_repeat,
+match_long_cycle, match_short and match_cross from data_structure, but
+return read-only sequences which map an index of the matched list to an
+index of the source list. Nothing is copied: a list of 1M elements
+matched against a single value gives a view that answers that value a
+million times. Use them where matched lists are only iterated or
+indexed, e.g. in zip(*views).
+
+match_arrays matches numpy arrays, shorter arrays are padded into new
+writable arrays.
+
+array_fx and array_fxy are recurse_fx and recurse_fxy of sv_itertools
+for rectangular numeric data, the function is called once with arrays.
+"""
+
+from abc import abstractmethod
+from collections.abc import Sequence
+from itertools import chain, cycle, islice, repeat
+
+import numpy as np
+
+
+class MatchedView(Sequence):
+    """Read-only sequence of given length over a source list"""
+
+    def __init__(self, source, length):
+        self.source = source
+        self.length = length
+
+    @abstractmethod
+    def source_index(self, index):
+        """Index in source list of element at index of matched list"""
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("matched view index out of range")
+        return self.source[self.source_index(index)]
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.tolist())
+
+    def tolist(self):
+        return list(self)
+
+
+class RepeatLastView(MatchedView):
+    """Source list followed by its last element repeated up to length"""
+
+    def source_index(self, index):
+        return min(index, len(self.source) - 1)
+
+    def __iter__(self):
+        source = self.source
+        if len(source) >= self.length:
+            return islice(source, self.length)
+        return chain(source, repeat(source[-1], self.length - len(source)))
+
+
+class CycleView(MatchedView):
+    """Source list repeated cyclically up to length"""
+
+    def source_index(self, index):
+        return index % len(self.source)
+
+    def __iter__(self):
+        return islice(cycle(self.source), self.length)
+
+
+class CrossView(MatchedView):
+    """
+    Source list as one axis of cartesian product: every element is
+    repeated inner times, the whole list is repeated outer times.
+    """
+
+    def __init__(self, source, inner, outer):
+        super().__init__(source, len(source) * inner * outer)
+        self.inner = inner
+
+    def source_index(self, index):
+        return (index // self.inner) % len(self.source)
+
+    def __iter__(self):
+        inner = self.inner
+        items = chain.from_iterable(repeat(item, inner) for item in self.source)
+        if self.length == len(self.source) * inner:
+            return items
+        return islice(cycle(items), self.length)
+
+
+def match_long_repeat_views(lsts):
+    """match_long_repeat without copies, [[1,2,3], [10]] -> views of [[1,2,3], [10,10,10]]"""
+    lengths = [len(l) for l in lsts]
+    if not lengths or not min(lengths):
+        return []
+    max_l = max(lengths)
+    return [RepeatLastView(l, max_l) for l in lsts]
+
+
+def match_long_cycle_views(lsts):
+    """match_long_cycle without copies, [[1,2,3], [10,11]] -> views of [[1,2,3], [10,11,10]]"""
+    lengths = [len(l) for l in lsts]
+    if not lengths or not min(lengths):
+        return []
+    max_l = max(lengths)
+    return [CycleView(l, max_l) for l in lsts]
+
+
+def match_short_views(lsts):
+    """match_short without copies, [[1,2,3], [10,11]] -> views of [[1,2], [10,11]]"""
+    lengths = [len(l) for l in lsts]
+    if not lengths or not min(lengths):
+        return []
+    min_l = min(lengths)
+    return [RepeatLastView(l, min_l) for l in lsts]
+
+
+def match_cross_views(lsts):
+    """match_cross without copies, [[1,2], [5,6,7]] -> views of [[1,1,1,2,2,2], [5,6,7,5,6,7]]"""
+    lengths = [len(l) for l in lsts]
+    if not lengths or not min(lengths):
+        return []
+    total = int(np.prod(lengths))
+    views = []
+    inner = total
+    for l in lsts:
+        inner //= len(l)
+        views.append(CrossView(l, inner, total // (inner * len(l))))
+    return views
+
+
+def match_arrays(arrays, mode='REPEAT'):
+    """
+    Match numpy arrays along the first axis. mode is one of 'REPEAT'
+    (repeat last element), 'CYCLE', 'SHORT' or 'CROSS'. Shorter arrays
+    are padded or tiled, longer ones are cut. Returns list of new writable
+    arrays, nodes may change them in place like matched lists.
+    """
+    arrays = [np.asanyarray(a) for a in arrays]
+    arrays = [a.reshape(1) if a.ndim == 0 else a for a in arrays]
+    lengths = [len(a) for a in arrays]
+    if not lengths or not min(lengths):
+        return []
+
+    if mode == 'CROSS':
+        total = int(np.prod(lengths))
+        result = []
+        inner = total
+        for a in arrays:
+            inner //= len(a)
+            outer = total // (inner * len(a))
+            result.append(np.tile(np.repeat(a, inner, axis=0), (outer,) + (1,) * (a.ndim - 1)))
+        return result
+
+    length = min(lengths) if mode == 'SHORT' else max(lengths)
+    result = []
+    for a in arrays:
+        if len(a) == length:
+            result.append(a.copy())
+        elif len(a) > length:
+            result.append(a[:length].copy())
+        elif len(a) == 1 or mode == 'REPEAT':
+            tail = np.repeat(a[-1:], length - len(a), axis=0)
+            result.append(np.concatenate((a, tail)))
+        elif mode == 'CYCLE':
+            result.append(np.resize(a, (length,) + a.shape[1:]))
+        else:
+            raise ValueError("Unknown matching mode: {}".format(mode))
+    return result
+
+
+# integers numpy computes without overflow, python ints have no limit
+INT_LIMIT = 2.0 ** 62
+
+
+def as_numeric_array(data):
+    """
+    Nested lists of numbers (or list of arrays) as one numpy array,
+    None if data is not rectangular, has other items than ints and
+    floats, or has an empty list
+    """
+    if isinstance(data, np.ndarray):
+        array = data
+    else:
+        try:
+            array = np.asarray(data)
+        except ValueError:
+            return None
+    if array.ndim == 0 or array.dtype.kind not in 'iuf' or not array.size:
+        return None
+    return array
+
+
+def match_nested_arrays(a, b):
+    """
+    Match two arrays the way recurse_fxy matches nested lists: axes are
+    paired from the outermost one, the array with less axes is repeated
+    along the inner axes of the other, and the shorter array on an axis
+    is padded with its last element. Returns arrays broadcastable together.
+    """
+    if a.ndim < b.ndim:
+        a = a.reshape(a.shape + (1,) * (b.ndim - a.ndim))
+    elif b.ndim < a.ndim:
+        b = b.reshape(b.shape + (1,) * (a.ndim - b.ndim))
+    for axis, (len_a, len_b) in enumerate(zip(a.shape, b.shape)):
+        if len_a == len_b or len_a == 1 or len_b == 1:
+            continue
+        if len_a < len_b:
+            a = a.take(np.minimum(np.arange(len_b), len_a - 1), axis=axis)
+        else:
+            b = b.take(np.minimum(np.arange(len_a), len_b - 1), axis=axis)
+    return a, b
+
+
+def call_checked(f, arrays):
+    """
+    f(*arrays), None where python numbers would give other results:
+    numpy errors (division by zero, math domain, overflow), which python
+    raises as exceptions, and int results beyond int64
+    """
+    try:
+        with np.errstate(divide='raise', over='raise', invalid='raise'):
+            result = np.asarray(f(*arrays))
+            if result.dtype.kind in 'iu':
+                estimate = np.asarray(f(*(a.astype(np.float64) for a in arrays)))
+                if estimate.size and np.abs(estimate).max() >= INT_LIMIT:
+                    return None
+    except (ArithmeticError, ValueError, TypeError):
+        return None
+    return result
+
+
+def array_fx(l, f):
+    """
+    recurse_fx for rectangular numeric data, f is called once with the
+    whole array. Returns the result array, or None if the data doesn't
+    convert or numpy can't give the same result, recurse_fx then.
+    """
+    a = as_numeric_array(l)
+    if a is None:
+        return None
+    return call_checked(f, (a,))
+
+
+def array_fxy(l1, l2, f):
+    """recurse_fxy for rectangular numeric data, see array_fx"""
+    a = as_numeric_array(l1)
+    b = as_numeric_array(l2) if a is not None else None
+    if b is None:
+        return None
+    return call_checked(f, match_nested_arrays(a, b))
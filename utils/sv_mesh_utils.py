@@ -16,6 +16,13 @@
 #
 # ##### END GPL LICENSE BLOCK #####
 
+from itertools import chain
+
+import numpy as np
+
+from sverchok.utils.sv_spatial_index import PointGrid
+
+
 def mesh_join(vertices_s, edges_s, faces_s):
     '''Given list of meshes represented by lists of vertices, edges and faces,
     produce one joined mesh.'''
@@ -34,3 +41,94 @@ def mesh_join(vertices_s, edges_s, faces_s):
         result_faces.extend(new_faces)
         offset += len(vertices)
     return result_vertices, result_edges, result_faces
+
+
+def weld_map(vertices, distance):
+    """
+    Find vertices to merge, the same way as bmesh.ops.remove_doubles:
+    vertices are visited in order of the sum of their coordinates, a vertex
+    not merged yet takes all vertices not merged yet at most distance away.
+    Close vertices are found with a grid of cells of distance size.
+    Returns array with index of the vertex every vertex is merged into,
+    vertices which are kept point to themselves.
+    """
+    points = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+    count = len(points)
+    if count < 2:
+        return np.arange(count)
+    if distance <= 0:
+        # only equal vertices, first one is kept
+        _, first, inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+        return first[inverse.ravel()]
+
+    close, _, offsets = PointGrid(points, cell=distance).find_range(points, distance)
+    order = np.argsort(points.sum(axis=1), kind='stable')
+    rank = np.empty(count, dtype=np.int64)
+    rank[order] = np.arange(count)
+    # every vertex is close to itself, so no group is empty
+    first = order.take(np.minimum.reduceat(rank.take(close), offsets[:-1]))
+
+    # a vertex is taken by the first vertex close to it which is kept,
+    # the first vertex close to a vertex visited before all others is kept
+    leads = first == np.arange(count)
+    targets = np.where(leads.take(first), first, -1)
+
+    # for the rest, close vertices visited before them are known when
+    # they are visited in order
+    for index in order[targets.take(order) < 0].tolist():
+        group = close[offsets[index]:offsets[index + 1]]
+        kept = group[targets.take(group) == group]
+        targets[index] = kept[rank.take(kept).argmin()] if len(kept) else index
+    return targets
+
+
+def weld_edges(edges, remap=None):
+    """Edges with remapped indices, without collapsed and repeated edges"""
+    if not len(edges):
+        return []
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    if remap is not None:
+        edges = remap.take(edges)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    _, first = np.unique(np.sort(edges, axis=1), axis=0, return_index=True)
+    return edges[np.sort(first)].tolist()
+
+
+def weld_faces(faces, remap):
+    """
+    Faces with remapped indices, repeated corners following each other
+    are removed, faces with less than three corners left are dropped.
+    """
+    if not len(faces):
+        return []
+    totals = np.fromiter(map(len, faces), dtype=np.int64, count=len(faces))
+    loops = remap.take(np.fromiter(chain.from_iterable(faces), dtype=np.int64, count=int(totals.sum())))
+    starts = np.cumsum(totals) - totals
+    following = np.arange(1, len(loops) + 1)
+    following[starts + totals - 1] = starts
+    keep = loops != loops.take(following)
+    totals = np.bincount(np.repeat(np.arange(len(faces)), totals)[keep], minlength=len(faces))
+    loops = loops[keep].tolist()
+    ends = np.cumsum(totals).tolist()
+    return [loops[end - total:end] for end, total in zip(ends, totals.tolist()) if total >= 3]
+
+
+def faces_edges(faces):
+    """Unique edges of faces, in order of first use"""
+    return weld_edges([edge for face in faces for edge in zip(face, list(face[1:]) + [face[0]])])
+
+
+def remove_doubles(vertices, edges, faces, distance):
+    """
+    Merge vertices at most distance away from each other, see weld_map.
+    Returns vertices left, edges and faces using them and removed vertices.
+    Without edges given, edges of faces are returned.
+    """
+    targets = weld_map(vertices, distance)
+    kept = targets == np.arange(len(targets))
+    remap = (np.cumsum(kept) - 1).take(targets)
+    verts_out = [vertices[i] for i in np.flatnonzero(kept).tolist()]
+    doubles = [vertices[i] for i in np.flatnonzero(~kept).tolist()]
+    faces_out = weld_faces(faces, remap)
+    edges_out = weld_edges(edges, remap) if len(edges) else faces_edges(faces_out)
+    return verts_out, edges_out, faces_out, doubles
@@ -0,0 +1,302 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Vectorized monads evaluated by a pool of background Blender processes.
+
+Every worker is started once as
+
+    blender -b --factory-startup --addons sverchok --python sv_monad_pool.py -- ADDRESS AUTHKEY
+
+and connects back to the pool. Items of the matched input lists are cut
+into chunks and sent to free workers; results are gathered in order.
+A worker keeps a copy of the monad tree, exported with create_dict_of_tree
+and rebuilt with import_tree, and gets a new copy only when the exported
+layout changes. Workers quit when Blender that started them quits.
+
+Workers start with an empty file, so monads with nodes that use objects,
+texts or other Blender data, or depend on frame, are not sent to them
+(see core.monad.find_scene_dependency), neither is data that can't be
+pickled.
+"""
+
+import binascii
+import collections
+import copyreg
+import json
+import math
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import traceback
+from itertools import chain
+from multiprocessing.connection import Listener, Client, wait
+
+import bpy
+from mathutils import Matrix, Vector
+
+from sverchok import data_structure
+from sverchok.utils.sv_IO_panel_tools import create_dict_of_tree, import_tree
+from sverchok.utils.logging import info
+
+# seconds to wait for a new worker to connect
+CONNECT_TIMEOUT = 60
+# seconds to wait for the next result of workers
+RESULT_TIMEOUT = 600
+
+# socket data holds mathutils types, they can't be pickled by default
+copyreg.pickle(Matrix, lambda m: (Matrix, ([tuple(row) for row in m],)))
+copyreg.pickle(Vector, lambda v: (Vector, (tuple(v),)))
+
+
+class MonadWorkerError(Exception):
+    pass
+
+
+class MonadWorker:
+    """Background Blender process connected to the pool"""
+
+    def __init__(self, process, connection):
+        self.process = process
+        self.connection = connection
+        self.layout_key = None
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def send(self, *message):
+        self.connection.send(message)
+
+    def close(self):
+        try:
+            self.send("quit")
+            self.connection.close()
+        except (OSError, EOFError):
+            pass
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class MonadPool:
+    """Workers started on demand, shared by all vectorized monads"""
+
+    def __init__(self):
+        self.authkey = os.urandom(16)
+        self.listener = Listener(('localhost', 0), authkey=self.authkey)
+        self.workers = []
+        self.closed = False
+
+    def start_worker(self):
+        host, port = self.listener.address
+        command = [bpy.app.binary_path, "-b", "--factory-startup",
+                   "--addons", data_structure.SVERCHOK_NAME,
+                   "--python", os.path.abspath(__file__),
+                   "--", "{}:{}".format(host, port), binascii.hexlify(self.authkey).decode()]
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+
+        accepted = []
+        thread = threading.Thread(target=lambda: accepted.append(self.listener.accept()), daemon=True)
+        thread.start()
+        thread.join(CONNECT_TIMEOUT)
+        if not accepted:
+            process.kill()
+            # accept is still waiting, closing the listener stops it
+            self.shutdown()
+            raise MonadWorkerError("Monad worker did not connect in {} s".format(CONNECT_TIMEOUT))
+        worker = MonadWorker(process, accepted[0])
+        self.workers.append(worker)
+        info("Monad worker %s started", worker.pid)
+        return worker
+
+    def get_workers(self, count):
+        for worker in list(self.workers):
+            if worker.process.poll() is not None:
+                self.workers.remove(worker)
+        while len(self.workers) < count:
+            self.start_worker()
+        return self.workers[:count]
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.close()
+        self.workers.clear()
+        self.listener.close()
+        self.closed = True
+
+
+_pool = None
+
+def get_pool():
+    global _pool
+    if _pool is None or _pool.closed:
+        _pool = MonadPool()
+    return _pool
+
+def shutdown():
+    """Stop all workers"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def export_monad(monad):
+    """Layout of monad tree as json string, also used to tell if it has changed"""
+    layout = create_dict_of_tree(monad)
+    layout['bl_idname'] = monad.bl_idname
+    return monad.name, json.dumps(layout, sort_keys=True)
+
+
+def make_chunks(count, workers, chunk_size):
+    """(start, stop) ranges of items, chunk_size 0 divides them evenly"""
+    if not chunk_size:
+        chunk_size = math.ceil(count / workers)
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def make_payloads(data_in, chunks, count):
+    """
+    Pickled run messages, one per chunk, None if data can't be pickled.
+    Data is pickled before anything is sent, so that such data doesn't
+    stop workers in the middle of a run.
+    """
+    try:
+        return [pickle.dumps(("run", index, [data[start:stop] for data in data_in], start, count),
+                             pickle.HIGHEST_PROTOCOL)
+                for index, (start, stop) in enumerate(chunks)]
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def dispatch(workers, payloads, prepare, timeout=RESULT_TIMEOUT):
+    """
+    Send payloads to workers, each next one to the first free worker, and
+    return replies in order of payloads. prepare(worker) is called before
+    a payload is sent. Raises MonadWorkerError if a worker fails, stops,
+    or no worker replies in timeout seconds.
+    """
+    queue = collections.deque(enumerate(payloads))
+    replies = [None] * len(payloads)
+    busy = {}
+
+    def send(worker):
+        index, payload = queue.popleft()
+        prepare(worker)
+        worker.connection.send_bytes(payload)
+        busy[worker.connection] = worker
+
+    for worker in workers[:len(payloads)]:
+        send(worker)
+
+    while busy:
+        ready = wait(list(busy), timeout)
+        if not ready:
+            raise MonadWorkerError("No result from monad workers in {} s".format(timeout))
+        for connection in ready:
+            worker = busy.pop(connection)
+            try:
+                reply = connection.recv()
+            except (EOFError, OSError):
+                raise MonadWorkerError("Monad worker {} has stopped".format(worker.pid))
+            if reply[0] == "error":
+                raise MonadWorkerError("Monad failed in worker {}:\n{}".format(worker.pid, reply[2]))
+            replies[reply[1]] = reply
+            if queue:
+                send(worker)
+    return replies
+
+
+def vectorize_in_workers(monad, data_in, workers, chunk_size=0):
+    """
+    Same as core.monad.vectorize_monad, but items are processed by worker
+    processes, returns list of output data, one per monad output, or None
+    if input data can't be sent to workers
+    """
+    count = len(data_in[0])
+    payloads = make_payloads(data_in, make_chunks(count, workers, chunk_size), count)
+    if payloads is None:
+        return None
+    name, layout = export_monad(monad)
+    layout_key = hash(layout)
+
+    def send_tree(worker):
+        if worker.layout_key != layout_key:
+            worker.send("tree", name, layout)
+            worker.layout_key = layout_key
+
+    pool = get_pool()
+    try:
+        replies = dispatch(pool.get_workers(min(workers, len(payloads))), payloads, send_tree)
+    except Exception:
+        # other workers may still send results of this run, start afresh next time
+        shutdown()
+        raise
+
+    results = [reply[2] for reply in replies]
+    monad["batch_blocker"] = ", ".join(sorted(set(reply[3] for reply in replies if reply[3])))
+    return [list(chain.from_iterable(result[idx] for result in results))
+            for idx in range(len(results[0]))]
+
+
+# ---- worker side
+
+
+def load_monad(name, layout):
+    """Replace monad tree of the worker by one imported from layout"""
+    for tree in list(bpy.data.node_groups):
+        bpy.data.node_groups.remove(tree)
+    monad = bpy.data.node_groups.new(name, 'SverchGroupTreeType')
+    import_tree(monad, '', layout)
+    return monad
+
+
+def worker_main(address, authkey):
+    # addon is enabled by command line, so core modules can be imported now
+    from sverchok.core.monad import vectorize_monad
+
+    host, port = address.rsplit(":", 1)
+    connection = Client((host, int(port)), authkey=binascii.unhexlify(authkey))
+    monad = None
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        kind = message[0]
+        if kind == "quit":
+            break
+        elif kind == "tree":
+            monad = load_monad(message[1], message[2])
+        elif kind == "run":
+            _, index, data_in, first_index, total = message
+            try:
+                data_out = vectorize_monad(monad, data_in, first_index, total)
+                connection.send(("result", index, data_out, monad.get("batch_blocker", "")))
+            except Exception:
+                connection.send(("error", index, traceback.format_exc()))
+    connection.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[sys.argv.index("--") + 1:]
+    worker_main(*args)
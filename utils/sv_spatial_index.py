@@ -0,0 +1,429 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Shared KDTree and BVHTree indexes.
+
+Indexes are keyed by a fingerprint of the geometry content, so every node
+that queries the same mesh gets the same tree, built once. Least recently
+used trees are dropped when there are more than MAX_INDEXES of them.
+Trees given out are shared: they must only be queried, never changed.
+
+find_n_batch and find_range_batch answer many nearest neighbour or range
+queries at once. Results are flat arrays: indices and distances of found
+points, sorted by distance for every query, and offsets, so that results
+of query i are indices[offsets[i]:offsets[i+1]]. They use the shared
+KDTree, or without mathutils a uniform grid of points (PointGrid) which
+answers all queries with numpy, without a call per query.
+"""
+
+import collections
+import hashlib
+import threading
+from itertools import chain, product
+
+import numpy as np
+
+try:
+    from mathutils.kdtree import KDTree
+    from mathutils.bvhtree import BVHTree
+    HAS_MATHUTILS = True
+except ImportError:
+    HAS_MATHUTILS = False
+
+# number of trees kept in the cache
+MAX_INDEXES = 32
+
+# trees keyed by (kind, settings, fingerprint), least recently used first
+spatial_indexes = collections.OrderedDict()
+
+index_stats = {"hits": 0, "builds": 0, "evictions": 0}
+
+# thread safe nodes query the cache from worker threads
+_lock = threading.Lock()
+
+
+def data_fingerprint(data):
+    """
+    Digest of the content of vertices, edges or polygons given as nested
+    lists or 2d numpy array, both give the same fingerprint for the same
+    values. Polygons of different length are supported.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, np.ndarray) and data.ndim == 2:
+        lengths = np.full(len(data), data.shape[1], dtype=np.int64)
+        flat = np.ascontiguousarray(data, dtype=np.float64).ravel()
+    else:
+        data = list(data)
+        lengths = np.fromiter(map(len, data), dtype=np.int64, count=len(data))
+        flat = np.fromiter(chain.from_iterable(data), dtype=np.float64)
+    digest.update(lengths.data)
+    digest.update(flat.data)
+    return digest.hexdigest()
+
+
+def geometry_fingerprint(*data):
+    """Fingerprint of several parts of one geometry, e.g. vertices and polygons"""
+    return "-".join(data_fingerprint(d) for d in data)
+
+
+def cached_index(key, build):
+    """Get tree stored under key, or build it and store it"""
+    with _lock:
+        tree = spatial_indexes.get(key)
+        if tree is not None:
+            spatial_indexes.move_to_end(key)
+            index_stats["hits"] += 1
+            return tree
+    # built outside of the lock, two threads may build the same tree once
+    tree = build()
+    with _lock:
+        index_stats["builds"] += 1
+        spatial_indexes[key] = tree
+        while len(spatial_indexes) > MAX_INDEXES:
+            spatial_indexes.popitem(last=False)
+            index_stats["evictions"] += 1
+    return tree
+
+
+def as_list(data):
+    return data.tolist() if isinstance(data, np.ndarray) else data
+
+
+def build_kdtree(verts):
+    kd = KDTree(len(verts))
+    for idx, co in enumerate(verts):
+        kd.insert(co, idx)
+    kd.balance()
+    return kd
+
+
+def get_kdtree(verts):
+    """Balanced KDTree of vertices, indexes of the tree are indexes of verts"""
+    key = ('KD', None, data_fingerprint(verts))
+    return cached_index(key, lambda: build_kdtree(as_list(verts)))
+
+
+def get_bvhtree(verts, polygons, all_triangles=False, epsilon=0.0):
+    """BVHTree of polygons, see BVHTree.FromPolygons"""
+    key = ('BVH', (all_triangles, epsilon), geometry_fingerprint(verts, polygons))
+    return cached_index(key, lambda: BVHTree.FromPolygons(
+        as_list(verts), as_list(polygons), all_triangles=all_triangles, epsilon=epsilon))
+
+
+class PointGrid(object):
+    """
+    Points sorted by the cells of a uniform grid. Cell size is chosen so
+    that a cell holds about points_per_cell points, flat dimensions of
+    the point cloud get a single layer of cells. Alternatively the size
+    can be given as cell, e.g. the distance of range queries.
+    """
+
+    # empty cells around the grid, so that keys of neighbour cells
+    # can be found without bounds checks
+    PAD = 1
+    # neighbour cells looked at in one go, limits memory of queries
+    CELL_CHUNK = 2**21
+
+    def __init__(self, points, points_per_cell=1, cell=None):
+        self.points_per_cell = points_per_cell
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        self.points = points
+        if len(points):
+            self.origin = points.min(axis=0)
+            extent = points.max(axis=0) - self.origin
+        else:
+            self.origin = np.zeros(3)
+            extent = np.zeros(3)
+        if cell:
+            # at most 2**20 cells per dimension, so that keys fit in int64
+            self.cell = max(cell, extent.max() / 2**20)
+        else:
+            self.cell = self.cell_size(extent, len(points))
+        self.shape = np.floor(extent / self.cell).astype(np.int64) + 1
+        self.key_shape = self.shape + 2 * self.PAD
+
+        keys = self.cell_keys(self.point_cells(points))
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_points = points[self.order]
+        cell_count = int(np.prod(self.key_shape))
+        if cell_count <= 8 * len(points) + 4096:
+            # start of every cell in sorted points, cell i ends where i + 1 starts
+            self.cell_starts = np.zeros(cell_count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys, minlength=cell_count), out=self.cell_starts[1:])
+            self.cell_ids = None
+        else:
+            # sparse grid, occupied cells are found by binary search
+            self.cell_ids, starts, counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+            self.cell_starts = np.append(starts, len(points))
+
+    def cell_size(self, extent, count):
+        dims = extent > 0
+        # a dimension thinner than one cell does not take part in cell size
+        while dims.any():
+            cell = (np.prod(extent[dims]) * self.points_per_cell / count) ** (1 / dims.sum())
+            flat = dims & (extent < cell)
+            if not flat.any():
+                # at most 2**20 cells per dimension, so that keys fit in int64
+                return max(cell, extent.max() / 2**20)
+            dims &= ~flat
+        return 1.0
+
+    def point_cells(self, points):
+        return np.floor((points - self.origin) / self.cell).astype(np.int64)
+
+    def cell_keys(self, cells, pad=None):
+        pad = self.PAD if pad is None else pad
+        sx, sy, sz = self.key_shape
+        return ((cells[..., 0] + pad) * sy + cells[..., 1] + pad) * sz + cells[..., 2] + pad
+
+    def cell_ranges(self, keys):
+        """First sorted point and point count of cells"""
+        # take is much faster than fancy indexing on long arrays
+        if self.cell_ids is None:
+            firsts = self.cell_starts.take(keys)
+            return firsts, self.cell_starts.take(keys + 1) - firsts
+        pos = np.searchsorted(self.cell_ids, keys)
+        found = pos < len(self.cell_ids)
+        found[found] = self.cell_ids[pos[found]] == keys[found]
+        firsts = np.where(found, self.cell_starts[pos], 0)
+        return firsts, np.where(found, self.cell_starts[np.minimum(pos + 1, len(self.cell_ids))] - firsts, 0)
+
+    def ring_pairs(self, queries, cells, ring, limits):
+        """
+        Indexes of query and of sorted point, for all points in cells
+        at most ring cells away from query cells, in every dimension,
+        skipping cells of larger rings which are farther than limit from the query.
+        """
+        lo = np.maximum(-ring, -cells.max(axis=0))
+        hi = np.minimum(ring, self.shape - 1 - cells.min(axis=0))
+        if np.any(hi < lo):
+            return np.zeros(0, np.int64), np.zeros(0, np.int64)
+        offsets = np.array(list(product(*(range(l, h + 1) for l, h in zip(lo, hi)))), dtype=np.int64)
+        key_offsets = self.cell_keys(offsets, pad=0)
+        # neighbours of cells in the grid are in the padding at worst
+        checked = ~np.all((cells >= 0) & (cells < self.shape), axis=1) | (ring > self.PAD)
+
+        keys = self.cell_keys(cells)[:, np.newaxis] + key_offsets
+        if ring > 1:
+            # corners of large rings are often too far, distance to them in cells
+            position = ((queries - self.origin) / self.cell - cells)[:, np.newaxis, :]
+            gaps = np.maximum(np.maximum(offsets - position, position - offsets - 1), 0)
+            near = np.einsum('ijk,ijk->ij', gaps, gaps) <= (limits / self.cell)[:, np.newaxis] ** 2
+        else:
+            near = np.ones(keys.shape, dtype=bool)
+        if checked.any():
+            neighbours = cells[checked, np.newaxis, :] + offsets
+            near[checked] &= np.all((neighbours >= 0) & (neighbours < self.shape), axis=2)
+        near = np.nonzero(near.ravel())[0]
+        keys = keys.ravel().take(near)
+        firsts, counts = self.cell_ranges(keys)
+        occupied = counts > 0
+        queries = near[occupied] // len(offsets)
+        firsts, counts = firsts[occupied], counts[occupied]
+
+        total = counts.sum()
+        steps = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(queries, counts), np.repeat(firsts, counts) + steps
+
+    def ring_reach(self, queries, cells, ring):
+        """
+        Distance from queries to the border of their ring of cells, all points
+        closer than that are in the ring. Borders beyond the grid don't count.
+        """
+        low = queries - (self.origin + (cells - ring) * self.cell)
+        high = self.origin + (cells + ring + 1) * self.cell - queries
+        low[cells - ring <= 0] = np.inf
+        high[cells + ring >= self.shape - 1] = np.inf
+        return np.minimum(low, high).min(axis=1)
+
+    def square_distances(self, queries, query_idx, point_idx):
+        diff = self.sorted_points.take(point_idx, axis=0) - queries.take(query_idx, axis=0)
+        return np.einsum('ij,ij->i', diff, diff)
+
+    def query_chunks(self, queries, indices, ring):
+        """
+        Split indices of queries into parts small enough to look at
+        all their neighbour cells at once, sorted by cell so that
+        neighbours of a part are close in memory
+        """
+        cells = self.point_cells(queries[indices])
+        indices = indices[np.argsort(self.cell_keys(cells), kind='stable')]
+        neighbours = min((2 * ring + 1) ** 3, int(np.prod(self.key_shape)))
+        step = max(1, self.CELL_CHUNK // neighbours)
+        for start in range(0, len(indices), step):
+            yield indices[start:start + step]
+
+    def find_n(self, queries, counts):
+        """counts nearest points of every query, see find_n_batch"""
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), len(queries))
+        counts = np.clip(counts, 0, len(self.points))
+        result = Results(counts)
+        waiting = np.nonzero(counts)[0]
+        ring = 1
+        while len(waiting):
+            left = []
+            for part in self.query_chunks(queries, waiting, ring):
+                part_queries = queries[part]
+                cells = self.point_cells(part_queries)
+                reach = self.ring_reach(part_queries, cells, ring)
+                q_idx, p_idx = self.ring_pairs(part_queries, cells, ring, reach)
+                dist = self.square_distances(part_queries, q_idx, p_idx)
+                # nearest points are known when enough are closer than the reach
+                sure = dist <= reach[q_idx] ** 2
+                done = np.bincount(q_idx[sure], minlength=len(part)) >= counts[part]
+                keep = sure & done[q_idx]
+                result.add(part[q_idx[keep]], p_idx[keep], dist[keep], limit=True)
+                left.append(part[~done])
+            waiting = np.concatenate(left)
+            ring *= 2
+        return result.arrays(self.order)
+
+    def find_range(self, queries, radii):
+        """points at most radius away from every query, see find_range_batch"""
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), len(queries))
+        found = []
+        if len(self.points):
+            rings = np.ceil(radii / self.cell).astype(np.int64)
+            for ring in np.unique(rings[radii >= 0]):
+                selected = np.nonzero((rings == ring) & (radii >= 0))[0]
+                for part in self.query_chunks(queries, selected, ring):
+                    part_queries = queries[part]
+                    part_radii = radii[part]
+                    q_idx, p_idx = self.ring_pairs(part_queries, self.point_cells(part_queries), ring, part_radii)
+                    dist = self.square_distances(part_queries, q_idx, p_idx)
+                    keep = dist <= part_radii[q_idx] ** 2
+                    found.append((part[q_idx[keep]], p_idx[keep], dist[keep]))
+        counts = np.zeros(len(queries), dtype=np.int64)
+        for q_idx, _, _ in found:
+            counts += np.bincount(q_idx, minlength=len(queries))
+        result = Results(counts)
+        for q_idx, p_idx, dist in found:
+            result.add(q_idx, p_idx, dist)
+        return result.arrays(self.order)
+
+
+class Results(object):
+    """Flat arrays of query results, where counts of results per query are known"""
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.indices = np.zeros(self.offsets[-1], dtype=np.int64)
+        self.distances = np.zeros(self.offsets[-1])
+
+    def add(self, q_idx, p_idx, dist, limit=False):
+        """
+        Add results of queries sorted by distance. Queries must get all their
+        results in one add, with limit only the nearest counts of them are kept.
+        """
+        # one sort by query and distance, distances are scaled below 1
+        # so that they only order results of the same query
+        scale = dist.max() * (1 + 1e-9) if len(dist) else 1.0
+        order = np.argsort(q_idx + dist / (scale or 1.0))
+        q_idx, p_idx, dist = q_idx[order], p_idx[order], dist[order]
+        group_counts = np.bincount(q_idx, minlength=len(self.counts))
+        rank = np.arange(len(q_idx)) - np.repeat(np.cumsum(group_counts) - group_counts, group_counts)
+        if limit:
+            keep = rank < self.counts[q_idx]
+            q_idx, p_idx, dist, rank = q_idx[keep], p_idx[keep], dist[keep], rank[keep]
+        position = self.offsets[q_idx] + rank
+        self.indices[position] = p_idx
+        self.distances[position] = dist
+
+    def arrays(self, order):
+        """indices in original points, distances and offsets"""
+        return order[self.indices], np.sqrt(self.distances), self.offsets
+
+
+def get_point_grid(verts, points_per_cell=1, fingerprint=None):
+    key = ('GRID', points_per_cell, fingerprint or data_fingerprint(verts))
+    return cached_index(key, lambda: PointGrid(verts, points_per_cell))
+
+
+def kdtree_results(results):
+    """Flat index, distance and offset arrays from lists of KDTree results"""
+    counts = np.fromiter(map(len, results), dtype=np.int64, count=len(results))
+    offsets = np.zeros(len(results) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    found = list(chain.from_iterable(results))
+    indices = np.fromiter((r[1] for r in found), dtype=np.int64, count=len(found))
+    distances = np.fromiter((r[2] for r in found), dtype=np.float64, count=len(found))
+    return indices, distances, offsets
+
+
+def find_n_batch(verts, queries, counts):
+    """
+    counts nearest vertices of every query point, counts is a number or
+    a number per query. Returns flat arrays of indices and distances,
+    sorted by distance for every query, and offsets of queries in them.
+    """
+    if isinstance(queries, np.ndarray):
+        queries = queries.tolist()
+    counts = np.broadcast_to(counts, len(queries)).tolist()
+    if HAS_MATHUTILS:
+        find_n = get_kdtree(verts).find_n
+        return kdtree_results([find_n(co, n) for co, n in zip(queries, counts)])
+    # about half as many points in a cell as are looked for,
+    # then the first ring of cells is enough for most queries
+    wanted = max(counts, default=1)
+    per_cell = 2 ** min(max(int(np.ceil(np.log2(max(wanted, 1) / 2))), 0), 8)
+    return get_point_grid(verts, per_cell).find_n(queries, counts)
+
+
+def find_range_batch(verts, queries, radii):
+    """
+    Vertices at most radius away from every query point, radii is a number
+    or a number per query. Returns flat arrays of indices and distances,
+    sorted by distance for every query, and offsets of queries in them.
+    """
+    if isinstance(queries, np.ndarray):
+        queries = queries.tolist()
+    radii = np.broadcast_to(radii, len(queries)).tolist()
+    if HAS_MATHUTILS:
+        find_range = get_kdtree(verts).find_range
+        return kdtree_results([find_range(co, radius) for co, radius in zip(queries, radii)])
+    fingerprint = data_fingerprint(verts)
+    grid = get_point_grid(verts, 1, fingerprint)
+    # cells at least as large as a typical radius, then most queries look at one ring
+    ratio = np.median(radii) / grid.cell if radii else 0
+    if ratio > 1:
+        per_cell = 2 ** min(int(np.ceil(3 * np.log2(ratio))), 10)
+        grid = get_point_grid(verts, per_cell, fingerprint)
+    return grid.find_range(queries, radii)
+
+
+def split_results(data, offsets):
+    """Flat result array to list of lists, one per query"""
+    data = data.tolist()
+    offsets = offsets.tolist()
+    return [data[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def clear_index_cache():
+    with _lock:
+        spatial_indexes.clear()
+
+
+def get_index_stats():
+    stats = dict(index_stats)
+    stats["indexes"] = len(spatial_indexes)
+    return stats
@@ -1,7 +1,11 @@
 import re
 import random
+from itertools import chain
+
+import numpy as np
 
 import bpy
+import bmesh
 from bpy.props import IntProperty
 import mathutils
 from mathutils import Vector, Matrix
@@ -99,4 +103,160 @@ def remove_non_updated_objects(node, obj_index, kind='MESH'):
 
     # delete associated meshes
     for object_name in objs:
-        kinds.remove(kinds[object_name])        
+        kinds.remove(kinds[object_name])
+    forget_viewer_data(node, objs)
+
+
+# topology last written by write_mesh_data, per mesh name
+_mesh_topology = {}
+
+
+def pydata_to_arrays(edges, faces):
+    """
+    Flat arrays describing topology, as needed by foreach_set:
+    edge vertex indices, loop count and vertex indices of polygons.
+    """
+    edges_flat = np.fromiter(chain.from_iterable(edges), dtype=np.int32) if len(edges) else np.empty(0, np.int32)
+    loop_totals = np.fromiter(map(len, faces), dtype=np.int32, count=len(faces))
+    loops_flat = np.fromiter(chain.from_iterable(faces), dtype=np.int32, count=int(loop_totals.sum()))
+    return edges_flat, loop_totals, loops_flat
+
+
+def mesh_has_faces(mesh, vert_count, loop_totals, loops_flat):
+    """Check that mesh still has the faces, it may have been edited by hand"""
+    if (len(mesh.vertices) != vert_count or len(mesh.polygons) != len(loop_totals)
+            or len(mesh.loops) != len(loops_flat)):
+        return False
+    mesh_loops = np.empty(len(loops_flat), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', mesh_loops)
+    mesh_totals = np.empty(len(loop_totals), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', mesh_totals)
+    return np.array_equal(mesh_loops, loops_flat) and np.array_equal(mesh_totals, loop_totals)
+
+
+def write_mesh_data(mesh, verts, edges, faces, calc_normals=False):
+    """
+    Write geometry into existing mesh with flat arrays via foreach_set,
+    instead of building it element by element. If topology is the same
+    as written last time, only vertex coordinates are set.
+    """
+    coords = np.asarray(verts, dtype=np.float32)
+    if coords.ndim != 2 or coords.shape[1] != 3:
+        coords = np.array([v[:3] for v in verts], dtype=np.float32)
+    edges_flat, loop_totals, loops_flat = pydata_to_arrays(edges, faces)
+    vert_count = len(coords)
+
+    topology = (vert_count, hash(edges_flat.tobytes()), hash(loop_totals.tobytes()), hash(loops_flat.tobytes()))
+    if _mesh_topology.get(mesh.name) == topology and mesh_has_faces(mesh, vert_count, loop_totals, loops_flat):
+        mesh.vertices.foreach_set('co', coords.ravel())
+        mesh.update()
+        if calc_normals:
+            mesh.calc_normals()
+        return
+
+    if len(loops_flat) and (loops_flat.min() < 0 or loops_flat.max() >= vert_count):
+        raise IndexError("Face refers to vertex which does not exist")
+    if len(edges_flat) and (edges_flat.min() < 0 or edges_flat.max() >= vert_count):
+        raise IndexError("Edge refers to vertex which does not exist")
+
+    # writing empty bmesh is the way to clear mesh geometry
+    bm = bmesh.new()
+    bm.to_mesh(mesh)
+    bm.free()
+
+    mesh.vertices.add(vert_count)
+    mesh.vertices.foreach_set('co', coords.ravel())
+    if len(edges_flat):
+        mesh.edges.add(len(edges_flat) // 2)
+        mesh.edges.foreach_set('vertices', edges_flat)
+    if len(loop_totals):
+        loop_starts = np.cumsum(loop_totals) - loop_totals
+        mesh.loops.add(len(loops_flat))
+        mesh.loops.foreach_set('vertex_index', loops_flat)
+        mesh.polygons.add(len(loop_totals))
+        mesh.polygons.foreach_set('loop_start', loop_starts)
+        mesh.polygons.foreach_set('loop_total', loop_totals)
+
+    # removes degenerate faces and doubled edges, which bmesh would refuse
+    mesh.validate()
+    mesh.update(calc_edges=True)
+    if calc_normals:
+        mesh.calc_normals()
+    _mesh_topology[mesh.name] = topology
+
+
+# hashes of data last written by viewer nodes, per node and object name
+_viewer_data_hashes = {}
+# hashes of data being written, they count when the write is done
+_pending_data_hashes = {}
+
+
+def data_hash(data):
+    """
+    Hash of socket data for change detection, numeric data is hashed
+    as arrays, nested lists of different lengths as flat list + lengths.
+    """
+    if isinstance(data, np.ndarray):
+        return hash((data.shape, data.dtype.str, data.tobytes()))
+    if isinstance(data, (list, tuple)):
+        try:
+            array = np.array(data)
+        except (ValueError, TypeError):
+            array = None
+        if array is not None and array.dtype != object:
+            return data_hash(array)
+        if all(isinstance(item, (list, tuple, np.ndarray)) for item in data):
+            lengths = np.fromiter(map(len, data), dtype=np.int64, count=len(data))
+            return hash((data_hash(lengths), data_hash(list(chain.from_iterable(data)))))
+        return hash(tuple(data_hash(item) for item in data))
+    try:
+        return hash(data)
+    except TypeError:
+        # Matrix, Vector
+        return data_hash(np.array(data))
+
+
+def viewer_data_unchanged(node, name, *data):
+    """
+    Check if data a viewer node writes into object name is the same as
+    last time. Viewer can skip rewriting the object then, if the object
+    still exists. Pass node settings that affect the result along with the
+    data. New data is remembered when the viewer calls viewer_data_written
+    after the object is written, so a write that failed is done again.
+    """
+    key = (node.as_pointer(), name)
+    new_hash = data_hash(data)
+    if _viewer_data_hashes.get(key) == new_hash:
+        _pending_data_hashes.pop(key, None)
+        return True
+    _pending_data_hashes[key] = new_hash
+    return False
+
+
+def viewer_data_written(node, name):
+    """Remember data last checked by viewer_data_unchanged as written"""
+    key = (node.as_pointer(), name)
+    new_hash = _pending_data_hashes.pop(key, None)
+    if new_hash is not None:
+        _viewer_data_hashes[key] = new_hash
+
+
+def forget_viewer_data(node, names=None):
+    """
+    Next update of the viewer node rewrites all its objects, or objects
+    with given names. Call it when the node or its objects are removed.
+    """
+    pointer = node.as_pointer()
+    for hashes in (_viewer_data_hashes, _pending_data_hashes):
+        for key in [key for key in hashes if key[0] == pointer and (names is None or key[1] in names)]:
+            del hashes[key]
+    # meshes are named as their objects
+    for name in names or ():
+        _mesh_topology.pop(name, None)
+
+
+def clear_viewer_data():
+    """Forget data of all viewers, objects may have changed (undo, file load)"""
+    _viewer_data_hashes.clear()
+    _pending_data_hashes.clear()
+    _mesh_topology.clear()
@@ -0,0 +1,337 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+2D Delaunay triangulation and Voronoi diagram on numpy arrays.
+
+Triangles come from scipy.spatial.Delaunay (qhull) if scipy is installed,
+otherwise from the Fortune's algorithm of utils.voronoi. Voronoi cells
+are not traced from the triangulation: every cell starts as the bounding
+rectangle and is clipped by the bisector with each of its Delaunay
+neighbours. All cells are clipped together, k-th neighbour of every cell
+in k-th round, so cells come out clipped to the rectangle, unbounded
+cells at the hull included.
+"""
+
+import numpy as np
+
+from sverchok.utils.sv_mesh_utils import weld_map
+
+try:
+    from scipy.spatial import Delaunay
+except ImportError:
+    Delaunay = None
+
+# cell vertices closer than this, relative to size of rectangle, are one vertex
+WELD_TOLERANCE = 1e-10
+
+
+def as_points(points):
+    """x and y of points as (n, 2) float array, z (if any) is dropped"""
+    points = np.asarray(points, dtype=np.float64)
+    if not len(points):
+        return np.zeros((0, 2))
+    return points.reshape(len(points), -1)[:, :2]
+
+
+def ranges(starts, counts):
+    """Indices start, start+1 .. start+count-1 of all ranges, concatenated"""
+    offsets = np.cumsum(counts) - counts
+    return np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+
+
+def unique_points(points):
+    """
+    Same as np.unique(points, axis=0, return_index=True, return_inverse=True),
+    sorting by x and y only, which is much faster
+    """
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    ordered = points[order]
+    new = np.ones(len(points), dtype=bool)
+    new[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    inverse = np.empty(len(points), dtype=np.int64)
+    inverse[order] = np.cumsum(new) - 1
+    return ordered[new], order[new], inverse
+
+
+def group_rows(rows, bound):
+    """
+    For rows of non negative integers less than bound: index of the first
+    of each distinct row, distinct rows sorted, and for every row index of
+    its distinct row
+    """
+    if bound ** rows.shape[1] < 2 ** 63:
+        keys = rows[:, 0].astype(np.int64)
+        for column in rows.T[1:]:
+            keys = keys * bound + column
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        return first, inverse.ravel()
+    order = np.lexsort(rows.T[::-1])
+    ordered = rows[order]
+    new = np.ones(len(rows), dtype=bool)
+    new[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    inverse = np.empty(len(rows), dtype=np.int64)
+    inverse[order] = np.cumsum(new) - 1
+    return order[new], inverse
+
+
+def unique_triangles(points):
+    """Delaunay triangles of points without repeats, as indices of points"""
+    if len(points) < 3:
+        return np.zeros((0, 3), dtype=np.int64)
+    if Delaunay is not None:
+        try:
+            triangles = Delaunay(points).simplices
+        except (RuntimeError, ValueError):
+            # qhull fails when all points are on one line
+            return np.zeros((0, 3), dtype=np.int64)
+    else:
+        from sverchok.utils.voronoi import Site, computeDelaunayTriangulation
+        sites = [Site(x, y) for x, y in points.tolist()]
+        triangles = np.array(computeDelaunayTriangulation(sites), dtype=np.int64).reshape(-1, 3)
+        triangles = triangles[(triangles >= 0).all(axis=1)]
+    triangles = triangles.astype(np.int64)
+
+    # counterclockwise
+    a, b, c = (points[triangles[:, k]] for k in range(3))
+    clockwise = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]) < 0
+    triangles[clockwise] = triangles[clockwise][:, ::-1]
+    return triangles
+
+
+def delaunay_2d(points):
+    """
+    Delaunay triangles of points as (n, 3) array of indices of points,
+    counterclockwise. Of equal points only the first one is used; points
+    all on one line (or less than three) give no triangles.
+    """
+    points = as_points(points)
+    if not len(points):
+        return np.zeros((0, 3), dtype=np.int64)
+    unique, first, _ = unique_points(points)
+    return first[unique_triangles(unique)]
+
+
+def circumcenters(points, triangles):
+    a, b, c = (points[triangles[:, k]] for k in range(3))
+    b = b - a
+    c = c - a
+    d = 2 * (b[:, 0] * c[:, 1] - b[:, 1] * c[:, 0])
+    bb = (b * b).sum(axis=1)
+    cc = (c * c).sum(axis=1)
+    x = (c[:, 1] * bb - b[:, 1] * cc) / d
+    y = (b[:, 0] * cc - c[:, 0] * bb) / d
+    return np.column_stack((x, y)) + a
+
+
+def voronoi_2d(points):
+    """
+    Unbounded Voronoi diagram as computeVoronoiDiagram gives it without
+    its edges to infinity: vertices (m, 2), circumcenters of Delaunay
+    triangles, and edges (k, 2), between vertices of adjacent triangles
+    """
+    points = as_points(points)
+    triangles = delaunay_2d(points)
+    vertices = circumcenters(points, triangles)
+    sides = np.sort(triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    order = np.lexsort((sides[:, 1], sides[:, 0]))
+    sides = sides[order]
+    # an inner side is there twice, once for each triangle
+    shared = np.flatnonzero((sides[1:] == sides[:-1]).all(axis=1))
+    edges = np.column_stack((order[shared] // 3, order[shared + 1] // 3))
+    return vertices, edges
+
+
+def neighbours(points, triangles):
+    """Pairs (point, neighbour) sorted by point, both ways for every pair"""
+    if len(triangles):
+        pairs = triangles[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    else:
+        # points on one line, they are sorted along it
+        pairs = np.column_stack((np.arange(len(points) - 1), np.arange(1, len(points))))
+    pairs = np.concatenate((pairs, pairs[:, ::-1]))
+    pairs = pairs[group_rows(pairs, len(points))[0]]
+    return pairs[:, 0], pairs[:, 1]
+
+
+def next_in_polygon(counts):
+    """Index of the next vertex of the same polygon, for flat polygon vertices"""
+    offsets = np.cumsum(counts) - counts
+    following = np.arange(1, counts.sum() + 1)
+    filled = counts > 0
+    following[(offsets + counts - 1)[filled]] = offsets[filled]
+    return following
+
+
+def clip_polygons(xs, ys, labels, counts, nx, ny, c, line, tolerance):
+    """
+    Clip polygons by half planes nx*x + ny*y <= c, one per polygon.
+    Polygons are flat coordinates of vertices, labels of lines their
+    sides lie on (side from each vertex to the next), and counts of
+    vertices; a new side gets label line. Also returns vertices within
+    tolerance of the line of their polygon.
+    """
+    polygon = np.repeat(np.arange(len(counts)), counts)
+    d = xs * nx[polygon] + ys * ny[polygon] - c[polygon]
+    inside = d <= 0
+    following = next_in_polygon(counts)
+    crossing = inside != inside[following]
+    touching = np.abs(d) <= tolerance * np.hypot(nx, ny)[polygon]
+
+    # a vertex gives itself if inside, and a new vertex if the side crosses
+    emitted = inside.astype(np.int64) + crossing
+    new_counts = np.bincount(polygon, weights=emitted, minlength=len(counts)).astype(np.int64)
+    positions = np.cumsum(emitted) - emitted
+    new_xs = np.empty(emitted.sum())
+    new_ys = np.empty_like(new_xs)
+    new_labels = np.empty(len(new_xs), dtype=np.int64)
+    new_xs[positions[inside]] = xs[inside]
+    new_ys[positions[inside]] = ys[inside]
+    new_labels[positions[inside]] = labels[inside]
+    i = np.flatnonzero(crossing)
+    j = following[i]
+    t = d[i] / (d[i] - d[j])
+    at = positions[i] + inside[i]
+    new_xs[at] = xs[i] + (xs[j] - xs[i]) * t
+    new_ys[at] = ys[i] + (ys[j] - ys[i]) * t
+    # leaving the half plane the new side is on the line,
+    # entering it the rest of the old side follows
+    new_labels[at] = np.where(inside[i], line[polygon[i]], labels[i])
+    return new_xs, new_ys, new_labels, new_counts, np.column_stack((xs[touching], ys[touching]))
+
+
+def clipped_cells(points, bounds, tolerance):
+    """
+    Cells of distinct points: flat coordinates of vertices, labels of
+    sides (index of neighbour point, or -1 .. -4 for sides of the
+    rectangle), counts of vertices, and points where cells may have
+    vertices in common which are not found by labels (points on one circle)
+    """
+    x_min, y_min, x_max, y_max = bounds
+    source, target = neighbours(points, unique_triangles(points))
+    degree = np.bincount(source, minlength=len(points))
+    first_neighbour = np.cumsum(degree) - degree
+
+    # cells with more neighbours first, so the cells still clipped in
+    # a round are the ones before those done
+    order = np.argsort(-degree, kind='stable')
+    sorted_degree = degree[order]
+    active = len(points)
+    counts = np.full(active, 4, dtype=np.int64)
+    xs = np.tile(np.array([x_min, x_max, x_max, x_min], dtype=np.float64), active)
+    ys = np.tile(np.array([y_min, y_min, y_max, y_max], dtype=np.float64), active)
+    labels = np.tile(np.array([-1, -2, -3, -4]), active)
+    done = []
+    touching = [np.zeros((0, 2))]
+    k = 0
+    while active:
+        clipped = np.count_nonzero(sorted_degree > k)
+        if clipped < active:
+            split = counts[:clipped].sum()
+            done.append((order[clipped:active], counts[clipped:], xs[split:], ys[split:], labels[split:]))
+            xs, ys, labels, counts = xs[:split], ys[:split], labels[:split], counts[:clipped]
+            active = clipped
+            if not active:
+                break
+        cells = order[:active]
+        others = target[first_neighbour[cells] + k]
+        p = points[cells]
+        q = points[others]
+        n = q - p
+        # bisector of p and q, cell is on the side of p
+        c = (n * (p + q) / 2).sum(axis=1)
+        xs, ys, labels, counts, touches = clip_polygons(xs, ys, labels, counts, n[:, 0], n[:, 1], c, others, tolerance)
+        touching.append(touches)
+        k += 1
+
+    cells, counts, xs, ys, labels = (np.concatenate(parts) for parts in zip(*done))
+    starts = np.cumsum(counts) - counts
+    by_cell = np.argsort(cells)
+    positions = ranges(starts[by_cell], counts[by_cell])
+    return xs[positions], ys[positions], labels[positions], counts[by_cell], np.concatenate(touching)
+
+
+def voronoi_cells(points, bounds):
+    """
+    Voronoi cells of points clipped to rectangle bounds, given as
+    (x_min, y_min, x_max, y_max). Returns vertices (m, 2), edges (k, 2),
+    and polygons as counts of vertices, one per point in order of points,
+    and flat indices of vertices; polygons are counterclockwise.
+    Equal points get equal cells.
+    """
+    points = as_points(points)
+    if not len(points):
+        return np.zeros((0, 2)), np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    x_min, y_min, x_max, y_max = bounds
+    tolerance = WELD_TOLERANCE * max(x_max - x_min, y_max - y_min)
+    unique, _, inverse = unique_points(points)
+    xs, ys, labels, counts, touching = clipped_cells(unique, bounds, tolerance)
+
+    # a vertex of a cell is where the lines of its two sides meet, the
+    # same vertex of neighbour cells has the same three points or sides
+    cell = np.repeat(np.arange(len(counts)), counts)
+    following = next_in_polygon(counts)
+    previous = np.empty(len(labels), dtype=np.int64)
+    previous[following] = np.arange(len(labels))
+    generators = np.sort(np.column_stack((cell, labels[previous], labels)) + 4, axis=1)
+    first, loops = group_rows(generators, len(counts) + 4)
+    vertices = np.column_stack((xs[first], ys[first]))
+
+    if len(touching):
+        # points on one circle: neighbour cells find a vertex by different
+        # lines, equal vertices can differ in last bits, weld ones about there
+        touching_x = np.sort(touching[:, 0])
+        window = 10 * tolerance
+        near = (np.searchsorted(touching_x, vertices[:, 0] + window, side='right') >
+                np.searchsorted(touching_x, vertices[:, 0] - window, side='left'))
+        candidates = np.flatnonzero(near)
+        points_near = np.column_stack((vertices[candidates], np.zeros(len(candidates))))
+        targets = np.arange(len(vertices))
+        targets[candidates] = candidates[weld_map(points_near, tolerance)]
+        loops = targets[loops]
+        distinct = loops != loops[following]
+        counts = np.bincount(cell[distinct], minlength=len(counts))
+        used, loops = np.unique(loops[distinct], return_inverse=True)
+        vertices = vertices[used]
+        edges = polygon_edges(counts, loops.ravel())
+    else:
+        # a side between two cells is in both of them, one on the rectangle in one
+        side = (labels < 0) | (cell < labels)
+        edges = np.column_stack((loops[side], loops[following[side]]))
+
+    # cells of equal points are the same
+    counts_out = counts[inverse]
+    loops = loops[ranges((np.cumsum(counts) - counts)[inverse], counts_out)]
+    return vertices, edges, counts_out, loops
+
+
+def polygon_edges(counts, loops):
+    """Edges of polygons, each one once, in order of first use"""
+    edges = np.sort(np.column_stack((loops, loops[next_in_polygon(counts)])), axis=1)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    if not len(edges):
+        return np.zeros((0, 2), dtype=np.int64)
+    first, _ = group_rows(edges, edges.max() + 1)
+    return edges[np.sort(first)]
+
+
+def to_polygons(counts, loops):
+    """Polygons as lists of indices of vertices"""
+    loops = loops.tolist()
+    ends = np.cumsum(counts).tolist()
+    return [loops[end - count:end] for end, count in zip(ends, counts.tolist())]